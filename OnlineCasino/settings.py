@@ -145,6 +145,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# Root seed of the RNG service every game session draws from. Set it to an int to make load tests reproducible.
+RNG_SEED = None
+
 LOGOUT_REDIRECT_URL = "index"
 LOGIN_REDIRECT_URL = "index"
 
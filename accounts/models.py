@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 
 from dateutil.relativedelta import relativedelta
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 
 
 class CustomUser(AbstractUser):
@@ -94,6 +94,34 @@ class CustomUser(AbstractUser):
 
         return False
 
+    @staticmethod
+    def update_balances(updates: dict) -> dict:
+        """
+        Updates the balances of many users in one transaction, reading and writing every row in a single query each
+        instead of one save per user. Each update follows the same rules as update_balance, and the users passed in
+        are updated in place.
+
+        Args:
+            updates: dict of each CustomUser to the amount by which to change their account balance
+
+        Returns:
+            dict of each CustomUser to true if their update succeeded, false otherwise
+        """
+        updates = {user: amount for user, amount in updates.items() if amount != 0}
+        succeeded = dict()
+        with transaction.atomic():
+            rows = CustomUser.objects.select_for_update().in_bulk([user.pk for user in updates])
+            for user, amount in updates.items():
+                row = rows[user.pk]
+                succeeded[user] = amount >= 0 or row.current_balance >= -1 * amount
+                if succeeded[user]:
+                    row.current_balance = round(row.current_balance + amount, 2)
+                    row.total_earnings = round(row.total_earnings + amount, 2)
+                user.current_balance = row.current_balance
+                user.total_earnings = row.total_earnings
+            CustomUser.objects.bulk_update(rows.values(), ['current_balance', 'total_earnings'])
+        return succeeded
+
     @staticmethod
     def check_username_exists(username: str) -> bool:
         """
@@ -11,6 +11,7 @@ from django.shortcuts import redirect
 from django.views.generic import TemplateView
 
 from accounts.models import CustomUser
+from utils.rng import RNG_SERVICE
 
 
 class Game:
@@ -26,6 +27,7 @@ class Game:
         self.players = set()
         self.in_limbo = set()
         self.spectating = set()
+        self.rng = RNG_SERVICE.stream()
 
     def add_to_spectating(self, user: CustomUser) -> None:
         """
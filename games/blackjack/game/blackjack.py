@@ -2,6 +2,7 @@ from uuid import UUID
 
 from accounts.models import CustomUser
 from games.base import Game
+from games.blackjack.game.hints import hint
 from games.blackjack.game.utils import Pack, BlackjackCard, BlackjackHand, Dealer
 
 
@@ -15,7 +16,7 @@ class Blackjack(Game):
 
         self.round = None
         self.waiting_room = set()
-        self.pack = Pack(card_class=BlackjackCard)
+        self.pack = Pack(card_class=BlackjackCard, rng=self.rng)
         self.bets = {player: 0 for player in self.players}
         self.players_ready = {player: False for player in self.players}
 
@@ -170,6 +171,8 @@ class BlackjackRound:
     """
     Class for a round of a blackjack game
     """
+    # What each winning outcome pays back, as a multiple of the bet
+    PAYOUTS = {'Blackjack': 2.5, 'Win': 2, 'Dealer Bust': 2, 'Push': 1}
 
     def __init__(self, pack: Pack, game_instance: Blackjack):
         self.game_instance = game_instance
@@ -185,7 +188,7 @@ class BlackjackRound:
         """
         for _ in range(2):
             for hand in list(self.hands.values()) + [self.dealer]:
-                hand.hand.append(self.pack.deal())
+                hand.add_card(self.pack.deal())
         self.check_for_blackjack()
 
     def check_for_blackjack(self) -> None:
@@ -261,12 +264,8 @@ class BlackjackRound:
             player: player to pay out to
             hand: the players hand
         """
-        if hand.outcome == 'Blackjack':
-            player.update_balance(2.5 * self.game_instance.bets[player])
-        elif hand.outcome == 'Win' or hand.outcome == 'Dealer Bust':
-            player.update_balance(2 * self.game_instance.bets[player])
-        elif hand.outcome == 'Push':
-            player.update_balance(self.game_instance.bets[player])
+        if hand.outcome in self.PAYOUTS:
+            player.update_balance(self.PAYOUTS[hand.outcome] * self.game_instance.bets[player])
 
     def get_stage(self) -> str:
         """
@@ -275,6 +274,22 @@ class BlackjackRound:
         """
         return 'ending' if self.round_over else 'dealing'
 
+    def hint(self, player: CustomUser) -> dict:
+        """
+        Looks up the hit and stay expected results of a beginner's hand while they are still playing it
+
+        Args:
+            player: the player to give a hint to
+
+        Returns:
+            a dictionary with the hint under 'hint', or an empty dictionary if the player gets no hint
+        """
+        hand = self.hands[player]
+        if self.round_over or self.game_instance.players_ready[player] or hand.value() >= 21 or \
+                player.skill_level.lower() != 'beginner':
+            return {}
+        return {'hint': hint(hand, self.dealer, self.pack)}
+
     def dict_representation(self):
         """
         Returns:
@@ -284,7 +299,7 @@ class BlackjackRound:
                            'hand': self.hands[player].to_list(),
                            'value': self.hands[player].value(),
                            'outcome': self.hands[player].outcome,
-                           'ready': self.game_instance.players_ready[player]}
+                           'ready': self.game_instance.players_ready[player]} | self.hint(player)
                           for player in self.game_instance.players],
                 'dealer': {'hand': self.dealer.to_list() if self.round_over else [str(self.dealer.hand[0]), '2B'],
                            'value': self.dealer.value() if self.round_over else self.dealer.hand[0].value
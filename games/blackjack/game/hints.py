@@ -0,0 +1,206 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from games.blackjack.game.utils import DEALER_STANDS, HI_LO, BlackjackHand, Dealer, Pack
+
+DEALER_TABLE_VERSION = 1
+DEALER_TABLE_PATH = Path(__file__).resolve().parent / 'data' / 'dealer_tables.json'
+
+# Shoe composition classes are Hi-Lo true counts, rounded and clipped to this range
+COUNT_CLASSES = range(-4, 5)
+CARD_VALUES = range(2, 12)
+FINAL_TOTALS = ('17', '18', '19', '20', '21', 'bust')
+
+
+def add_value(total: int, soft_aces: int, value: int) -> tuple[int, int]:
+    """
+    Adds a card value to a hand total the way BlackjackHand.add_card does
+
+    Args:
+        total: the value of the hand
+        soft_aces: the number of aces counted as 11 in the hand
+        value: the blackjack value of the card, 11 for an ace
+
+    Returns:
+        A tuple of the new value and soft ace count
+    """
+    total += value
+    soft_aces += value == 11
+    while total > 21 and soft_aces > 0:
+        total -= 10
+        soft_aces -= 1
+    return total, soft_aces
+
+
+def value_probabilities(true_count: int) -> dict:
+    """
+    Approximates the chance of drawing each card value from a shoe with a Hi-Lo true count. A true count of t means
+    about t / 2 fewer low cards (2-6, t / 10 of each) and t / 2 more tens and aces (split 4 to 1, like their share of
+    a fresh deck) are left per deck than in a fresh deck.
+
+    Args:
+        true_count: the Hi-Lo true count of the shoe
+
+    Returns:
+        dict of card value (2-11) to the chance of drawing it
+    """
+    per_deck = {value: 4.0 for value in range(2, 10)} | {10: 16.0, 11: 4.0}
+    for value in range(2, 7):
+        per_deck[value] -= true_count / 10
+    per_deck[10] += true_count * .4
+    per_deck[11] += true_count * .1
+    return {value: cards / 52 for value, cards in per_deck.items()}
+
+
+def dealer_distribution(up_card: int, probabilities: dict) -> list:
+    """
+    Computes the chance of each final dealer total when the dealer draws to DEALER_STANDS, like Dealer.play_hand
+
+    Args:
+        up_card: the value of the dealer's up card
+        probabilities: the chance of drawing each card value
+
+    Returns:
+        list of the chances of finishing on 17, 18, 19, 20, 21 and of busting
+    """
+    memo = dict()
+
+    def finish(total: int, soft_aces: int) -> list:
+        if total > 21:
+            return [0.0] * 5 + [1.0]
+        if total >= DEALER_STANDS:
+            return [1.0 if final == total else 0.0 for final in range(17, 22)] + [0.0]
+        if (total, soft_aces) not in memo:
+            distribution = [0.0] * 6
+            for value, chance in probabilities.items():
+                for index, final in enumerate(finish(*add_value(total, soft_aces, value))):
+                    distribution[index] += chance * final
+            memo[(total, soft_aces)] = distribution
+        return memo[(total, soft_aces)]
+
+    return finish(*add_value(0, 0, up_card))
+
+
+def stay_ev(total: int, distribution: list) -> float:
+    """
+    Args:
+        total: the value of the player's hand
+        distribution: the chances of each final dealer total
+
+    Returns:
+        the expected net result per unit bet of staying on the total
+    """
+    if total > 21:
+        return -1.0
+    ev = distribution[5]
+    for final, chance in zip(range(17, 22), distribution):
+        ev += chance if total > final else -chance if total < final else 0.0
+    return ev
+
+
+def player_evs(probabilities: dict, distribution: list) -> dict:
+    """
+    Computes the expected result of staying and of hitting, then playing on perfectly, for every player hand
+
+    Args:
+        probabilities: the chance of drawing each card value
+        distribution: the chances of each final dealer total
+
+    Returns:
+        dict with 'hard' and 'soft' dicts of player total to the stay and hit expected results
+    """
+    memo = dict()
+
+    def hit(total: int, soft_aces: int) -> float:
+        if (total, soft_aces) not in memo:
+            ev = 0.0
+            for value, chance in probabilities.items():
+                new_total, new_soft = add_value(total, soft_aces, value)
+                if new_total > 21:
+                    ev -= chance
+                elif new_total == 21:
+                    ev += chance * stay_ev(21, distribution)
+                else:
+                    ev += chance * max(stay_ev(new_total, distribution), hit(new_total, new_soft))
+            memo[(total, soft_aces)] = ev
+        return memo[(total, soft_aces)]
+
+    return {'hard': {str(total): [round(stay_ev(total, distribution), 4), round(hit(total, 0), 4)]
+                     for total in range(4, 22)},
+            'soft': {str(total): [round(stay_ev(total, distribution), 4), round(hit(total, 1), 4)]
+                     for total in range(12, 22)}}
+
+
+def generate_dealer_tables() -> dict:
+    """
+    Computes the dealer final total distributions and player expected results for every composition class and dealer
+    up card
+
+    Returns:
+        the versioned dealer tables
+    """
+    dealer, ev = dict(), dict()
+    for true_count in COUNT_CLASSES:
+        probabilities = value_probabilities(true_count)
+        dealer[str(true_count)], ev[str(true_count)] = dict(), dict()
+        for up_card in CARD_VALUES:
+            distribution = dealer_distribution(up_card, probabilities)
+            dealer[str(true_count)][str(up_card)] = [round(chance, 4) for chance in distribution]
+            ev[str(true_count)][str(up_card)] = player_evs(probabilities, distribution)
+
+    return {'version': DEALER_TABLE_VERSION, 'finals': FINAL_TOTALS, 'dealer': dealer, 'ev': ev}
+
+
+@lru_cache(maxsize=None)
+def load_dealer_tables(path: Path = DEALER_TABLE_PATH) -> dict:
+    """
+    Loads the dealer tables the first time they are needed
+
+    Args:
+        path: location of the table file
+
+    Returns:
+        the dealer tables
+    """
+    with open(path) as table_file:
+        tables = json.load(table_file)
+    if tables['version'] != DEALER_TABLE_VERSION:
+        raise ValueError('Dealer table version {} does not match {}, regenerate it with '
+                         'generate_dealer_tables'.format(tables['version'], DEALER_TABLE_VERSION))
+    return tables
+
+
+def composition_class(pack: Pack, dealer: Dealer) -> str:
+    """
+    Classifies the cards left in the shoe by their Hi-Lo true count, as seen by the players. The dealer's hole card is
+    still hidden, so it is not counted.
+
+    Args:
+        pack: the shoe being dealt from
+        dealer: the dealer's hand
+
+    Returns:
+        the composition class key of the dealer tables
+    """
+    hidden = dealer.hand[1:2]
+    running_count = pack.running_count - sum(HI_LO.get(card.rank.rank, 0) for card in hidden)
+    true_count = running_count / max((len(pack) + len(hidden)) / 52, .5)
+    return str(min(max(round(true_count), COUNT_CLASSES[0]), COUNT_CLASSES[-1]))
+
+
+def hint(hand: BlackjackHand, dealer: Dealer, pack: Pack) -> dict:
+    """
+    Looks up the expected result of staying and hitting for a player's hand
+
+    Args:
+        hand: the player's hand
+        dealer: the dealer's hand
+        pack: the shoe being dealt from
+
+    Returns:
+        dict of the stay and hit expected results per unit bet and the better move
+    """
+    tables = load_dealer_tables()['ev'][composition_class(pack, dealer)][str(dealer.hand[0].value)]
+    stay, hit = tables['soft' if hand.is_soft() else 'hard'][str(hand.value())]
+    return {'stay': stay, 'hit': hit, 'advice': 'hit' if hit > stay else 'stay'}
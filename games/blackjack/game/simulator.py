@@ -0,0 +1,195 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+
+import numpy as np
+
+from games.blackjack.game.blackjack import BlackjackRound
+from games.blackjack.game.utils import DEALER_STANDS
+
+# Blackjack values of the 52 cards of a deck, aces counted as 11
+DECK_VALUES = np.array([11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10] * 4, dtype=np.int64)
+
+
+def stand_totals(hard: dict, soft: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the lookup arrays of a hit or stand strategy
+
+    Args:
+        hard: the total to stand on with a hard hand against each dealer up card value (2-11)
+        soft: the total to stand on with a soft hand against each dealer up card value (2-11)
+
+    Returns:
+        A tuple of the hard and soft stand totals indexed by dealer up card value
+    """
+    return (np.array([0, 0] + [hard[up_card] for up_card in range(2, 12)], dtype=np.int64),
+            np.array([0, 0] + [soft[up_card] for up_card in range(2, 12)], dtype=np.int64))
+
+
+# The game only lets players hit or stay, so strategies are the totals a player stands on against each up card
+STRATEGIES = {
+    'basic': stand_totals({2: 13, 3: 13, 4: 12, 5: 12, 6: 12, 7: 17, 8: 17, 9: 17, 10: 17, 11: 17},
+                          {2: 18, 3: 18, 4: 18, 5: 18, 6: 18, 7: 18, 8: 18, 9: 19, 10: 19, 11: 19}),
+    'dealer': stand_totals(dict.fromkeys(range(2, 12), DEALER_STANDS), dict.fromkeys(range(2, 12), DEALER_STANDS)),
+    'never-bust': stand_totals(dict.fromkeys(range(2, 12), 12), dict.fromkeys(range(2, 12), 18)),
+}
+
+
+def add_cards(total: np.ndarray, soft_aces: np.ndarray, cards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Adds a card to many hands at once, counting aces as 1 instead of 11 when a hand would otherwise bust, like
+    BlackjackHand.add_card
+
+    Args:
+        total: the value of each hand
+        soft_aces: the number of aces counted as 11 in each hand
+        cards: the value of the card added to each hand, 0 for hands that take no card
+
+    Returns:
+        A tuple of the new values and soft ace counts
+    """
+    total = total + cards
+    soft_aces = soft_aces + (cards == 11)
+    for _ in range(2):
+        drop = (total > 21) & (soft_aces > 0)
+        total = total - 10 * drop
+        soft_aces = soft_aces - drop
+    return total, soft_aces
+
+
+class ShoeBatch:
+    """
+    Many blackjack shoes shuffled and dealt in lockstep. Every shoe is followed by a spare shuffled shoe that is only
+    dealt from if a round runs past the end of the shoe.
+    """
+
+    def __init__(self, shoes: int, num_decks: int, shuffle_pct: float, rng: np.random.Generator):
+        self.rng = rng
+        self.shoe_size = 52 * num_decks
+        self.shuffle_card = int(self.shoe_size * (1 - shuffle_pct))
+        self.cards = np.tile(DECK_VALUES, (shoes, 2 * num_decks))
+        self.cursor = np.zeros(shoes, dtype=np.int64)
+        self.rows = np.arange(shoes)
+        self.shuffle(np.ones(shoes, dtype=bool))
+
+    def shuffle(self, rows: np.ndarray) -> None:
+        """
+        Gathers every card back into the selected shoes and shuffles them
+
+        Args:
+            rows: boolean mask of the shoes to shuffle
+        """
+        size = self.shoe_size
+        self.cards[rows, :size] = self.rng.permuted(self.cards[rows, :size], axis=1)
+        self.cards[rows, size:] = self.rng.permuted(self.cards[rows, size:], axis=1)
+        self.cursor[rows] = 0
+
+    def deal(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Deals the next card of the selected shoes
+
+        Args:
+            rows: boolean mask of the shoes to deal from
+
+        Returns:
+            the value of the card dealt from each shoe, 0 for shoes that were not dealt from
+        """
+        cards = np.where(rows, self.cards[self.rows, self.cursor], 0)
+        self.cursor += rows
+        return cards
+
+    def check_reshuffle(self) -> None:
+        """
+        Reshuffles every shoe that has reached its cut card, like Pack.check_reshuffle
+        """
+        self.shuffle(self.shoe_size - self.cursor < self.shuffle_card)
+
+
+def simulate_shard(rounds: int, num_decks: int, shuffle_pct: float, strategy: str, shoes: int, seed) \
+        -> tuple[int, float, float]:
+    """
+    Plays rounds of one player against the dealer in a batch of shoes, with the rules of BlackjackRound: the player
+    hits or stays following the strategy, the dealer draws to DEALER_STANDS even after the player busts, and hands are
+    paid out with BlackjackRound.PAYOUTS.
+
+    Args:
+        rounds: number of rounds to play
+        num_decks: number of decks in each shoe
+        shuffle_pct: fraction of the shoe dealt before it is reshuffled
+        strategy: name of the player strategy in STRATEGIES
+        shoes: number of shoes played in lockstep
+        seed: seed for the random number generator
+
+    Returns:
+        A tuple of the number of rounds played, the sum of the net results and the sum of their squares, per unit bet
+    """
+    hard_stand, soft_stand = STRATEGIES[strategy]
+    payouts = BlackjackRound.PAYOUTS
+    batch = ShoeBatch(shoes, num_decks, shuffle_pct, np.random.default_rng(seed))
+    everyone = np.ones(shoes, dtype=bool)
+    zeros = np.zeros(shoes, dtype=np.int64)
+
+    played, net_sum, net_squares = 0, 0.0, 0.0
+    while played < rounds:
+        player, player_soft = add_cards(zeros, zeros, batch.deal(everyone))
+        dealer, dealer_soft = add_cards(zeros, zeros, batch.deal(everyone))
+        up_card = dealer
+        player, player_soft = add_cards(player, player_soft, batch.deal(everyone))
+        dealer, dealer_soft = add_cards(dealer, dealer_soft, batch.deal(everyone))
+        player_cards = np.full(shoes, 2)
+
+        hitting = player < np.where(player_soft > 0, soft_stand[up_card], hard_stand[up_card])
+        while hitting.any():
+            player, player_soft = add_cards(player, player_soft, batch.deal(hitting))
+            player_cards += hitting
+            hitting &= (player < 21) & (player < np.where(player_soft > 0, soft_stand[up_card], hard_stand[up_card]))
+
+        hitting = dealer < DEALER_STANDS
+        while hitting.any():
+            dealer, dealer_soft = add_cards(dealer, dealer_soft, batch.deal(hitting))
+            hitting &= dealer < DEALER_STANDS
+
+        paid = np.select([player > 21, (player == 21) & (player_cards == 2), dealer > 21, player > dealer,
+                          player == dealer],
+                         [0, payouts['Blackjack'], payouts['Dealer Bust'], payouts['Win'], payouts['Push']], 0)
+        net = (paid - 1)[:rounds - played]
+        net_sum += float(net.sum())
+        net_squares += float((net * net).sum())
+        played += len(net)
+
+        batch.check_reshuffle()
+
+    return played, net_sum, net_squares
+
+
+def simulate_house_edge(rounds: int, num_decks: int = 2, shuffle_pct: float = .75, strategy: str = 'basic',
+                        workers: int = None, shoes: int = 1000, seed: int = None) -> dict:
+    """
+    Estimates the house edge of a table configuration by sharding the rounds across a pool of worker processes
+
+    Args:
+        rounds: number of rounds to play
+        num_decks: number of decks in the shoe
+        shuffle_pct: fraction of the shoe dealt before it is reshuffled
+        strategy: name of the player strategy in STRATEGIES
+        workers: number of worker processes, defaults to the number of CPUs
+        shoes: number of shoes each worker plays in lockstep
+        seed: root seed, spawned into an independent stream for every shard
+
+    Returns:
+        dict of the rounds played, the house edge per unit bet, the standard deviation of a round and the half width
+        of the 95% confidence interval of the house edge
+    """
+    if rounds <= 0:
+        raise ValueError('rounds must be positive: {}'.format(rounds))
+    shards = workers or os.cpu_count() or 1
+    shard_rounds = [rounds // shards + (1 if shard < rounds % shards else 0) for shard in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(simulate_shard, shard_rounds, [num_decks] * shards, [shuffle_pct] * shards,
+                                    [strategy] * shards, [shoes] * shards, seeds))
+
+    played = sum(result[0] for result in results)
+    mean = sum(result[1] for result in results) / played
+    std = sqrt(max(sum(result[2] for result in results) / played - mean * mean, 0.0))
+    return {'rounds': played, 'house_edge': -mean, 'std': std, 'ci': 1.96 * std / sqrt(played)}
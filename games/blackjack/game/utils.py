@@ -1,18 +1,25 @@
-from random import shuffle
 from typing import Union
 
 from utils.PlayingCards.card import Card
 from utils.PlayingCards.deck import Deck
+from utils.rng import RandomStream
+
+# The dealer draws until their hand is worth at least this much, standing on soft totals too
+DEALER_STANDS = 17
+
+# Hi-Lo count tag of each rank: low cards leaving the shoe favour the player, tens and aces favour the dealer
+HI_LO = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 10: -1, 'J': -1, 'Q': -1, 'K': -1, 'A': -1}
 
 
 class BlackjackCard(Card):
     """
     Playing card class for a blackjack game
     """
+    __slots__ = ('value',)
 
-    def __init__(self, suit: str, rank: Union[str, int]):
-        super().__init__(suit, rank)
-        self.value = self.get_value()
+    def setup(self, suit: str, rank: Union[str, int]) -> None:
+        super().setup(suit, rank)
+        object.__setattr__(self, 'value', self.get_value())
 
     def get_value(self) -> int:
         """
@@ -29,13 +36,48 @@ class BlackjackCard(Card):
 
 class BlackjackHand:
     """
-    Class for a player's hand of blackjack
+    Class for a player's hand of blackjack. The hand keeps a running total and the number of aces still counted as 11
+    as cards are added, so reading its value is O(1).
     """
 
     def __init__(self):
         self.hand = []
         self.outcome = None
 
+    @property
+    def hand(self) -> tuple:
+        """
+        Returns:
+            the cards in the hand
+        """
+        return self.cards
+
+    @hand.setter
+    def hand(self, cards: list) -> None:
+        self.cards = ()
+        self.total = 0
+        self.soft_aces = 0
+        self.rendered = None
+        for card in cards:
+            self.add_card(card)
+
+    def add_card(self, new_card: BlackjackCard) -> None:
+        """
+        Adds a card to the hand and updates the running total, counting an ace as 1 instead of 11 when the hand would
+        otherwise bust
+
+        Args:
+            new_card: new card to be added to the hand
+        """
+        self.cards += (new_card,)
+        self.rendered = None
+        self.total += new_card.value
+        if new_card.value == 11:
+            self.soft_aces += 1
+        while self.total > 21 and self.soft_aces > 0:
+            self.total -= 10
+            self.soft_aces -= 1
+
     def hit(self, new_card: BlackjackCard) -> bool:
         """
         Appends a new card to the players hand
@@ -46,28 +88,36 @@ class BlackjackHand:
         Returns:
             True if the hand's value is over 21. Otherwise False
         """
-        self.hand.append(new_card)
-        if self.value() >= 21:
-            return True
-
-        return False
+        self.add_card(new_card)
+        return self.total >= 21
 
     def value(self) -> int:
         """
         Returns:
             The integer value of the blackjack hand
         """
-        total, aces = 0, 0
-        for card in self.hand:
-            if card.rank != 'A':
-                total += card.value
-            else:
-                total += 11
-                aces += 1
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
-        return total
+        return self.total
+
+    def is_soft(self) -> bool:
+        """
+        Returns:
+            True if an ace in the hand is counted as 11
+        """
+        return self.soft_aces > 0
+
+    def is_bust(self) -> bool:
+        """
+        Returns:
+            True if the hand's value is over 21
+        """
+        return self.total > 21
+
+    def is_blackjack(self) -> bool:
+        """
+        Returns:
+            True if the hand is a natural 21 in two cards
+        """
+        return self.total == 21 and len(self.cards) == 2
 
     def calculate_outcome(self, dealer) -> None:
         """
@@ -76,15 +126,15 @@ class BlackjackHand:
         Args:
             dealer: the dealer's hand to compare this hand to
         """
-        if self.value() > 21:
+        if self.is_bust():
             self.outcome = 'Player Bust'
-        elif self.value() == 21 and len(self.hand) == 2:
+        elif self.is_blackjack():
             self.outcome = 'Blackjack'
-        elif dealer.value() > 21:
+        elif dealer.is_bust():
             self.outcome = 'Dealer Bust'
-        elif self.value() > dealer.value():
+        elif self.total > dealer.total:
             self.outcome = 'Win'
-        elif self.value() == dealer.value():
+        elif self.total == dealer.total:
             self.outcome = 'Push'
         else:
             self.outcome = 'Loss'
@@ -92,43 +142,67 @@ class BlackjackHand:
     def to_list(self) -> list:
         """
         Returns:
-            a list containing the string representation of all the cords
+            a list containing the string representation of all the cords, cached until the next card is added
         """
-        return [str(card) for card in self.hand]
+        if self.rendered is None:
+            self.rendered = [str(card) for card in self.cards]
+        return self.rendered
 
     def __repr__(self) -> str:
         """
         Returns:
             the string representation of the hand
         """
-        return str(self.hand.__str__()) + " " + str(self.value())
+        return str(list(self.cards)) + " " + str(self.total)
 
 
 class Pack(Deck):
     """
-    Class for a pack of multiple Decks, like is used in blackjack
+    Class for a shoe of multiple Decks, like is used in blackjack. The shoe holds its cards once and deals through a
+    shuffled permutation of their indexes by advancing a cursor, so dealing and reshuffling never rebuild or move cards.
+    The Hi-Lo running count of the cards dealt since the last shuffle is kept in running_count.
     """
 
-    def __init__(self, num_decks: int = 2, shuffle_pct: float = .75, card_class=Card):
+    def __init__(self, num_decks: int = 2, shuffle_pct: float = .75, card_class=Card, rng: RandomStream = None):
         self.num_decks = num_decks
         self.card_class = card_class
-        super().__init__(card_class)
-        self.shuffle_card = int(len(self.deck) * (1 - shuffle_pct))
+        self.cards = ()
+        self.order = []
+        self.cursor = 0
+        self.tags = ()
+        self.running_count = 0
+        super().__init__(card_class, rng)
+        self.shuffle_card = int(len(self.cards) * (1 - shuffle_pct))
+
+    @property
+    def deck(self) -> list:
+        """
+        Returns:
+            the cards left in the shoe, in the order they will be dealt
+        """
+        return [self.cards[index] for index in self.order[self.cursor:]]
+
+    @deck.setter
+    def deck(self, cards: list) -> None:
+        self.cards = tuple(cards)
+        self.tags = tuple(HI_LO.get(card.rank.rank, 0) for card in self.cards)
+        self.order = list(range(len(self.cards)))
+        self.cursor = 0
+        self.running_count = 0
 
     def build(self) -> None:
         """
         Builds the pack and fills it with cards
         """
-        self.deck = []
-        for _ in range(self.num_decks):
-            self.deck += Deck(card_class=self.card_class).deck
+        self.deck = self.card_class.full_deck() * self.num_decks
 
     def shuffle(self) -> None:
         """
-        Builds and shuffles a new pack
+        Gathers every card back into the shoe and shuffles it in place
         """
-        self.build()
-        shuffle(self.deck)
+        self.rng.shuffle(self.order)
+        self.cursor = 0
+        self.running_count = 0
 
     def deal(self) -> Card:
         """
@@ -137,15 +211,21 @@ class Pack(Deck):
         Returns:
             The card dealt
         """
-        return self.deck.pop(0)
+        index = self.order[self.cursor]
+        self.cursor += 1
+        self.running_count += self.tags[index]
+        return self.cards[index]
 
     def check_reshuffle(self) -> None:
         """
         Checks if the deck needs to be reshuffled and reshuffles it if it does.
         """
-        if len(self.deck) < self.shuffle_card:
+        if len(self) < self.shuffle_card:
             self.shuffle()
 
+    def __len__(self) -> int:
+        return len(self.order) - self.cursor
+
 
 class Dealer(BlackjackHand):
     """
@@ -160,5 +240,5 @@ class Dealer(BlackjackHand):
         """
         Plays the dealers hand and adds cards till the value is 17+
         """
-        while self.value() <= 16:
-            self.hand.append(self.pack.deal())
+        while self.total < DEALER_STANDS:
+            self.add_card(self.pack.deal())
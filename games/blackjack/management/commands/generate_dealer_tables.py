@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from games.blackjack.game.hints import DEALER_TABLE_PATH, generate_dealer_tables
+
+
+class Command(BaseCommand):
+    """
+    Regenerates the dealer tables shipped with the blackjack game
+    """
+    help = 'Computes the dealer final total distributions and hit/stay expected results for every shoe class'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--output', default=str(DEALER_TABLE_PATH), help='file to write the tables to')
+
+    def handle(self, *args, **options) -> None:
+        tables = generate_dealer_tables()
+
+        # One composition class and up card per line keeps regenerated tables reviewable in diffs
+        with open(options['output'], 'w') as table_file:
+            table_file.write('{{"version": {}, "finals": {}'.format(tables['version'], json.dumps(tables['finals'])))
+            for name in ('dealer', 'ev'):
+                table_file.write(',\n"{}": {{\n'.format(name))
+                table_file.write(',\n'.join(
+                    ' "{}": {{\n'.format(count) + ',\n'.join('  "{}": {}'.format(up_card, json.dumps(entry))
+                                                            for up_card, entry in by_up_card.items()) + '\n }'
+                    for count, by_up_card in tables[name].items()))
+                table_file.write('\n}')
+            table_file.write('\n}\n')
+
+        self.stdout.write('Wrote dealer tables for {} composition classes to {}'.format(len(tables['dealer']),
+                                                                                      options['output']))
@@ -0,0 +1,36 @@
+import time
+from itertools import product
+
+from django.core.management.base import BaseCommand
+
+from games.blackjack.game.simulator import STRATEGIES, simulate_house_edge
+
+
+class Command(BaseCommand):
+    """
+    Estimates the house edge of blackjack table configurations by simulation
+    """
+    help = 'Simulates blackjack rounds under the real payout and dealer rules and reports the house edge'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--rounds', type=int, default=1000000, help='rounds simulated per configuration')
+        parser.add_argument('--decks', type=int, nargs='+', default=[2], help='numbers of decks in the shoe')
+        parser.add_argument('--shuffle-pct', type=float, nargs='+', default=[.75],
+                            help='fractions of the shoe dealt before reshuffling')
+        parser.add_argument('--strategy', nargs='+', default=['basic'], choices=sorted(STRATEGIES),
+                            help='player strategies')
+        parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+        parser.add_argument('--shoes', type=int, default=1000, help='shoes each worker plays in lockstep')
+        parser.add_argument('--seed', type=int, default=None, help='root seed of the simulation')
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write('{:>5} {:>8} {:>11} {:>10} {:>12} {:>8}'.format('decks', 'shuffle', 'strategy', 'rounds',
+                                                                        'house edge', '95% CI'))
+        for num_decks, shuffle_pct, strategy in product(options['decks'], options['shuffle_pct'],
+                                                        options['strategy']):
+            start = time.monotonic()
+            result = simulate_house_edge(options['rounds'], num_decks, shuffle_pct, strategy, options['workers'],
+                                         options['shoes'], options['seed'])
+            self.stdout.write('{:>5} {:>8.2f} {:>11} {:>10} {:>11.3%} {:>7.3%}  ({:.1f}s)'.format(
+                num_decks, shuffle_pct, strategy, result['rounds'], result['house_edge'], result['ci'],
+                time.monotonic() - start))
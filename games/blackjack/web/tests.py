@@ -1,11 +1,15 @@
 from uuid import uuid4
 
+import numpy as np
 from django.contrib import auth
 from django.test import TestCase
 
 from accounts.models import CustomUser
 from games.blackjack.game.blackjack import BlackjackRound
-from games.blackjack.game.utils import Pack, BlackjackCard
+from games.blackjack.game.hints import FINAL_TOTALS, composition_class, dealer_distribution, hint, \
+    load_dealer_tables, value_probabilities
+from games.blackjack.game.simulator import STRATEGIES, ShoeBatch, simulate_house_edge, simulate_shard
+from games.blackjack.game.utils import Pack, BlackjackCard, BlackjackHand, Dealer
 from games.blackjack.web.views import BLACKJACK_MANAGER
 
 
@@ -444,3 +448,202 @@ class TestBlackjackRound(TestCase):
 #         response = await communicator.receive_json_from()
 #         self.assertEqual(self.user.current_balance, float(response['data']['balance']))
 #         await communicator.disconnect()
+
+
+class TestBlackjackCards(TestCase):
+    """
+    Testing the shared blackjack card objects
+    """
+
+    def test_cards_are_interned(self):
+        self.assertIs(BlackjackCard('S', 'K'), BlackjackCard('S', 'K'))
+        self.assertEqual(10, BlackjackCard('S', 'K').value)
+        self.assertEqual('KS', str(BlackjackCard('S', 'K')))
+
+    def test_cards_are_immutable(self):
+        with self.assertRaises(AttributeError):
+            BlackjackCard('S', 'K').value = 11
+
+    def test_pack_holds_references_to_shared_cards(self):
+        pack = Pack(num_decks=4, card_class=BlackjackCard)
+        self.assertEqual(208, len(pack.deck))
+        self.assertEqual(52, len({id(card) for card in pack.deck}))
+        self.assertTrue(all(card is BlackjackCard(card.suit.suit, card.rank.rank) for card in pack.deck))
+
+
+class TestBlackjackPack(TestCase):
+    """
+    Testing the cursor based blackjack shoe
+    """
+
+    def test_deal_advances_through_the_shoe(self):
+        pack = Pack(num_decks=6, card_class=BlackjackCard)
+        upcoming = pack.deck[:3]
+        self.assertEqual(upcoming, [pack.deal() for _ in range(3)])
+        self.assertEqual(309, len(pack))
+        self.assertEqual(309, len(pack.deck))
+
+    def test_check_reshuffle_honours_cut_card(self):
+        pack = Pack(num_decks=2, shuffle_pct=.75, card_class=BlackjackCard)
+        for _ in range(78):
+            pack.deal()
+        pack.check_reshuffle()
+        self.assertEqual(26, len(pack))
+        pack.deal()
+        pack.check_reshuffle()
+        self.assertEqual(104, len(pack))
+
+    def test_shuffle_keeps_every_card(self):
+        pack = Pack(num_decks=8, card_class=BlackjackCard)
+        for _ in range(100):
+            pack.deal()
+        pack.shuffle()
+        self.assertEqual(sorted(map(str, BlackjackCard.full_deck() * 8)), sorted(map(str, pack.deck)))
+
+
+class TestBlackjackHand(TestCase):
+    """
+    Testing the running totals of a blackjack hand
+    """
+
+    def test_soft_aces_drop_to_one_as_cards_are_added(self):
+        hand = BlackjackHand()
+        hand.hand = [BlackjackCard('S', 'A'), BlackjackCard('H', 'K')]
+        self.assertEqual(21, hand.value())
+        self.assertTrue(hand.is_soft())
+        self.assertTrue(hand.is_blackjack())
+        hand.hit(BlackjackCard('D', 'A'))
+        self.assertEqual(12, hand.value())
+        self.assertFalse(hand.is_soft())
+        self.assertFalse(hand.is_blackjack())
+
+    def test_running_total_matches_full_recount(self):
+        pack = Pack(num_decks=2, card_class=BlackjackCard)
+        for _ in range(200):
+            hand = BlackjackHand()
+            while not hand.is_bust():
+                hand.hit(pack.deal())
+                total = sum(card.value for card in hand.hand)
+                aces = sum(1 for card in hand.hand if card.value == 11)
+                while total > 21 and aces:
+                    total, aces = total - 10, aces - 1
+                self.assertEqual(total, hand.value())
+            pack.shuffle()
+
+    def test_rendered_hand_is_refreshed_after_a_hit(self):
+        hand = BlackjackHand()
+        hand.hit(BlackjackCard('S', 9))
+        self.assertEqual(['9S'], hand.to_list())
+        hand.hit(BlackjackCard('C', 'Q'))
+        self.assertEqual(['9S', 'QC'], hand.to_list())
+
+
+class TestBlackjackSimulator(TestCase):
+    """
+    Testing the vectorized blackjack simulator against the game rules
+    """
+
+    def test_shoe_batch_deals_whole_decks(self):
+        batch = ShoeBatch(3, 2, .75, np.random.default_rng(435))
+        dealt = np.stack([batch.deal(np.ones(3, dtype=bool)) for _ in range(104)], axis=1)
+        expected = sorted(card.value for card in BlackjackCard.full_deck() * 2)
+        for row in dealt:
+            self.assertEqual(expected, sorted(row.tolist()))
+
+    def test_shoe_batch_reshuffles_at_cut_card(self):
+        batch = ShoeBatch(2, 2, .75, np.random.default_rng(435))
+        for _ in range(79):
+            batch.deal(np.array([True, False]))
+        batch.check_reshuffle()
+        self.assertEqual([0, 0], batch.cursor.tolist())
+
+    def test_shard_is_reproducible(self):
+        self.assertEqual(simulate_shard(5000, 2, .75, 'basic', 100, 435),
+                         simulate_shard(5000, 2, .75, 'basic', 100, 435))
+
+    def test_shard_matches_game_rules(self):
+        rounds, net_sum, _ = simulate_shard(200000, 2, .75, 'dealer', 1000, 435)
+        self.assertEqual(200000, rounds)
+
+        pack = Pack(num_decks=2, card_class=BlackjackCard)
+        game_net = 0
+        for _ in range(20000):
+            hand, dealer = BlackjackHand(), Dealer(pack)
+            for _ in range(2):
+                hand.add_card(pack.deal())
+                dealer.add_card(pack.deal())
+            while hand.value() < 17:
+                hand.hit(pack.deal())
+            dealer.play_hand()
+            hand.calculate_outcome(dealer)
+            game_net += BlackjackRound.PAYOUTS.get(hand.outcome, 0) - 1
+            pack.check_reshuffle()
+        self.assertAlmostEqual(game_net / 20000, net_sum / rounds, delta=0.03)
+
+    def test_basic_strategy_beats_mimicking_the_dealer(self):
+        basic = simulate_house_edge(200000, strategy='basic', workers=1, seed=435)
+        dealer = simulate_house_edge(200000, strategy='dealer', workers=1, seed=435)
+        self.assertEqual(200000, basic['rounds'])
+        self.assertTrue(basic['house_edge'] + basic['ci'] < dealer['house_edge'] - dealer['ci'])
+        self.assertEqual({'basic', 'dealer', 'never-bust'}, set(STRATEGIES))
+
+    def test_simulating_no_rounds_is_rejected(self):
+        with self.assertRaises(ValueError):
+            simulate_house_edge(0, workers=1)
+
+
+class TestBlackjackHints(TestCase):
+    """
+    Testing the dealer tables and the hints given to beginners
+    """
+
+    def setUp(self) -> None:
+        self.user = CustomUser.objects.create_user(username='user', password='pass', current_balance=300,
+                                                   skill_level='Beginner')
+        self.expert = CustomUser.objects.create_user(username='expert', password='pass', current_balance=300,
+                                                     skill_level='expert')
+        self.session_id = BLACKJACK_MANAGER.create()
+        BLACKJACK_MANAGER.register_user(self.session_id, self.user)
+        BLACKJACK_MANAGER.register_user(self.session_id, self.expert)
+        self.game = BLACKJACK_MANAGER.get(self.session_id)
+
+    def tearDown(self) -> None:
+        BLACKJACK_MANAGER.sessions = {}
+
+    def test_shipped_tables_are_distributions(self):
+        tables = load_dealer_tables()
+        self.assertEqual(list(FINAL_TOTALS), tables['finals'])
+        for by_up_card in tables['dealer'].values():
+            for distribution in by_up_card.values():
+                self.assertAlmostEqual(1, sum(distribution), delta=0.001)
+
+    def test_dealer_distribution_follows_play_hand(self):
+        bust = dealer_distribution(6, value_probabilities(0))[5]
+        self.assertAlmostEqual(0.423, bust, delta=0.001)
+        self.assertTrue(dealer_distribution(6, value_probabilities(4))[5] > bust)
+
+    def test_hole_card_is_not_counted(self):
+        pack = Pack(card_class=BlackjackCard)
+        pack.deck = [BlackjackCard('S', 2)] * 3 + [BlackjackCard('S', 'K')] * 101
+        dealer = Dealer(pack)
+        dealer.add_card(pack.deal())
+        dealer.add_card(pack.deal())
+        pack.deal()
+        self.assertEqual('1', composition_class(pack, dealer))
+
+    def test_hint_advises_hitting_hard_twelve_against_a_two(self):
+        pack = Pack(card_class=BlackjackCard)
+        hand, dealer = BlackjackHand(), Dealer(pack)
+        hand.hand = [BlackjackCard('S', 10), BlackjackCard('S', 2)]
+        dealer.hand = [BlackjackCard('H', 2), BlackjackCard('H', 9)]
+        self.assertEqual('hit', hint(hand, dealer, pack)['advice'])
+        dealer.hand = [BlackjackCard('H', 6), BlackjackCard('H', 9)]
+        self.assertEqual('stay', hint(hand, dealer, pack)['advice'])
+
+    def test_only_beginners_get_hints(self):
+        pack = Pack(card_class=BlackjackCard)
+        pack.deck = [BlackjackCard('S', 2), BlackjackCard('S', 3), BlackjackCard('S', 4)] * 20
+        self.game.round = BlackjackRound(pack, self.game)
+        hands = {hand['player']: hand for hand in self.game.dict_representation()['hands']}
+        self.assertIn('hint', hands['user'])
+        self.assertNotIn('hint', hands['expert'])
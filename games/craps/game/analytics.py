@@ -0,0 +1,236 @@
+from math import sqrt
+
+import numpy as np
+
+from games.craps.game.bets import BET_TYPES, OUTCOMES, POINTS, resolve
+
+
+def roll_chances() -> dict:
+    """
+    Returns:
+        dict of every roll of two dice, as (total, whether the dice were doubles), to its chance out of the 36 outcomes
+    """
+    chances = dict()
+    for die1 in range(1, 7):
+        for die2 in range(1, 7):
+            roll = (die1 + die2, die1 == die2)
+            chances[roll] = chances.get(roll, 0) + 1 / 36
+    return chances
+
+
+ROLLS = roll_chances()
+
+# Bets that are made on the come out roll. Every other bet is made once the point is established.
+COME_OUT_BETS = ('pass', 'dont_pass')
+
+
+def decision_distribution(bet: str, point: int = None) -> dict:
+    """
+    Computes the exact distribution of the net result of a bet, from when it is made until it is taken off the table.
+    Rolls that leave the bet up are skipped over, and bets that travel move on to the point that was rolled.
+
+    Args:
+        bet: name of the bet type, which must only pay when it is resolved
+        point: the point the bet is made against, None before one is set
+
+    Returns:
+        dict of net result per unit bet to its chance
+    """
+    distribution = dict()
+    results = {roll: resolve(bet, point, *roll) for roll in ROLLS}
+    if any(paid and not resolved for paid, resolved in results.values()):
+        raise ValueError('{} pays without being resolved, use roll_distribution'.format(bet))
+
+    travels = BET_TYPES[bet].travels and not point
+    # Rolls that leave a bet up are repeated until it is resolved, unless the bet travels to the point rolled
+    scale = 1 if travels else 1 / sum(ROLLS[roll] for roll, (_, resolved) in results.items() if resolved)
+    for roll, (paid, resolved) in results.items():
+        if resolved:
+            distribution[paid - 1] = distribution.get(paid - 1, 0) + ROLLS[roll] * scale
+
+    if travels:
+        for total in POINTS:
+            chance = ROLLS[(total, False)] + ROLLS.get((total, True), 0)
+            for net, point_chance in decision_distribution(bet, total).items():
+                distribution[net] = distribution.get(net, 0) + chance * point_chance
+
+    return distribution
+
+
+def roll_distribution(bet: str, point: int = None) -> dict:
+    """
+    Computes the exact distribution of the net result of a bet on a single roll, counting the stake as lost only when
+    the bet is taken down. Suits bets like place bets that pay and stay up.
+
+    Args:
+        bet: name of the bet type
+        point: the shooter's point, None before one is set
+
+    Returns:
+        dict of net result per unit bet to its chance
+    """
+    distribution = dict()
+    for roll, chance in ROLLS.items():
+        paid, resolved = resolve(bet, point, *roll)
+        net = paid - 1 if resolved else paid
+        distribution[net] = distribution.get(net, 0) + chance
+    return distribution
+
+
+def moments(distribution: dict) -> tuple[float, float]:
+    """
+    Args:
+        distribution: dict of net result to its chance
+
+    Returns:
+        A tuple of the expected value and variance of the net result
+    """
+    ev = sum(net * chance for net, chance in distribution.items())
+    return ev, sum((net - ev) ** 2 * chance for net, chance in distribution.items())
+
+
+def bet_statistics() -> list:
+    """
+    Computes the exact expected value and variance of every bet type, per unit bet. Line bets are measured from the
+    come out roll, bets that depend on the point against every point, and place bets per roll since they stay up
+    after paying.
+
+    Returns:
+        list of dicts with the bet name, its point, what a trial is ('decision' or 'roll'), the expected value and the
+        variance
+    """
+    statistics = []
+    for bet, bet_type in BET_TYPES.items():
+        if bet_type.travels or bet == 'field':
+            points = [None]
+        else:
+            points = POINTS
+
+        for point in points:
+            per = 'roll' if bet.startswith('place') else 'decision'
+            distribution = roll_distribution(bet, point) if per == 'roll' else decision_distribution(bet, point)
+            ev, variance = moments(distribution)
+            statistics.append({'bet': bet, 'point': point, 'per': per, 'ev': ev, 'variance': variance})
+    return statistics
+
+
+def outcome_arrays(bet: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Lays out a bet's rows of the bet table as arrays, for resolving many rounds at once
+
+    Args:
+        bet: name of the bet type
+
+    Returns:
+        A tuple of the amount paid per unit bet and whether the bet is resolved, indexed by [point or 0, total, hard]
+    """
+    paid = np.zeros((11, 13, 2))
+    resolved = np.zeros((11, 13, 2), dtype=bool)
+    for (name, point, total, hard), (pays, resolves) in OUTCOMES.items():
+        if name == bet:
+            paid[point, total, int(hard)] = pays
+            resolved[point, total, int(hard)] = resolves
+    return paid, resolved
+
+
+def simulate_chunk(rounds: int, bets: dict, rng: np.random.Generator) -> np.ndarray:
+    """
+    Plays rounds of craps all at once, following the flow of CrapsRound and the settlement of CrapsGame.settle_roll.
+    Pass and don't pass bets are made before the come out roll. If a point is established, every other bet is made
+    against it, and the shooter rolls until the pass line is resolved. Bets still working at the end of a round are
+    returned.
+
+    Args:
+        rounds: number of rounds to play
+        bets: dict of bet name to the amount bet on it every round
+        rng: the random number generator
+
+    Returns:
+        the net result of each round
+    """
+    tables = {bet: outcome_arrays(bet) for bet in bets}
+
+    def roll(count: int) -> tuple[np.ndarray, np.ndarray]:
+        dice = rng.integers(1, 7, size=(2, count), dtype=np.int64)
+        return dice[0] + dice[1], (dice[0] == dice[1]).astype(np.int64)
+
+    net = np.zeros(rounds)
+    point = np.zeros(rounds, dtype=np.int64)
+    total, hard = roll(rounds)
+    for bet in COME_OUT_BETS:
+        if bet in bets:
+            paid, _ = tables[bet]
+            net += bets[bet] * (paid[point, total, hard] - 1)
+
+    _, pass_resolved = tables.get('pass', outcome_arrays('pass'))
+    active = np.flatnonzero(~pass_resolved[point, total, hard])
+    point[active] = total[active]
+
+    # Stakes of the bets still up in each active round
+    working = {bet: np.full(len(active), float(stake)) for bet, stake in bets.items()}
+    for bet, stake in bets.items():
+        if bet not in COME_OUT_BETS:
+            net[active] -= stake
+
+    while len(active):
+        total, hard = roll(len(active))
+        points = point[active]
+        for bet, stakes in working.items():
+            paid, resolved = tables[bet]
+            net[active] += stakes * paid[points, total, hard]
+            stakes[resolved[points, total, hard]] = 0
+
+        over = pass_resolved[points, total, hard]
+        for stakes in working.values():
+            net[active[over]] += stakes[over]
+
+        keep = ~over
+        active = active[keep]
+        working = {bet: stakes[keep] for bet, stakes in working.items()}
+
+    return net
+
+
+def simulate_rounds(rounds: int, bets: dict, seed: int = None, chunk_size: int = 1000000) -> np.ndarray:
+    """
+    Plays rounds of craps in chunks, so memory stays bounded however many rounds are played
+
+    Args:
+        rounds: number of rounds to play
+        bets: dict of bet name to the amount bet on it every round
+        seed: seed for the random number generator
+        chunk_size: number of rounds played at once
+
+    Returns:
+        the net result of each round
+    """
+    unknown = set(bets) - set(BET_TYPES)
+    if unknown:
+        raise ValueError('Unknown bet types: {}'.format(', '.join(sorted(unknown))))
+
+    rng = np.random.default_rng(seed)
+    return np.concatenate([simulate_chunk(min(chunk_size, rounds - start), bets, rng)
+                           for start in range(0, rounds, chunk_size)] or [np.zeros(0)])
+
+
+def bankroll_risk(net: np.ndarray, bankroll: float, session_rounds: int) -> dict:
+    """
+    Splits simulated rounds into sessions and measures how often a player's bankroll runs out
+
+    Args:
+        net: the net result of each round
+        bankroll: the amount a player sits down with
+        session_rounds: number of rounds in a session
+
+    Returns:
+        dict of the number of sessions, the chance of going broke during a session, the expected result of a round and
+        the half width of its 95% confidence interval, and the standard deviation of a round
+    """
+    sessions = len(net) // session_rounds
+    paths = np.cumsum(net[:sessions * session_rounds].reshape(sessions, session_rounds), axis=1)
+    std = float(net.std())
+    return {'sessions': sessions,
+            'ruin': float((paths.min(axis=1) <= -bankroll).mean()) if sessions else 0.0,
+            'ev': float(net.mean()),
+            'ci': 1.96 * std / sqrt(max(len(net), 1)),
+            'std': std}
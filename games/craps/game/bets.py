@@ -0,0 +1,130 @@
+from typing import Callable, Optional
+
+POINTS = (4, 5, 6, 8, 9, 10)
+
+# Winnings per unit bet of the odds, place and hardway bets
+TRUE_ODDS = {4: 2, 5: 3 / 2, 6: 6 / 5, 8: 6 / 5, 9: 3 / 2, 10: 2}
+PLACE_PAYS = {4: 9 / 5, 5: 7 / 5, 6: 7 / 6, 8: 7 / 6, 9: 7 / 5, 10: 9 / 5}
+HARDWAY_PAYS = {4: 7, 6: 9, 8: 9, 10: 7}
+
+# Nothing is paid and the bet stays up
+NO_ACTION = (0, False)
+
+
+class BetType:
+    """
+    A kind of craps bet, declared by a rule giving its result for any point and roll. Results are a tuple of how much
+    is paid back per unit bet, stake included, and whether the bet is taken off the table. Bets that travel, like the
+    pass and come lines, are resolved against their own point, which is set by the first roll that does not resolve
+    them. All other bets are resolved against the shooter's point.
+    """
+
+    def __init__(self, name: str, rule: Callable[[int, int, bool], Optional[tuple]], travels: bool = False):
+        self.name = name
+        self.rule = rule
+        self.travels = travels
+
+
+def line_rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+    if not point:
+        return (2, True) if total in (7, 11) else (0, True) if total in (2, 3, 12) else None
+    return (2, True) if total == point else (0, True) if total == 7 else None
+
+
+def dont_line_rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+    if not point:
+        return (2, True) if total in (2, 3) else (1, True) if total == 12 else (0, True) if total in (7, 11) else None
+    return (2, True) if total == 7 else (0, True) if total == point else None
+
+
+def odds_rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+    if not point:
+        return None
+    return (1 + TRUE_ODDS[point], True) if total == point else (0, True) if total == 7 else None
+
+
+def lay_odds_rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+    if not point:
+        return None
+    return (1 + 1 / TRUE_ODDS[point], True) if total == 7 else (0, True) if total == point else None
+
+
+def place_rule(number: int) -> Callable:
+    def rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+        if not point:
+            return None
+        return (PLACE_PAYS[number], False) if total == number else (0, True) if total == 7 else None
+    return rule
+
+
+def field_rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+    return {2: (3, True), 12: (4, True), 3: (2, True), 4: (2, True), 9: (2, True), 10: (2, True),
+            11: (2, True)}.get(total, (0, True))
+
+
+def hardway_rule(number: int) -> Callable:
+    def rule(point: int, total: int, hard: bool) -> Optional[tuple]:
+        if not point:
+            return None
+        if total == number:
+            return (1 + HARDWAY_PAYS[number], True) if hard else (0, True)
+        return (0, True) if total == 7 else None
+    return rule
+
+
+BET_TYPES = {bet_type.name: bet_type for bet_type in
+             [BetType('pass', line_rule, travels=True), BetType('dont_pass', dont_line_rule, travels=True),
+              BetType('come', line_rule, travels=True), BetType('dont_come', dont_line_rule, travels=True),
+              BetType('pass_odds', odds_rule), BetType('dont_pass_odds', lay_odds_rule),
+              BetType('field', field_rule)] +
+             [BetType('place_{}'.format(number), place_rule(number)) for number in POINTS] +
+             [BetType('hard_{}'.format(number), hardway_rule(number)) for number in HARDWAY_PAYS]}
+
+
+def build_outcomes() -> dict:
+    """
+    Evaluates every bet rule for every point and roll, so that resolving a bet is a single dictionary lookup
+
+    Returns:
+        dict of (bet name, point or 0, roll total, whether the roll was doubles) to the result of the bet. Rolls with
+        no action are left out. Both keys are kept for every total, so bets that ignore doubles can be looked up by
+        total alone.
+    """
+    outcomes = dict()
+    for name, bet_type in BET_TYPES.items():
+        for point in (0,) + POINTS:
+            for total in range(2, 13):
+                for hard in (False, True):
+                    result = bet_type.rule(point, total, hard)
+                    if result is not None:
+                        outcomes[(name, point, total, hard)] = result
+    return outcomes
+
+
+OUTCOMES = build_outcomes()
+
+
+def resolve(bet: str, point: Optional[int], total: int, hard: bool = False) -> tuple:
+    """
+    Looks up the result of a bet on a roll
+
+    Args:
+        bet: name of the bet type
+        point: the point the bet is resolved against, None before one is set
+        total: the total of the dice
+        hard: whether the dice were doubles
+
+    Returns:
+        A tuple of how much is paid back per unit bet, stake included, and whether the bet is taken off the table
+    """
+    return OUTCOMES.get((bet, point or 0, total, hard), NO_ACTION)
+
+
+class Wager:
+    """
+    A player's stake on a bet type, along with the bet's own point if it travels
+    """
+
+    def __init__(self, stake: float, point: Optional[int] = None):
+        self.stake = stake
+        self.point = point
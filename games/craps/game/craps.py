@@ -1,9 +1,13 @@
-import random
 from uuid import UUID
 
 from accounts.models import CustomUser
 from games.base import Game
+from games.craps.game.bets import BET_TYPES, Wager, resolve
 from games.craps.game.round import CrapsRound
+from games.craps.game.seats import SeatRing
+
+# Keys of the line bets in the bets dictionary. Every other bet type is keyed by its own name.
+LINE_BETS = {'pass': 'pass_bet', 'dont_pass': 'dont_pass_bet', 'come': 'come_bet', 'dont_come': 'dont_come_bet'}
 
 
 class CrapsGame(Game):
@@ -15,10 +19,13 @@ class CrapsGame(Game):
         super().__init__(session_id)
 
         self.round = None
-        self.waiting_room = set()
+        # Kept in arrival order, so players are seated in the order they came to the table
+        self.waiting_room = dict()
         self.bets = {player: {"pass_bet": 0, "dont_pass_bet": 0, "come_bet": 0, "dont_come_bet": 0}
                      for player in self.players}
+        self.wagers = {player: dict() for player in self.players}
         self.players_ready = {player: False for player in self.players}
+        self.seats = SeatRing()
         self.shooter = None
 
     def add_players_from_waiting_room(self) -> None:
@@ -28,7 +35,8 @@ class CrapsGame(Game):
 
         for player in self.waiting_room:
             self.players.add(player)
-        self.waiting_room = set()
+            self.seats.add(player)
+        self.waiting_room = dict()
 
     def all_ready(self) -> bool:
         """
@@ -85,22 +93,15 @@ class CrapsGame(Game):
 
         for player in self.players:
             self.bets[player] = {"pass_bet": 0, "dont_pass_bet": 0, "come_bet": 0, "dont_come_bet": 0}
+            self.wagers[player] = dict()
             self.players_ready[player] = False
 
     def choose_next_shooter(self) -> None:
         """
-        Function to randomly determine the next shooter. Normally in Craps, the dice are passed to the left. We're using
-        a set to represent the players, so that's not really feasible here, since sets are unordered. This function will
-        choose a random player, with the condition that the same player can't be the shooter twice, unless there is only
-        one player.
+        Function to determine the next shooter. As in Craps, the dice are passed to the left, around the ring of seats
+        in the order players joined the table. The same player only shoots twice in a row if they are alone.
         """
-        new_shooter = random.choice(tuple(self.players))
-
-        if len(self.players) > 1:
-            while new_shooter == self.shooter:
-                new_shooter = random.choice(tuple(self.players))
-
-        self.shooter = new_shooter
+        self.shooter = self.seats.pass_dice()
 
     def start_round(self) -> None:
         """
@@ -109,13 +110,13 @@ class CrapsGame(Game):
         """
 
         self.choose_next_shooter()
-        self.round = CrapsRound(self.players, self.shooter)
+        self.round = CrapsRound(self.players, self.shooter, self.rng)
 
     def remove_player(self, player: CustomUser) -> None:
         """
         Function to remove a player from the game. If the player is currently in the game and not the waiting room, they
-        must be removed from the list of players, the players_ready dictionary, the bets dictionary, and the CrapsRound
-        object.
+        must be removed from the list of players, their seat, the players_ready dictionary, the bets dictionary, and the
+        CrapsRound object.
 
         If there are no players left in the game, the game is reset. If the player is in the waiting room, they're
         simply removed from it.
@@ -127,19 +128,21 @@ class CrapsGame(Game):
         if player in self.players:
             self.players_ready.pop(player)
             self.bets.pop(player)
+            self.wagers.pop(player)
             self.players.remove(player)
+            self.seats.remove(player)
 
             if len(self.players) == 0:
                 self.reset()
 
         if player in self.waiting_room:
-            self.waiting_room.remove(player)
+            self.waiting_room.pop(player)
 
     def add_player(self, player: CustomUser) -> None:
         """
         Function to add a player to the game. If the game is still in the initial betting phase (i.e. actual gameplay
-        has not started yet), the player is added to the list of players, the bets dictionary, and the players_ready
-        dictionary.
+        has not started yet), the player is added to the list of players, a seat, the bets dictionary, and the
+        players_ready dictionary.
 
         If the game is currently in progress, the player is added to the waiting room.
 
@@ -150,10 +153,12 @@ class CrapsGame(Game):
         if self.get_stage() == 'betting1':
             if player not in self.players:
                 self.players.add(player)
+                self.seats.add(player)
                 self.bets[player] = {"pass_bet": 0, "dont_pass_bet": 0, "come_bet": 0, "dont_come_bet": 0}
+                self.wagers[player] = dict()
                 self.players_ready[player] = False
         else:
-            self.waiting_room.add(player)
+            self.waiting_room[player] = None
 
     def update_pass_bets(self, player: CustomUser, pass_bet: float, dont_pass_bet: float) -> None:
         """
@@ -170,13 +175,16 @@ class CrapsGame(Game):
 
         self.bets[player]['pass_bet'] = pass_bet
         self.bets[player]['dont_pass_bet'] = dont_pass_bet
+        self.book_wager(player, 'pass', pass_bet)
+        self.book_wager(player, 'dont_pass', dont_pass_bet)
 
         player.update_balance(pass_diff + dont_pass_diff)
 
     def update_come_bets(self, player: CustomUser, come_bet: float, dont_come_bet: float) -> None:
         """
         Function to update the player's come and don't come bets, made during the second betting phase. The values are
-        stored in the bets dictionary, and are subtracted from the player's account balance.
+        stored in the bets dictionary, and are subtracted from the player's account balance. Come bets are made once the
+        point is established, so they are booked with the shooter's point as their own.
 
         Args:
             player: The player whose bet is being updated.
@@ -188,27 +196,108 @@ class CrapsGame(Game):
 
         self.bets[player]['come_bet'] = come_bet
         self.bets[player]['dont_come_bet'] = dont_come_bet
+        point = None if self.round is None else self.round.point
+        self.book_wager(player, 'come', come_bet, point)
+        self.book_wager(player, 'dont_come', dont_come_bet, point)
 
         player.update_balance(come_diff + dont_come_diff)
 
-    def calculate_payouts(self) -> None:
+    def book_wager(self, player: CustomUser, bet: str, stake: float, point: int = None) -> None:
         """
-        Function that calculates the payouts for each player and adds those values to their accounts. For craps, all
-        the line bets have a simple 1:1 odds, paying back the initial value that you bet, as well as that exact same
-        amount on top. In other words, double what you bet.
+        Function to set the stake of a player's wager on a bet type. Wagers with no stake are taken off the table.
+
+        Args:
+            player: The player making the wager.
+            bet: The name of the bet type.
+            stake: The total amount on the bet.
+            point: The bet's own point, for bets that travel.
         """
-        for player in self.players:
-            if self.round.pass_win:
-                player.update_balance(2 * self.bets[player]['pass_bet'])
+        if stake > 0:
+            self.wagers[player][bet] = Wager(stake, point)
+        else:
+            self.wagers[player].pop(bet, None)
+
+    def place_bet(self, player: CustomUser, bet: str, amount: float) -> bool:
+        """
+        Function to add to a player's wager on any bet type other than the line bets, which are made with
+        update_pass_bets and update_come_bets. Odds can only be taken once a point is established. The amount is added
+        to the bets dictionary and subtracted from the player's account balance.
+
+        Args:
+            player: The player making the bet.
+            bet: The name of the bet type.
+            amount: The amount to add to the bet.
+
+        Returns:
+            True if the bet was placed, False if it is not a valid bet or the player cannot cover it.
+        """
+        if bet not in BET_TYPES or bet in LINE_BETS or amount <= 0:
+            return False
+        if bet.endswith('odds') and (self.round is None or self.round.point is None):
+            return False
+
+        if not player.update_balance(-amount):
+            return False
+
+        self.bets[player][bet] = self.bets[player].get(bet, 0) + amount
+        self.book_wager(player, bet, self.bets[player][bet])
+        return True
+
+    def roll(self, action: str) -> tuple[int, int]:
+        """
+        Function to roll the dice for the round and settle every wager on the roll.
+
+        Args:
+            action: "come_out" if the dice are being rolled during the come out phase, "point" if the dice are being
+                    rolled during the point phase.
 
-            if self.round.dont_pass_win:
-                player.update_balance(2 * self.bets[player]['dont_pass_bet'])
+        Returns:
+            The two dice rolled.
+        """
+        point = self.round.point
+        die1, die2 = self.round.roll_dice(action)
+        self.settle_roll(point, die1, die2)
+        return die1, die2
 
-            if self.round.come_win:
-                player.update_balance(2 * self.bets[player]['come_bet'])
+    def settle_roll(self, point: int, die1: int, die2: int) -> dict:
+        """
+        Function that resolves every wager of every player on a roll by looking it up in the bet table. Bets that
+        travel are resolved against their own point and take the roll as their point if it does not resolve them, all
+        others against the shooter's point. Once the round is over, the wagers still up are returned. Everything a
+        player is owed is added to their account in a single update.
 
-            if self.round.dont_come_win:
-                player.update_balance(2 * self.bets[player]['dont_come_bet'])
+        Args:
+            point: The shooter's point before the roll, None on the come out roll.
+            die1: The first die rolled.
+            die2: The second die rolled.
+
+        Returns:
+            A dictionary of each player to the amount they were paid.
+        """
+        total, hard = die1 + die2, die1 == die2
+        payouts = dict()
+
+        for player, wagers in self.wagers.items():
+            paid = 0
+            for bet, wager in list(wagers.items()):
+                travels = BET_TYPES[bet].travels
+                multiplier, resolved = resolve(bet, wager.point if travels else point, total, hard)
+                paid += multiplier * wager.stake
+
+                if resolved:
+                    del wagers[bet]
+                elif travels and wager.point is None:
+                    wager.point = total
+
+            if self.round.round_over:
+                paid += sum(wager.stake for wager in wagers.values())
+                wagers.clear()
+
+            if paid:
+                player.update_balance(paid)
+            payouts[player] = paid
+
+        return payouts
 
     def dict_representation(self) -> dict:
         """
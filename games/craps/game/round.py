@@ -1,4 +1,5 @@
-import random
+from games.craps.game.bets import resolve
+from utils.rng import RNG_SERVICE, RandomStream
 
 
 class CrapsRound:
@@ -7,8 +8,9 @@ class CrapsRound:
     whether the game is over, the current stage, the point value, and which bet lines have won.
     """
 
-    def __init__(self, players: set, shooter) -> None:
+    def __init__(self, players: set, shooter, rng: RandomStream = None) -> None:
         self.players = players
+        self.rng = RNG_SERVICE.stream() if rng is None else rng
         self.round_over = False
         self.stage = 'come-out'
         self.point = None
@@ -40,8 +42,8 @@ class CrapsRound:
         Returns:
             The total number rolled.
         """
-        die1 = random.randint(1, 6)
-        die2 = random.randint(1, 6)
+        die1 = self.rng.die()
+        die2 = self.rng.die()
         total = die1 + die2
 
         if action == "come_out":
@@ -53,7 +55,7 @@ class CrapsRound:
 
     def come_out(self, roll: int) -> None:
         """
-        Function for the game logic of the come out roll.
+        Function for the game logic of the come out roll. The Pass and Don't Pass lines are looked up in the bet table.
 
         If the roll is a 2 or 3, the player has "crapped out", which means the Pass line loses and the Don't Pass line
         wins.
@@ -68,28 +70,17 @@ class CrapsRound:
         Args:
             roll:    The player's roll.
         """
-        if roll == 2 or roll == 3:
-            # Crap out, pass line loses, don't pass line wins
-            self.round_over = True
-            self.stage = 'game-over'
-            self.dont_pass_win = True
-        elif roll == 12:
-            # Crap out, but it's a tie
-            self.round_over = True
-            self.stage = 'game-over'
-        elif roll == 7 or roll == 11:
-            # Natural, pass line wins, don't pass line loses
-            self.round_over = True
-            self.stage = 'game-over'
-            self.pass_win = True
-        else:
+        self.resolve_lines(roll, ('pass', 'dont_pass'))
+
+        if not self.round_over:
             # The point is established, and we move on to the next betting phase
             self.point = roll
             self.stage = 'betting2'
 
     def point_roll(self, roll: int) -> None:
         """
-        Function for the game logic of the point roll.
+        Function for the game logic of the point roll. Come bets are made once the point is established, so like the
+        Pass and Don't Pass lines they are looked up in the bet table against the point.
 
         If the player rolls the same as the point value (as established during by come out roll), then the Pass and
         Come lines win. The Don't Pass and Don't Come lines lose.
@@ -101,22 +92,29 @@ class CrapsRound:
         Args:
             roll:    The player's roll.
         """
-        if roll == self.point:
-            # Roll the point, pass and come win
-            self.round_over = True
-            self.stage = 'game-over'
-            self.pass_win = True
-            self.come_win = True
-        elif roll == 7:
-            # Roll a seven, don't pass and don't come win
-            self.round_over = True
-            self.stage = 'game-over'
-            self.dont_pass_win = True
-            self.dont_come_win = True
-        else:
+        self.resolve_lines(roll, ('pass', 'dont_pass', 'come', 'dont_come'))
+
+        if not self.round_over:
             # Otherwise, just keep going. Make sure the stage stays the same
             self.stage = 'point'
 
+    def resolve_lines(self, roll: int, lines: tuple) -> None:
+        """
+        Looks up the line bets in the bet table, recording which lines won and ending the round once the Pass line is
+        resolved.
+
+        Args:
+            roll:    The player's roll.
+            lines:   The names of the line bets in play.
+        """
+        for line in lines:
+            paid, _ = resolve(line, self.point, roll)
+            setattr(self, line + '_win', paid > 1)
+
+        if resolve('pass', self.point, roll)[1]:
+            self.round_over = True
+            self.stage = 'game-over'
+
     def dict_representation(self) -> dict:
         """
         Function to create a dictionary representation of the state of the round. The stage, current point value, as
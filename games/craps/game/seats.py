@@ -0,0 +1,90 @@
+from typing import Hashable, Iterator, Optional
+
+
+class SeatRing:
+    """
+    The seats around a craps table, in the order players sat down. Seats are a ring of links to the next and previous
+    seat, so players can join, leave and be passed the dice without walking the table. The dice are passed to the left,
+    to the player who sat down after the shooter.
+    """
+
+    def __init__(self) -> None:
+        self.next = dict()
+        self.previous = dict()
+        self.shooter = None
+
+    def add(self, player: Hashable) -> None:
+        """
+        Seats a player on the shooter's right, so they are the last to get the dice. A player already at the table keeps
+        their seat.
+
+        Args:
+            player: the player to seat
+        """
+        if player in self.next:
+            return
+        if not self.next:
+            self.next[player] = self.previous[player] = player
+            return
+
+        # The seat on the shooter's right, or at the end of the table before the dice have been thrown
+        after = self.previous[self.shooter] if self.shooter is not None else self.previous[self.first()]
+        self.next[player], self.previous[player] = self.next[after], after
+        self.previous[self.next[after]] = player
+        self.next[after] = player
+
+    def remove(self, player: Hashable) -> None:
+        """
+        Removes a player from their seat. If they were the shooter, the dice go to the player on their left next.
+
+        Args:
+            player: the player to remove
+        """
+        if player not in self.next:
+            return
+
+        following, previous = self.next.pop(player), self.previous.pop(player)
+        if following == player:
+            self.shooter = None
+            return
+
+        self.next[previous] = following
+        self.previous[following] = previous
+        if self.shooter == player:
+            self.shooter = previous
+
+    def first(self) -> Optional[Hashable]:
+        """
+        Returns:
+            the player in the first seat, the one who has been at the table the longest
+        """
+        return next(iter(self.next), None)
+
+    def pass_dice(self) -> Optional[Hashable]:
+        """
+        Passes the dice to the left. Before the first throw they go to the player in the first seat.
+
+        Returns:
+            the new shooter, None if the table is empty
+        """
+        if not self.next:
+            return None
+        self.shooter = self.first() if self.shooter is None else self.next[self.shooter]
+        return self.shooter
+
+    def __contains__(self, player: Hashable) -> bool:
+        return player in self.next
+
+    def __len__(self) -> int:
+        return len(self.next)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """
+        Returns:
+            the players in seating order, starting from the shooter
+        """
+        start = self.shooter if self.shooter is not None else self.first()
+        player = start
+        for _ in range(len(self.next)):
+            yield player
+            player = self.next[player]
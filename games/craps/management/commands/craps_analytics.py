@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games.craps.game.analytics import bankroll_risk, bet_statistics, simulate_rounds
+
+
+class Command(BaseCommand):
+    """
+    Reports the exact odds of every craps bet and simulates the bankroll risk of a betting pattern
+    """
+    help = 'Prints the exact expected value and variance of every craps bet, then simulates rounds of a betting pattern'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--rounds', type=int, default=10000000, help='rounds simulated, 0 to skip the simulation')
+        parser.add_argument('--bet', nargs='+', default=['pass=10'],
+                            help='amounts bet every round, as bet=amount (e.g. pass=10 pass_odds=20)')
+        parser.add_argument('--bankroll', type=float, default=1000, help='amount a player sits down with')
+        parser.add_argument('--session-rounds', type=int, default=100, help='rounds played in a session')
+        parser.add_argument('--seed', type=int, default=None, help='seed of the simulation')
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write('{:>15} {:>6} {:>9} {:>10} {:>9}'.format('bet', 'point', 'per', 'ev', 'variance'))
+        for row in bet_statistics():
+            self.stdout.write('{:>15} {:>6} {:>9} {:>9.3%} {:>9.4f}'.format(
+                row['bet'], row['point'] or '-', row['per'], row['ev'], row['variance']))
+
+        if not options['rounds']:
+            return
+
+        try:
+            bets = {bet: float(amount) for bet, amount in (pattern.split('=') for pattern in options['bet'])}
+            start = time.monotonic()
+            net = simulate_rounds(options['rounds'], bets, options['seed'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        result = bankroll_risk(net, options['bankroll'], options['session_rounds'])
+        self.stdout.write('\n{} rounds of {} in {:.1f}s'.format(
+            len(net), ' '.join(options['bet']), time.monotonic() - start))
+        self.stdout.write('result per round {:.4f} +/- {:.4f}, standard deviation {:.4f}'.format(
+            result['ev'], result['ci'], result['std']))
+        self.stdout.write('{:.2%} of {} sessions of {} rounds lose a bankroll of {}'.format(
+            result['ruin'], result['sessions'], options['session_rounds'], options['bankroll']))
@@ -179,13 +179,32 @@ class CrapsUpdater(ConsumerUpdater):
                 'data': game_instance.dict_representation() | {'to_update': 'ready_up'}
                 }
 
+    @staticmethod
+    def place_bet(request_data: dict) -> dict:
+        """
+        place_bet() processes bets other than the line bets, like odds, place, field and hardway bets. The values are
+        passed into and processed by the game instance.
+
+        Args:
+            request_data: A dictionary containing request data. In this case, it must contain 'bet' and 'amount'
+                                values.
+
+        Returns:
+            A message to be passed to craps.js which will update the bet values on the player board.
+        """
+        game_instance = CRAPS_MANAGER.get(UUID(request_data['session_id']))
+        game_instance.place_bet(request_data['user'], request_data['data']['bet'], float(request_data['data']['amount']))
+
+        return {'type': 'update',
+                'data': game_instance.dict_representation() | {'to_update': 'ready_up'}
+                }
+
     @staticmethod
     def come_out_roll(request_data: dict) -> dict:
         """
         Function for processing the requests made during the come out phase, the first phase of rolling dice. The game
         instance's CrapsRound object will handle the actual game logic. This function will check if the game has ended,
-        in which case the payments are distributed and the game over screen is loaded. Otherwise, the next phase of
-        betting will be entered.
+        in which case the game over screen is loaded. Otherwise, the next phase of betting will be entered.
 
         Args:
             request_data: A dictionary containing request data like session id's and usernames.
@@ -195,10 +214,9 @@ class CrapsUpdater(ConsumerUpdater):
             send players to the game over screen. Otherwise, the message will send players to the next phase of betting.
         """
         game_instance = CRAPS_MANAGER.get(UUID(request_data['session_id']))
-        roll1, roll2 = game_instance.round.roll_dice("come_out")
+        roll1, roll2 = game_instance.roll("come_out")
 
         if game_instance.round.round_over:
-            game_instance.calculate_payouts()
             return {'type': 'update',
                     'data': game_instance.dict_representation() | {'to_update': 'game_over',
                                                                    'value1': str(roll1),
@@ -218,8 +236,8 @@ class CrapsUpdater(ConsumerUpdater):
         """
         Function for processing the requests made during the point phase, the second phase of rolling dice. The game
         instance's CrapsRound object will handle the actual game logic. This function will check if the game has ended,
-        in which case all players are made unready (since they need to ready up again to restart), payments are
-        distributed, and the game over screen is loaded. Otherwise, the point phase will continue until it is over.
+        in which case all players are made unready (since they need to ready up again to restart) and the game over
+        screen is loaded. Otherwise, the point phase will continue until it is over.
 
         Args:
             request_data: A dictionary containing request data like session id's and usernames.
@@ -230,11 +248,10 @@ class CrapsUpdater(ConsumerUpdater):
             allow rolling to continue until the game is over.
         """
         game_instance = CRAPS_MANAGER.get(UUID(request_data['session_id']))
-        roll1, roll2 = game_instance.round.roll_dice("point")
+        roll1, roll2 = game_instance.roll("point")
 
         if game_instance.round.round_over:
             game_instance.unready_all()
-            game_instance.calculate_payouts()
             return {'type': 'update',
                     'data': game_instance.dict_representation() | {'to_update': 'game_over',
                                                                    'value1': str(roll1),
@@ -269,8 +286,8 @@ class CrapsUpdater(ConsumerUpdater):
 
     FUNCTION_MAP = {'load_game': load_game.__func__, 'place_bet1': place_bet1.__func__,
                     'ready_up': ready_restart.__func__, 'come_out_roll': come_out_roll.__func__,
-                    'place_bet2': place_bet2.__func__, 'ready2': ready2.__func__, 'point_roll': point_roll.__func__,
-                    'ready1': ready1.__func__, 'request_user_balance': user_balance.__func__}
+                    'place_bet2': place_bet2.__func__, 'place_bet': place_bet.__func__, 'ready2': ready2.__func__,
+                    'point_roll': point_roll.__func__, 'ready1': ready1.__func__, 'request_user_balance': user_balance.__func__}
     """
     The function map maps message types (as defined in listeners.js) to the actual function that needs to be called
     in order to process the input given from listeners.js
@@ -4,8 +4,13 @@ from django.contrib import auth
 from django.test import TestCase
 
 from accounts.models import CustomUser
+from games.craps.game.analytics import (bankroll_risk, bet_statistics, decision_distribution, moments,
+                                         roll_distribution, simulate_rounds)
+from games.craps.game.bets import BET_TYPES, OUTCOMES, POINTS, resolve
 from games.craps.game.craps import CrapsRound
+from games.craps.game.seats import SeatRing
 from games.craps.web.views import CRAPS_MANAGER
+from utils.rng import RNGService
 
 
 class TestCrapsManager(TestCase):
@@ -129,19 +134,17 @@ class TestCrapsGame(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.current_balance, 1800)
 
-    def test_calculate_payouts_changes_db(self):
+    def test_settle_roll_changes_db(self):
         self.game.round = CrapsRound(self.game.players, self.game.shooter)
-        self.game.round.pass_win = True
-        self.game.round.dont_pass_win = True
-        self.game.round.come_win = True
-        self.game.round.dont_come_win = True
-
         self.game.update_pass_bets(self.user, 100, 100)
+        self.game.round.come_out(6)
+        self.game.settle_roll(None, 2, 4)
         self.game.update_come_bets(self.user, 100, 100)
-        self.game.calculate_payouts()
+        self.game.round.point_roll(6)
+        self.game.settle_roll(6, 3, 3)
         self.user.refresh_from_db()
 
-        self.assertEqual(self.user.current_balance, 2400)
+        self.assertEqual(self.user.current_balance, 2000)
 
     def test_get_stage_betting1_when_round_not_started(self):
         self.game.round = None
@@ -613,3 +616,237 @@ class TestCrapsRound(TestCase):
 #         self.assertFalse(response['data']['players'][1]['ready'])
 #         await communicator_1.disconnect()
 #         await communicator_2.disconnect()
+
+
+class TestCrapsRandomStream(TestCase):
+    """
+    Test cases for the dice drawn from the RNG service
+    """
+
+    def test_dice_stay_on_the_die(self):
+        stream = RNGService().stream(buffer_size=16)
+        rolls = [stream.die() for _ in range(600)]
+        self.assertEqual(set(range(1, 7)), set(rolls))
+
+    def test_seeded_service_replays_rounds(self):
+        rolls = []
+        for _ in range(2):
+            service = RNGService(435)
+            craps_round = CrapsRound(set(), None, service.stream())
+            rolls.append([craps_round.roll_dice('point') for _ in range(50)])
+        self.assertEqual(rolls[0], rolls[1])
+
+    def test_sessions_get_independent_streams(self):
+        service = RNGService(435)
+        first, second = service.stream(), service.stream()
+        self.assertNotEqual([first.die() for _ in range(50)], [second.die() for _ in range(50)])
+
+
+class TestCrapsBetTable(TestCase):
+    """
+    Test cases for resolving bets through the craps bet table
+    """
+
+    def setUp(self) -> None:
+        CustomUser.objects.create_user(username='user', password='pass', current_balance=2000)
+        self.client.login(username='user', password='pass')
+        self.user = auth.get_user(self.client)
+        self.session_id = CRAPS_MANAGER.create()
+        CRAPS_MANAGER.register_user(self.session_id, self.user)
+        self.game = CRAPS_MANAGER.get(self.session_id)
+
+    def tearDown(self) -> None:
+        CRAPS_MANAGER.sessions = {}
+
+    def balance(self) -> float:
+        self.user.refresh_from_db()
+        return self.user.current_balance
+
+    def test_table_covers_every_bet_type(self):
+        self.assertEqual(set(BET_TYPES), {key[0] for key in OUTCOMES})
+
+    def test_line_bets(self):
+        self.assertEqual((2, True), resolve('pass', None, 11))
+        self.assertEqual((0, True), resolve('pass', None, 3))
+        self.assertEqual((1, True), resolve('dont_pass', None, 12))
+        self.assertEqual((0, False), resolve('pass', None, 8))
+        self.assertEqual((2, True), resolve('dont_come', 8, 7))
+
+    def test_odds_pay_true_odds(self):
+        self.assertEqual((3, True), resolve('pass_odds', 4, 4))
+        self.assertEqual((1.5, True), resolve('dont_pass_odds', 4, 7))
+        self.assertEqual((0, False), resolve('pass_odds', None, 7))
+
+    def test_place_bets_stay_up_when_they_win(self):
+        self.assertEqual((7 / 6, False), resolve('place_6', 4, 6))
+        self.assertEqual((0, True), resolve('place_6', 4, 7))
+
+    def test_field_is_a_one_roll_bet(self):
+        self.assertEqual((4, True), resolve('field', None, 12))
+        self.assertEqual((0, True), resolve('field', 5, 8))
+
+    def test_hardways_need_doubles(self):
+        self.assertEqual((10, True), resolve('hard_8', 6, 8, True))
+        self.assertEqual((0, True), resolve('hard_8', 6, 8, False))
+        self.assertEqual((0, False), resolve('hard_8', 6, 9, False))
+
+    def test_every_bet_loses_on_seven_out(self):
+        for bet in BET_TYPES:
+            if bet not in ('dont_pass', 'dont_come', 'dont_pass_odds', 'field'):
+                for point in POINTS:
+                    self.assertEqual((0, True), resolve(bet, point, 7), bet)
+
+    def test_come_bets_travel_to_their_own_point(self):
+        self.game.round = CrapsRound(self.game.players, self.game.shooter)
+        self.game.round.come_out(4)
+        self.game.book_wager(self.user, 'come', 100)
+        self.game.settle_roll(4, 4, 5)
+        self.assertEqual(9, self.game.wagers[self.user]['come'].point)
+        self.game.settle_roll(4, 4, 5)
+        self.assertNotIn('come', self.game.wagers[self.user])
+
+    def test_place_bet_rejects_line_bets_and_early_odds(self):
+        self.assertFalse(self.game.place_bet(self.user, 'pass', 100))
+        self.assertFalse(self.game.place_bet(self.user, 'pass_odds', 100))
+        self.assertFalse(self.game.place_bet(self.user, 'lucky_7', 100))
+        self.assertEqual(2000, self.balance())
+
+    def test_place_bet_rejects_bets_the_player_cannot_cover(self):
+        self.assertFalse(self.game.place_bet(self.user, 'field', 2500))
+        self.assertEqual(2000, self.balance())
+        self.assertNotIn('field', self.game.bets[self.user])
+        self.assertNotIn('field', self.game.wagers[self.user])
+
+    def test_settlement_pays_every_bet_on_the_roll(self):
+        self.game.update_pass_bets(self.user, 100, 0)
+        self.game.round = CrapsRound(self.game.players, self.game.shooter)
+        self.game.round.come_out(4)
+        self.game.settle_roll(None, 1, 3)
+        self.game.place_bet(self.user, 'pass_odds', 100)
+        self.game.place_bet(self.user, 'place_6', 60)
+        self.game.place_bet(self.user, 'hard_4', 10)
+        self.game.place_bet(self.user, 'field', 10)
+        self.assertEqual(1720, self.balance())
+
+        self.game.round.point_roll(6)
+        self.assertEqual({self.user: 70}, self.game.settle_roll(4, 2, 4))
+        self.assertEqual(1790, self.balance())
+
+        self.game.round.point_roll(4)
+        self.assertEqual({self.user: 200 + 300 + 80 + 60}, self.game.settle_roll(4, 2, 2))
+        self.assertEqual(2430, self.balance())
+        self.assertEqual(dict(), self.game.wagers[self.user])
+
+
+class TestCrapsAnalytics(TestCase):
+    """
+    Test cases for the exact craps bet odds and the vectorized round simulation
+    """
+
+    def test_pass_line_house_edge(self):
+        ev, variance = moments(decision_distribution('pass'))
+        self.assertAlmostEqual(-7 / 495, ev)
+        self.assertAlmostEqual(1 - ev * ev, variance)
+
+    def test_distributions_sum_to_one(self):
+        for bet in BET_TYPES:
+            distribution = roll_distribution(bet, 6) if bet.startswith('place') else decision_distribution(bet, 6)
+            self.assertAlmostEqual(1, sum(distribution.values()), msg=bet)
+
+    def test_odds_are_free(self):
+        for row in bet_statistics():
+            if row['bet'].endswith('odds'):
+                self.assertAlmostEqual(0, row['ev'])
+
+    def test_place_bets_cannot_be_decided(self):
+        with self.assertRaises(ValueError):
+            decision_distribution('place_6', 4)
+
+    def test_simulation_matches_exact_odds(self):
+        net = simulate_rounds(200000, {'pass': 1, 'dont_pass': 1}, seed=435, chunk_size=50000)
+        self.assertEqual(200000, len(net))
+        expected = moments(decision_distribution('pass'))[0] + moments(decision_distribution('dont_pass'))[0]
+        self.assertAlmostEqual(expected, net.mean(), delta=.005)
+
+    def test_simulation_returns_working_bets(self):
+        net = simulate_rounds(10000, {'place_6': 6}, seed=435)
+        # Each hit of the 6 pays 7, and the stake is only lost on a seven out
+        self.assertTrue(all(value % 7 in (0, 1) for value in net.tolist()))
+        self.assertIn(-6, net)
+        self.assertIn(7, net)
+
+    def test_simulation_rejects_unknown_bets(self):
+        with self.assertRaises(ValueError):
+            simulate_rounds(10, {'lucky_7': 1})
+
+    def test_bankroll_risk(self):
+        result = bankroll_risk(simulate_rounds(10000, {'pass': 10}, seed=435), 10, 100)
+        self.assertEqual(100, result['sessions'])
+        self.assertGreater(result['ruin'], .5)
+
+
+class TestCrapsSeatRing(TestCase):
+    """
+    Test cases for passing the dice around the seats of the table
+    """
+
+    def test_dice_pass_to_the_left(self):
+        seats = SeatRing()
+        for player in 'abc':
+            seats.add(player)
+        self.assertEqual(list('abcab'), [seats.pass_dice() for _ in range(5)])
+
+    def test_lone_player_keeps_the_dice(self):
+        seats = SeatRing()
+        seats.add('a')
+        self.assertEqual(['a', 'a'], [seats.pass_dice() for _ in range(2)])
+
+    def test_empty_table_has_no_shooter(self):
+        seats = SeatRing()
+        self.assertIsNone(seats.pass_dice())
+        seats.add('a')
+        seats.pass_dice()
+        seats.remove('a')
+        self.assertIsNone(seats.pass_dice())
+        self.assertEqual(0, len(seats))
+
+    def test_new_players_shoot_last(self):
+        seats = SeatRing()
+        for player in 'abc':
+            seats.add(player)
+        seats.pass_dice()
+        seats.pass_dice()
+        seats.add('d')
+        self.assertEqual(list('bcad'), list(seats))
+        self.assertEqual(list('cad'), [seats.pass_dice() for _ in range(3)])
+
+    def test_shooter_leaving_passes_the_dice_on(self):
+        seats = SeatRing()
+        for player in 'abcd':
+            seats.add(player)
+        seats.pass_dice()
+        seats.pass_dice()
+        seats.remove('b')
+        seats.remove('d')
+        self.assertNotIn('b', seats)
+        self.assertEqual(list('cac'), [seats.pass_dice() for _ in range(3)])
+
+    def test_game_passes_dice_in_join_order(self):
+        session_id = CRAPS_MANAGER.create()
+        users = [CustomUser.objects.create_user(username='user{}'.format(index), password='pass')
+                 for index in range(3)]
+        for user in users:
+            CRAPS_MANAGER.register_user(session_id, user)
+        game = CRAPS_MANAGER.get(session_id)
+
+        shooters = []
+        for _ in range(4):
+            game.start_round()
+            shooters.append(game.shooter)
+            game.reset()
+        self.assertEqual(users + users[:1], shooters)
+
+        game.remove_player(users[1])
+        game.start_round()
+        self.assertEqual(users[2], game.shooter)
+        CRAPS_MANAGER.sessions = {}
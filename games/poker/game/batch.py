@@ -0,0 +1,95 @@
+import numpy as np
+
+from games.poker.game.evaluator import CARD_KEY, CARD_RANK, CARD_SUIT, FLUSH_SUIT_TABLE, FLUSH_TABLE, RANK_KEY, \
+    RANK_TABLE, SUIT_BITS, SUIT_MASK, card_to_int
+
+RANK_OF = np.array(CARD_RANK, dtype=np.int64)
+SUIT_OF = np.array(CARD_SUIT, dtype=np.int64)
+RANK_KEYS = np.array(RANK_KEY, dtype=np.int64)
+CARD_KEYS = np.array(CARD_KEY, dtype=np.int64)
+FLUSH_SUITS = np.array(FLUSH_SUIT_TABLE, dtype=np.int64)
+
+# The rank table as parallel sorted arrays so a whole batch of rank keys can be looked up with one searchsorted
+RANK_TABLE_KEYS = np.array(sorted(RANK_TABLE), dtype=np.int64)
+RANK_TABLE_SCORES = np.array([RANK_TABLE[key][1] for key in sorted(RANK_TABLE)], dtype=np.int64)
+FLUSH_SCORES = np.array([0 if hand is None else hand[1] for hand in FLUSH_TABLE], dtype=np.int64)
+
+
+def encode_hands(hands: list) -> np.ndarray:
+    """
+    Encodes lists of PokerCards into an integer card array for evaluate_batch
+
+    Args:
+        hands: list of N lists of PokerCards, each the same length
+
+    Returns:
+        (N, number of cards) integer array of encoded cards
+    """
+    return np.array([[card_to_int(card) for card in cards] for cards in hands], dtype=np.int64)
+
+
+def evaluate_batch(cards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates many poker hands at once. Rank and suit histograms are built for every row, the rank histogram is
+    folded into the evaluator's rank key, and rows holding five or more cards of one suit are scored from the flush
+    table instead.
+
+    Args:
+        cards: (N, 5-7) integer array of cards encoded as in games.poker.game.evaluator
+
+    Returns:
+        A tuple of the N hand type keys of HAND_TYPE_MAPPER and the N comparable integer hand values
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    num_hands = cards.shape[0]
+    row_offsets = np.arange(num_hands, dtype=np.int64)[:, None]
+
+    ranks = RANK_OF[cards]
+    suits = SUIT_OF[cards]
+    rank_hist = np.bincount((row_offsets * 13 + ranks).ravel(), minlength=num_hands * 13).reshape(num_hands, 13)
+    suit_hist = np.bincount((row_offsets * 4 + suits).ravel(), minlength=num_hands * 4).reshape(num_hands, 4)
+
+    scores = RANK_TABLE_SCORES[np.searchsorted(RANK_TABLE_KEYS, rank_hist @ RANK_KEYS)]
+
+    flush_rows = np.flatnonzero(suit_hist.max(axis=1) >= 5)
+    if len(flush_rows):
+        flush_suit = suit_hist[flush_rows].argmax(axis=1)
+        in_suit = suits[flush_rows] == flush_suit[:, None]
+        rank_masks = np.where(in_suit, 1 << ranks[flush_rows], 0).sum(axis=1)
+        scores[flush_rows] = FLUSH_SCORES[rank_masks]
+
+    return scores // 10 ** 10, scores
+
+
+def evaluate_run_outs(fixed_cards: list, run_outs: np.ndarray) -> np.ndarray:
+    """
+    Evaluates several hands against many run outs of the same unknown cards. The evaluator keys and suited rank masks of
+    each hand's fixed cards are computed once, and only the keys and masks of the run out cards are added per row.
+
+    Args:
+        fixed_cards: list of the integer encoded known cards of each hand, e.g. hole cards plus the current board
+        run_outs: (M, number of unknown cards) integer array of the unknown cards in each run out
+
+    Returns:
+        (number of hands, M) array of comparable integer hand values
+    """
+    run_outs = np.asarray(run_outs, dtype=np.int64)
+    run_out_keys = CARD_KEYS[run_outs].sum(axis=1)
+    run_out_masks = np.stack([np.where(SUIT_OF[run_outs] == suit, 1 << RANK_OF[run_outs], 0).sum(axis=1)
+                              for suit in range(4)], axis=1)
+
+    scores = np.empty((len(fixed_cards), len(run_outs)), dtype=np.int64)
+    for index, cards in enumerate(fixed_cards):
+        keys = sum(CARD_KEY[card] for card in cards) + run_out_keys
+        fixed_masks = np.array([sum(1 << CARD_RANK[card] for card in cards if CARD_SUIT[card] == suit)
+                                for suit in range(4)], dtype=np.int64)
+
+        scores[index] = RANK_TABLE_SCORES[np.searchsorted(RANK_TABLE_KEYS, keys >> SUIT_BITS)]
+
+        flush_suit = FLUSH_SUITS[keys & SUIT_MASK]
+        flush_rows = np.flatnonzero(flush_suit >= 0)
+        if len(flush_rows):
+            suits = flush_suit[flush_rows]
+            scores[index, flush_rows] = FLUSH_SCORES[fixed_masks[suits] | run_out_masks[flush_rows, suits]]
+
+    return scores
@@ -0,0 +1,242 @@
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import combinations
+from math import comb, isfinite
+from typing import Callable, Optional
+
+import numpy as np
+
+from games.poker.game.batch import evaluate_run_outs
+from games.poker.game.evaluator import card_to_int
+from games.poker.game.variants import HOLDEM
+
+EQUITY_SAMPLES = 10000
+EQUITY_TIME_LIMIT = 2.0
+MAX_EQUITY_SAMPLES = 100000
+MAX_EQUITY_TIME_LIMIT = 10.0
+SAMPLE_CHUNK = 2000
+
+
+def equity_budget(samples=EQUITY_SAMPLES, time_limit=EQUITY_TIME_LIMIT) -> tuple[int, float]:
+    """
+    Reads a client supplied simulation budget. A value that is not a positive finite number is ignored in favour of the
+    default, and anything over the server maximum is capped.
+
+    Args:
+        samples: the requested maximum number of run outs to simulate
+        time_limit: the requested maximum number of seconds to spend simulating
+
+    Returns:
+        A tuple of the number of samples and the time limit to simulate with
+    """
+    budget = []
+    for value, parse, default, maximum in ((samples, int, EQUITY_SAMPLES, MAX_EQUITY_SAMPLES),
+                                           (time_limit, float, EQUITY_TIME_LIMIT, MAX_EQUITY_TIME_LIMIT)):
+        try:
+            value = parse(float(value))
+        except (TypeError, ValueError, OverflowError):
+            value = default
+        budget.append(min(value, maximum) if isfinite(value) and value > 0 else default)
+    return budget[0], budget[1]
+
+
+def tally_showdowns(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Counts how often each player wins outright and ties for the best hand
+
+    Args:
+        scores: (number of players, number of run outs) array of hand values
+
+    Returns:
+        A tuple of the win counts and tie counts of each player
+    """
+    winners = scores == scores.max(axis=0)
+    num_winners = winners.sum(axis=0)
+    return (winners & (num_winners == 1)).sum(axis=1), (winners & (num_winners > 1)).sum(axis=1)
+
+
+def simulate_equity(hole_cards: list, board: list, deck: list, samples: int = EQUITY_SAMPLES,
+                    time_limit: float = EQUITY_TIME_LIMIT, seed: int = None) -> tuple[list, list, int]:
+    """
+    Estimates each player's chance of winning or tying by dealing random run outs of the board from the remaining deck.
+    Samples are drawn in chunks until either the sample or time budget is used up.
+
+    Args:
+        hole_cards: the integer encoded hole cards of each live player
+        board: the integer encoded cards already on the board
+        deck: the integer encoded cards left in the deck
+        samples: the maximum number of run outs to simulate
+        time_limit: the maximum number of seconds to spend simulating
+        seed: seed for the random number generator
+
+    Returns:
+        A tuple of each player's win probability, each player's tie probability and the number of samples simulated
+    """
+    rng = np.random.default_rng(seed)
+    deck = np.array(deck, dtype=np.int64)
+    to_deal = 5 - len(board)
+    if to_deal == 0:
+        samples = 1
+
+    fixed_cards = [hole + board for hole in hole_cards]
+    wins = np.zeros(len(hole_cards), dtype=np.int64)
+    ties = np.zeros(len(hole_cards), dtype=np.int64)
+    simulated = 0
+    deadline = time.monotonic() + time_limit
+
+    while simulated < samples and (simulated == 0 or time.monotonic() < deadline):
+        chunk = min(SAMPLE_CHUNK, samples - simulated)
+        run_outs = rng.permuted(np.tile(deck, (chunk, 1)), axis=1)[:, :to_deal]
+
+        chunk_wins, chunk_ties = tally_showdowns(evaluate_run_outs(fixed_cards, run_outs))
+        wins += chunk_wins
+        ties += chunk_ties
+        simulated += chunk
+
+    return (wins / simulated).tolist(), (ties / simulated).tolist(), simulated
+
+
+def enumerate_equity(hole_cards: list, board: list, deck: list, samples: int = EQUITY_SAMPLES,
+                     time_limit: float = EQUITY_TIME_LIMIT, seed: int = None) -> tuple[list, list, int]:
+    """
+    Computes each player's exact chance of winning or tying by evaluating every possible run out of the board from the
+    remaining deck. Takes the same arguments as simulate_equity; the budgets and seed are not needed.
+
+    Args:
+        hole_cards: the integer encoded hole cards of each live player
+        board: the integer encoded cards already on the board
+        deck: the integer encoded cards left in the deck
+        samples: unused
+        time_limit: unused
+        seed: unused
+
+    Returns:
+        A tuple of each player's win probability, each player's tie probability and the number of run outs evaluated
+    """
+    to_deal = 5 - len(board)
+    if to_deal:
+        run_outs = np.array(list(combinations(deck, to_deal)), dtype=np.int64)
+    else:
+        # On the river the board is complete, so the only run out is dealing nothing
+        run_outs = np.empty((1, 0), dtype=np.int64)
+    wins, ties = tally_showdowns(evaluate_run_outs([hole + board for hole in hole_cards], run_outs))
+    return (wins / len(run_outs)).tolist(), (ties / len(run_outs)).tolist(), len(run_outs)
+
+
+def should_enumerate(board: list, deck: list, samples: int) -> bool:
+    """
+    Enumeration is exact and evaluates every run out once, so it is preferred whenever there are no more run outs
+    than samples in the budget. This covers every turn and river spot, and the flop whenever the budget allows it.
+
+    Args:
+        board: the cards already on the board
+        deck: the cards left in the deck
+        samples: the sample budget
+
+    Returns:
+        True if the run outs should be enumerated rather than sampled
+    """
+    return comb(len(deck), 5 - len(board)) <= samples
+
+
+def compute_equity(hole_cards: list, board: list, deck: list, samples: int = EQUITY_SAMPLES,
+                   time_limit: float = EQUITY_TIME_LIMIT, seed: int = None) -> tuple[list, list, int]:
+    """
+    Computes equity with enumerate_equity when that is cheaper than sampling, and with simulate_equity otherwise
+
+    Args:
+        hole_cards: the integer encoded hole cards of each live player
+        board: the integer encoded cards already on the board
+        deck: the integer encoded cards left in the deck
+        samples: the maximum number of run outs to simulate
+        time_limit: the maximum number of seconds to spend simulating
+        seed: seed for the random number generator
+
+    Returns:
+        A tuple of each player's win probability, each player's tie probability and the number of run outs evaluated
+    """
+    equity_function = enumerate_equity if should_enumerate(board, deck, samples) else simulate_equity
+    return equity_function(hole_cards, board, deck, samples, time_limit, seed)
+
+
+class EquityService:
+    """
+    Runs equity simulations for poker rounds in a pool of worker processes so that they never block the web socket
+    consumer thread
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        self.executor = None
+        self.pending = dict()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """
+        Returns:
+            the worker process pool, created the first time it is needed
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def submit(self, poker_round, samples: int = EQUITY_SAMPLES, time_limit: float = EQUITY_TIME_LIMIT,
+               callback: Callable = None) -> Optional[Future]:
+        """
+        Starts an equity calculation for the live players of a hold'em poker round. When it finishes, the results are
+        recorded on the round for the street they were computed for and the callback is called with the round.
+
+        Args:
+            poker_round: the PokerRound to simulate
+            samples: the maximum number of run outs to simulate
+            time_limit: the maximum number of seconds to spend simulating
+            callback: optional function to call with the round once the results are recorded
+
+        Returns:
+            a future resolving to the recorded equity once the round has been updated, shared with any simulation of the
+            same street still running, or None if there is nothing to simulate
+        """
+        players = [player for player in poker_round.players_in_hand if not poker_round.hands[player].folded]
+        if poker_round.round_over or poker_round.variant is not HOLDEM or len(players) < 2:
+            return None
+
+        street = len(poker_round.board)
+        pending_key = (id(poker_round), street)
+        if pending_key in self.pending:
+            return self.pending[pending_key]
+
+        simulation = self.get_executor().submit(compute_equity,
+                                                [[card_to_int(card) for card in poker_round.hands[player].hand]
+                                                 for player in players],
+                                                [card_to_int(card) for card in poker_round.board],
+                                                [card_to_int(card) for card in poker_round.deck.deck],
+                                                min(samples, MAX_EQUITY_SAMPLES), time_limit)
+        recorded = Future()
+
+        def record(done: Future) -> None:
+            self.pending.pop(pending_key, None)
+            if done.cancelled():
+                recorded.cancel()
+            elif done.exception() is not None:
+                recorded.set_exception(done.exception())
+            else:
+                wins, ties, simulated = done.result()
+                equity = {player.username: {'win': win, 'tie': tie} for player, win, tie in zip(players, wins, ties)}
+                poker_round.record_equity(street, equity, simulated)
+                if callback is not None:
+                    callback(poker_round)
+                recorded.set_result(equity)
+
+        self.pending[pending_key] = recorded
+        simulation.add_done_callback(record)
+        return recorded
+
+    def shutdown(self) -> None:
+        """
+        Shuts down the worker process pool
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+EQUITY_SERVICE = EquityService()
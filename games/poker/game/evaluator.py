@@ -0,0 +1,273 @@
+from typing import Optional
+
+from utils.PlayingCards.bitmask import RANK_BITS, flush_suit, mask_indexes, suit_ranks
+
+HAND_TYPE_MAPPER = {1: "High Card", 2: 'One Pair', 3: 'Two Pair', 4: 'Three of a Kind', 5: 'Straight', 6: 'Flush',
+                    7: 'Full House', 8: 'Four of a Kind', 9: 'Straight Flush'}
+
+SUITS = ('S', 'H', 'D', 'C')
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+
+# Cards are encoded as integers 0-51: rank index (0 = 2, ..., 12 = Ace) * 4 + suit index
+CARD_RANK = [card >> 2 for card in range(52)]
+CARD_SUIT = [card & 3 for card in range(52)]
+
+# Every card contributes a base 5 digit for its rank (at most 4 of a rank) above bit 12, and a 3 bit counter for its
+# suit (at most 7 cards) in the lowest 12 bits. Summing the keys of a hand gives its rank multiset and suit counts.
+SUIT_BITS = 12
+SUIT_MASK = (1 << SUIT_BITS) - 1
+RANK_KEY = [5 ** rank for rank in range(13)]
+CARD_KEY = [(RANK_KEY[CARD_RANK[card]] << SUIT_BITS) | (1 << (3 * CARD_SUIT[card])) for card in range(52)]
+
+# Each straight as the mask of its rank indexes and the poker values of its cards, best first. The wheel plays the Ace
+# low as a 1.
+STRAIGHTS = [(0b11111 << low, [low + 6 - i for i in range(5)]) for low in range(8, -1, -1)] + \
+            [(0b1000000001111, [5, 4, 3, 2, 1])]
+
+# Leading digit of the integer value of each hand type, i.e. the order hand types beat each other in
+HAND_ORDER = {hand_type: hand_type for hand_type in HAND_TYPE_MAPPER}
+
+
+def card_to_int(card) -> int:
+    """
+    Encodes a poker card as an integer
+
+    Args:
+        card: a PokerCard
+
+    Returns:
+        the integer encoding of the card
+    """
+    return (card.val - 2) * 4 + SUIT_INDEX[card.suit.suit]
+
+
+def int_to_str(card: int) -> str:
+    """
+    Decodes an integer card back to its string form, e.g. 34 -> "10D"
+
+    Args:
+        card: the integer encoding of the card
+
+    Returns:
+        the string representation of the card
+    """
+    rank = CARD_RANK[card] + 2
+    rank_str = {11: 'J', 12: 'Q', 13: 'K', 14: 'A'}.get(rank, str(rank))
+    return rank_str + SUITS[CARD_SUIT[card]]
+
+
+def encode_value(hand_type: int, ranks: list, hand_order: dict = HAND_ORDER) -> tuple[str, int]:
+    """
+    Computes the comparable integer value of a hand, the hand type's order followed by two digits for each of the five
+    playable card ranks. Hands with fewer than five cards are padded with zeros.
+
+    Args:
+        hand_type: the key of the hand type in HAND_TYPE_MAPPER
+        ranks: the poker values (2-14) of the playable cards in the order they are compared
+        hand_order: the order of each hand type
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    value = hand_order[hand_type]
+    for rank in ranks[:5]:
+        value = value * 100 + rank
+    for _ in range(5 - len(ranks)):
+        value *= 100
+    return HAND_TYPE_MAPPER[hand_type], value
+
+
+def find_straight(rank_mask: int, straights: list = STRAIGHTS) -> Optional[list]:
+    """
+    Args:
+        rank_mask: 13 bit mask of the rank indexes in a hand
+        straights: the straights that can be made
+
+    Returns:
+        the poker values of the cards in the best straight, or None if there is no straight
+    """
+    for straight_mask, straight_ranks in straights:
+        if rank_mask & straight_mask == straight_mask:
+            return straight_ranks
+    return None
+
+
+def _rank_multiset_value(counts: tuple, straights: list, hand_order: dict) -> tuple[str, int]:
+    """
+    Evaluates a hand of at most five cards that does not contain a flush
+
+    Args:
+        counts: number of cards of each rank index
+        straights: the straights that can be made
+        hand_order: the order of each hand type
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    groups = sorted(((count, rank) for rank, count in enumerate(counts) if count), reverse=True)
+    straight = find_straight(sum(1 << rank for _, rank in groups), straights) if len(groups) == 5 else None
+    if straight is not None:
+        return encode_value(5, straight, hand_order)
+
+    top = groups[0][0] if groups else 0
+    second = groups[1][0] if len(groups) > 1 else 0
+    if top == 4:
+        hand_type = 8
+    elif top == 3:
+        hand_type = 7 if second >= 2 else 4
+    elif top == 2:
+        hand_type = 3 if second == 2 else 2
+    else:
+        hand_type = 1
+
+    return encode_value(hand_type, [rank + 2 for count, rank in groups for _ in range(count)], hand_order)
+
+
+def _flush_value(rank_mask: int, straights: list, hand_order: dict) -> tuple[str, int]:
+    """
+    Evaluates the cards of a single suit that make up a flush
+
+    Args:
+        rank_mask: 13 bit mask of the rank indexes of the suited cards
+        straights: the straights that can be made
+        hand_order: the order of each hand type
+
+    Returns:
+        A tuple of the hand class and the integer value of the best straight flush or flush
+    """
+    straight = find_straight(rank_mask, straights)
+    if straight is not None:
+        return encode_value(9, straight, hand_order)
+    return encode_value(6, [rank + 2 for rank in range(12, -1, -1) if rank_mask & (1 << rank)], hand_order)
+
+
+def build_rank_table(straights: list = STRAIGHTS, hand_order: dict = HAND_ORDER, ranks: range = range(13)) -> dict:
+    """
+    Builds the lookup table of every rank multiset of up to seven cards, keyed by the sum of its RANK_KEY values.
+    Multisets are grown one card at a time; those of more than five cards take the best value of the multisets they
+    were grown from.
+
+    Args:
+        straights: the straights that can be made
+        hand_order: the order of each hand type
+        ranks: the rank indexes in the deck
+
+    Returns:
+        dict of rank key to the hand class and integer value of the hand
+    """
+    values = {0: encode_value(1, [], hand_order)}
+    level = [0]
+    for num_cards in range(1, 8):
+        next_level = {}
+        for key in level:
+            for rank in ranks:
+                if key // RANK_KEY[rank] % 5 < 4:
+                    new_key = key + RANK_KEY[rank]
+                    best = next_level.get(new_key)
+                    if best is None or values[key][1] > best[1]:
+                        next_level[new_key] = values[key]
+
+        if num_cards <= 5:
+            for key in next_level:
+                next_level[key] = _rank_multiset_value(tuple(key // RANK_KEY[rank] % 5 for rank in range(13)),
+                                                       straights, hand_order)
+
+        values.update(next_level)
+        level = next_level
+
+    return values
+
+
+def build_flush_table(straights: list = STRAIGHTS, hand_order: dict = HAND_ORDER) -> list:
+    """
+    Builds the lookup table of every 13 bit rank mask of five or more suited cards
+
+    Args:
+        straights: the straights that can be made
+        hand_order: the order of each hand type
+
+    Returns:
+        list indexed by rank mask of the hand class and integer value of the flush, None for fewer than five cards
+    """
+    return [_flush_value(mask, straights, hand_order) if bin(mask).count('1') >= 5 else None for mask in range(1 << 13)]
+
+
+def _build_flush_suit_table() -> list:
+    """
+    Returns:
+        list mapping the packed suit counters of a hand to the suit index that has five or more cards, or -1
+    """
+    table = []
+    for suit_counts in range(1 << SUIT_BITS):
+        flush_index = -1
+        for suit in range(4):
+            if (suit_counts >> (3 * suit)) & 7 >= 5:
+                flush_index = suit
+        table.append(flush_index)
+    return table
+
+
+RANK_TABLE = build_rank_table()
+FLUSH_SUIT_TABLE = _build_flush_suit_table()
+FLUSH_TABLE = build_flush_table()
+
+
+def evaluate(cards: list, rank_table: dict = RANK_TABLE, flush_table: list = FLUSH_TABLE) -> tuple[str, int]:
+    """
+    Evaluates the best five card poker hand out of up to seven integer encoded cards
+
+    Args:
+        cards: list of integer encoded cards
+        rank_table: the rank multiset table to use, built with build_rank_table
+        flush_table: the flush table to use, built with build_flush_table
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    key = 0
+    for card in cards:
+        key += CARD_KEY[card]
+
+    flush_index = FLUSH_SUIT_TABLE[key & SUIT_MASK]
+    if flush_index >= 0:
+        rank_mask = 0
+        for card in cards:
+            if card & 3 == flush_index:
+                rank_mask |= 1 << (card >> 2)
+        return flush_table[rank_mask]
+
+    return rank_table[key >> SUIT_BITS]
+
+
+def evaluate_cards(cards: list, rank_table: dict = RANK_TABLE, flush_table: list = FLUSH_TABLE) -> tuple[str, int]:
+    """
+    Evaluates the best five card poker hand out of up to seven PokerCards
+
+    Args:
+        cards: list of PokerCards
+        rank_table: the rank multiset table to use, built with build_rank_table
+        flush_table: the flush table to use, built with build_flush_table
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    return evaluate([card_to_int(card) for card in cards], rank_table, flush_table)
+
+
+def evaluate_mask(hand_mask: int, rank_table: dict = RANK_TABLE, flush_table: list = FLUSH_TABLE) -> tuple[str, int]:
+    """
+    Evaluates the best five card poker hand out of up to seven cards given as a utils.PlayingCards.bitmask card mask.
+    Its 13 bit suit fields index the flush table directly.
+
+    Args:
+        hand_mask: 52 bit mask of the cards
+        rank_table: the rank multiset table to use, built with build_rank_table
+        flush_table: the flush table to use, built with build_flush_table
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    suit = flush_suit(hand_mask)
+    if suit is not None:
+        return flush_table[suit_ranks(hand_mask, suit)]
+    return rank_table[sum(RANK_KEY[index % RANK_BITS] for index in mask_indexes(hand_mask))]
@@ -1,27 +1,27 @@
-from collections import Counter, deque
-from itertools import groupby
+from collections import deque
 from uuid import UUID
 
 from accounts.models import CustomUser
 from games.base import Game
-from games.poker.game.util import PokerCard
+from games.poker.game.evaluator import HAND_TYPE_MAPPER
+from games.poker.game.variants import HOLDEM, VARIANTS, PokerVariant
 from utils.PlayingCards.deck import Deck
 
-HAND_TYPE_MAPPER = {1: "High Card", 2: 'One Pair', 3: 'Two Pair', 4: 'Three of a Kind', 5: 'Straight', 6: 'Flush',
-                    7: 'Full House', 8: 'Four of a Kind', 9: 'Straight Flush'}
-
 
 class PokerHand:
     """
     Hand class for poker game
     """
 
-    def __init__(self, player, hand, board):
+    def __init__(self, player, hand, board, variant: PokerVariant = HOLDEM):
         self.hand = hand
         self.stake = 0
         self.folded = False
         self.board = board
         self.player = player
+        self.variant = variant
+        self.value_cache = None
+        self.value_street = None
 
     def dict_representation(self, hide_cards: bool = False) -> dict:
         """
@@ -49,228 +49,16 @@ class PokerHand:
 
     def value(self) -> tuple[str, int]:
         """
-        Calculates the hand value
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        return self.check_straight_flush()
-
-    def rank_frequency(self):
-        """
-        Returns:
-            A counter of the frequency of each rank in the poker hand
-        """
-        return Counter([card.val for card in self.get_cards()])
-
-    def suit_frequency(self):
-        """
-        Returns:
-            A counter of the frequency of each suit in the poker hand
-        """
-        return Counter([card.suit.suit for card in self.get_cards()])
-
-    @staticmethod
-    def hand_value(playable_hand: list, hand_type: int) -> tuple[str, int]:
-        """
-        Computed the hand value for a passed in hand
-
-        Args:
-            playable_hand: the playable hand (players hand plus the board's cards)
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        value = str(hand_type)
-
-        for card in playable_hand:
-            value += "{:02d}".format(card)
-        return HAND_TYPE_MAPPER[hand_type], int(value)
-
-    def check_straight_flush(self) -> tuple[str, int]:
-        """
-        Checks if hand is a straight flush
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        suit_counts = self.suit_frequency()
-        five_of_same_suit = [key for key, value in suit_counts.items() if value >= 5]
-        if len(five_of_same_suit) > 0:
-            same_suit = [card for card in self.get_cards() if card.suit == five_of_same_suit[0]]
-            card_values = [card.val for card in same_suit]
-            consecutive_cards = self.get_five_or_more_consecutive_cards(card_values)
-            if len(consecutive_cards) > 0:
-                return self.hand_value(sorted(consecutive_cards[0], reverse=True)[:5], 9)
-
-            # Replacing the value of any Aces to 1 to see if there are any straights with it as a 1
-            if 14 in card_values:
-                card_values = [1 if rank == 14 else rank for rank in card_values]
-                consecutive_cards = self.get_five_or_more_consecutive_cards(card_values)
-                if len(consecutive_cards) > 0:
-                    return self.hand_value(sorted(consecutive_cards[0], reverse=True)[:5], 9)
-
-        return self.check_four_of_a_kind()
-
-    def check_four_of_a_kind(self) -> tuple[str, int]:
-        """
-        Checks if hand is a four of a kind
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        counts = self.rank_frequency()
-        if 4 in counts.values():
-            four_rank = [rank for rank, count in counts.items() if count == 4][0]
-            four_of_a_kind = [four_rank for _ in range(4)]
-            playable_hand = four_of_a_kind + sorted((counts - Counter(four_of_a_kind)).elements(), reverse=True)[:1]
-            return self.hand_value(playable_hand, 8)
-
-        return self.check_full_house()
-
-    def check_full_house(self) -> tuple[str, int]:
-        """
-        Checks if hand is a full house
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        counts = self.rank_frequency()
-
-        frequency_of_three_or_more = [key for key, value in counts.items() if value >= 3]
-        if len(frequency_of_three_or_more) > 0:
-            three_rank = sorted(frequency_of_three_or_more)[-1]
-            three_of_a_kind = [three_rank for _ in range(3)]
-            counts_left = counts - Counter(three_of_a_kind)
-
-            frequency_of_two_or_more = [key for key, value in counts_left.items() if value >= 2]
-            if len(frequency_of_two_or_more) > 0:
-                pair_rank = sorted(frequency_of_two_or_more)[-1]
-                pair_cards = [pair_rank for _ in range(2)]
-
-                return self.hand_value(three_of_a_kind + pair_cards, 7)
-
-        return self.check_flush()
-
-    def check_flush(self) -> tuple[str, int]:
-        """
-        Checks if the hand is a flush
+        Calculates the hand value with the variant's lookup table evaluator. The value is cached per street, keyed on the
+        number of cards on the shared board, so it is recomputed only after PokerRound.update_board deals new cards
 
         Returns:
             A tuple of the hand class and the integer value of the hand
         """
-        suit_counts = self.suit_frequency()
-        five_of_same_suit = [key for key, value in suit_counts.items() if value >= 5]
-        if len(five_of_same_suit) > 0:
-            same_suit = [card.val for card in self.get_cards() if card.suit == five_of_same_suit[0]]
-            return self.hand_value(sorted(same_suit, reverse=True)[:5], 6)
-
-        return self.check_straight()
-
-    @staticmethod
-    def get_five_or_more_consecutive_cards(ranks: list) -> list:
-        """
-        Returns a list of 5+ cards if they are all consecutive
-
-        Args:
-            ranks: list of ranks to be checked
-
-        Returns:
-            List of lists that contain the consecutive streaks
-        """
-        ranks = sorted(ranks)
-        grpby = groupby(enumerate(ranks), key=lambda x: x[0] - x[1])
-        all_groups = ([rank[1] for rank in group] for _, group in grpby)
-        return list(filter(lambda x: len(x) >= 5, all_groups))
-
-    def check_straight(self) -> tuple[str, int]:
-        """
-        Checks if the hand is a straight, can either be with Ace as the highest card or
-        with Ace representing a 1 for the lowest straight possible of A, 2, 3, 4, 5
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        card_values = [card.val for card in self.get_cards()]
-        consecutive_cards = self.get_five_or_more_consecutive_cards(card_values)
-        if len(consecutive_cards) > 0:
-            return self.hand_value(sorted(consecutive_cards[0], reverse=True)[:5], 5)
-
-        # Replacing the value of any Aces to 1 to see if there are any straights with it as a 1
-        if 14 in card_values:
-            card_values = [1 if rank == 14 else rank for rank in card_values]
-            consecutive_cards = self.get_five_or_more_consecutive_cards(card_values)
-            if len(consecutive_cards) > 0:
-                return self.hand_value(sorted(consecutive_cards[0], reverse=True)[:5], 5)
-
-        return self.check_three_of_a_kind()
-
-    def check_three_of_a_kind(self) -> tuple[str, int]:
-        """
-        Checks if a hand is a 3 of a kind
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        counts = self.rank_frequency()
-
-        frequency_of_three_or_more = [key for key, value in counts.items() if value >= 3]
-        if len(frequency_of_three_or_more) > 0:
-            three_rank = sorted(frequency_of_three_or_more)[-1]
-            three_of_a_kind = [three_rank for _ in range(3)]
-            counts_left = counts - Counter(three_of_a_kind)
-            playable_hand = three_of_a_kind + sorted(counts_left.elements(), reverse=True)[:2]
-
-            return self.hand_value(playable_hand, 4)
-
-        return self.check_two_pairs()
-
-    def check_two_pairs(self) -> tuple[str, int]:
-        """
-        Checks if a card is a two pair
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        counts = self.rank_frequency()
-        frequency_of_two_or_more = [key for key, value in counts.items() if value >= 2]
-        if len(frequency_of_two_or_more) >= 2:
-            pair_ranks = sorted(frequency_of_two_or_more, reverse=True)[:2]
-            pairs_cards = [pair_ranks[0] for _ in range(2)] + [pair_ranks[1] for _ in range(2)]
-            playable_hand = pairs_cards + sorted((counts - Counter(pairs_cards)).elements(), reverse=True)[:1]
-            return self.hand_value(playable_hand, 3)
-
-        return self.check_one_pair()
-
-    def check_one_pair(self) -> tuple[str, int]:
-        """
-        checks if the hand contains a pair
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        counts = self.rank_frequency()
-        frequency_of_two_or_more = [key for key, value in counts.items() if value >= 2]
-        if len(frequency_of_two_or_more) > 0:
-            pair_rank = sorted(frequency_of_two_or_more, reverse=True)[0]
-            pairs_cards = [pair_rank for _ in range(2)]
-            counts_left = counts - Counter(pairs_cards)
-
-            playable_hand = pairs_cards + sorted(counts_left.elements(), reverse=True)[:3]
-            return self.hand_value(playable_hand, 2)
-
-        return self.check_high_card()
-
-    def check_high_card(self) -> tuple[str, int]:
-        """
-        Returns the high cards
-
-        Returns:
-            A tuple of the hand class and the integer value of the hand
-        """
-        card_values = [card.val for card in self.get_cards()]
-        highest_five_cards = sorted(card_values, reverse=True)[:5]
-        return self.hand_value(highest_five_cards, 1)
+        if self.value_street != len(self.board):
+            self.value_cache = self.variant.evaluate(self.hand, self.board)
+            self.value_street = len(self.board)
+        return self.value_cache
 
     def __lt__(self, other):
         return self.value() < other.value()
@@ -295,7 +83,8 @@ class PokerRound:
     """
     Class for a round of poker
     """
-    def __init__(self, deck, players) -> None:
+    def __init__(self, deck, players, variant: PokerVariant = HOLDEM) -> None:
+        self.variant = variant
         self.hands = dict()
         self.players_in_hand = deque(players)
         self.last_raiser = self.players_in_hand[0]
@@ -306,6 +95,9 @@ class PokerRound:
         self.deck = deck
         self.outcomes = {}
         self.winners = []
+        self.equity = None
+        self.equity_street = None
+        self.equity_samples = 0
         self.deal_cards()
 
     def remove_player(self, player: CustomUser) -> None:
@@ -334,7 +126,7 @@ class PokerRound:
         """
 
         for player in self.players_in_hand:
-            self.hands[player] = PokerHand(player, self.deck.deal(2), self.board)
+            self.hands[player] = PokerHand(player, self.deck.deal(self.variant.hole_cards), self.board, self.variant)
 
     def evaluate_winner(self) -> None:
         """
@@ -376,6 +168,30 @@ class PokerRound:
             self.reset_stakes()
             self.evaluate_winner()
 
+    def record_equity(self, street: int, equity: dict, samples: int) -> None:
+        """
+        Records the result of an equity simulation
+
+        Args:
+            street: the number of board cards the simulation was run with
+            equity: dictionary of each live player's username to their win and tie probabilities
+            samples: the number of run outs simulated
+        """
+        self.equity = equity
+        self.equity_street = street
+        self.equity_samples = samples
+
+    def current_equity(self) -> dict:
+        """
+        Returns:
+            the recorded equity if it was computed for the current street and round is still being played, else None
+        """
+        if self.round_over or self.equity_street != len(self.board):
+            return None
+        return {'players': {username: player_equity for username, player_equity in self.equity.items()
+                            if username in {player.username for player in self.players_in_hand}},
+                'samples': self.equity_samples}
+
     def reset_stakes(self) -> None:
         """
         Updates the stakes of the players in the hand
@@ -493,11 +309,29 @@ class PokerRound:
 
 
 class Poker(Game):
-    def __init__(self, session_id: UUID):
+    def __init__(self, session_id: UUID, variant: PokerVariant = HOLDEM):
         super().__init__(session_id)
         self.round = None
         self.players_ready = dict()
-        self.deck = Deck(PokerCard)
+        self.variant = variant
+        self.deck = Deck(variant.card_class, self.rng)
+
+    def set_variant(self, name: str) -> bool:
+        """
+        Changes the poker variant played at the table, which is only allowed before the first round or once the
+        current round is over. The next round is dealt from a deck of the new variant.
+
+        Args:
+            name: name of the variant in VARIANTS
+
+        Returns:
+            True if the variant was changed, False otherwise
+        """
+        if (self.round is not None and not self.round.round_over) or name not in VARIANTS:
+            return False
+        self.variant = VARIANTS[name]
+        self.deck = Deck(self.variant.card_class, self.rng)
+        return True
 
     def add_player(self, player: CustomUser) -> None:
         """
@@ -541,7 +375,7 @@ class Poker(Game):
         """
         Starts a round of poker
         """
-        self.round = PokerRound(self.deck, self.players)
+        self.round = PokerRound(self.deck, self.players, self.variant)
 
     def check_move_to_next_stage(self) -> None:
         """
@@ -581,10 +415,13 @@ class Poker(Game):
         if self.round is not None:
             return self.round.dict_representation(user) | {
                 'players_ready': {player.username: player_ready for player, player_ready in self.players_ready.items()},
-                "spectating": [spectator.username for spectator in self.spectating]}
+                "spectating": [spectator.username for spectator in self.spectating],
+                'variant': self.variant.name} | (
+                {'equity': self.round.current_equity()} if user in self.spectating else {})
         else:
             return {'stage': 'waiting',
                     'players_ready': {player.username: player_ready for player, player_ready in
                                       self.players_ready.items()},
-                    "spectating": [spectator.username for spectator in self.spectating]
+                    "spectating": [spectator.username for spectator in self.spectating],
+                    'variant': self.variant.name
                     }
@@ -0,0 +1,136 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from games.poker.game.batch import evaluate_batch, evaluate_run_outs
+from games.poker.game.evaluator import CARD_RANK, CARD_SUIT, card_to_int
+
+PREFLOP_TABLE_VERSION = 1
+PREFLOP_TABLE_PATH = Path(__file__).resolve().parent / 'data' / 'preflop_equity.json'
+MAX_OPPONENTS = 9
+RANK_CHARS = '23456789TJQKA'
+SAMPLE_CHUNK = 2000
+
+
+def hand_class(hole_cards: list) -> str:
+    """
+    Returns the starting hand class of two hole cards, e.g. "AA", "AKs" or "T9o"
+
+    Args:
+        hole_cards: the two integer encoded hole cards
+
+    Returns:
+        the name of the starting hand class
+    """
+    high, low = sorted(hole_cards, key=lambda card: CARD_RANK[card], reverse=True)
+    name = RANK_CHARS[CARD_RANK[high]] + RANK_CHARS[CARD_RANK[low]]
+    if CARD_RANK[high] == CARD_RANK[low]:
+        return name
+    return name + ('s' if CARD_SUIT[high] == CARD_SUIT[low] else 'o')
+
+
+def all_hand_classes() -> list:
+    """
+    Returns:
+        the names of all 169 starting hand classes
+    """
+    classes = []
+    for high in range(12, -1, -1):
+        for low in range(high, -1, -1):
+            if high == low:
+                classes.append(RANK_CHARS[high] * 2)
+            else:
+                classes += [RANK_CHARS[high] + RANK_CHARS[low] + 's', RANK_CHARS[high] + RANK_CHARS[low] + 'o']
+    return classes
+
+
+def class_equity(name: str, samples: int, seed) -> list:
+    """
+    Simulates the equity of a starting hand class against 1 to MAX_OPPONENTS players holding random cards. Equity is the
+    average share of the pot won, so split pots count as a fraction of a win.
+
+    Args:
+        name: the starting hand class
+        samples: number of deals to simulate for each number of opponents
+        seed: seed for the random number generator
+
+    Returns:
+        list of the equity against each number of opponents
+    """
+    high, low = RANK_CHARS.index(name[0]), RANK_CHARS.index(name[1])
+    hole = [high * 4, low * 4 + (0 if name.endswith('s') else 1)]
+    deck = np.array([card for card in range(52) if card not in hole], dtype=np.int64)
+    rng = np.random.default_rng(seed)
+
+    equity = []
+    for opponents in range(1, MAX_OPPONENTS + 1):
+        share = 0.0
+        for start in range(0, samples, SAMPLE_CHUNK):
+            chunk = min(SAMPLE_CHUNK, samples - start)
+            deals = rng.permuted(np.tile(deck, (chunk, 1)), axis=1)[:, :2 * opponents + 5]
+            board = deals[:, 2 * opponents:]
+
+            scores = np.vstack([evaluate_run_outs([hole], board)] +
+                               [evaluate_batch(np.hstack([deals[:, 2 * seat:2 * seat + 2], board]))[1]
+                                for seat in range(opponents)])
+            winners = scores == scores.max(axis=0)
+            share += (winners[0] / winners.sum(axis=0)).sum()
+        equity.append(float(share / samples))
+    return equity
+
+
+def generate_preflop_table(samples: int = 20000, workers: int = None, seed: int = 435) -> dict:
+    """
+    Simulates the equity of every starting hand class in a pool of worker processes
+
+    Args:
+        samples: number of deals to simulate for each hand class and number of opponents
+        workers: number of worker processes, defaults to the number of CPUs
+        seed: root seed, spawned into an independent stream for every hand class
+
+    Returns:
+        the versioned preflop equity table
+    """
+    classes = all_hand_classes()
+    seeds = np.random.SeedSequence(seed).spawn(len(classes))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(class_equity, classes, [samples] * len(classes), seeds)
+        equity = {name: [round(value, 4) for value in result] for name, result in zip(classes, results)}
+
+    return {'version': PREFLOP_TABLE_VERSION, 'samples': samples, 'seed': seed, 'equity': equity}
+
+
+@lru_cache(maxsize=None)
+def load_preflop_table(path: Path = PREFLOP_TABLE_PATH) -> dict:
+    """
+    Loads the preflop equity table the first time it is needed
+
+    Args:
+        path: location of the table file
+
+    Returns:
+        dictionary of each starting hand class to its equity against 1 to MAX_OPPONENTS opponents
+    """
+    with open(path) as table_file:
+        table = json.load(table_file)
+    if table['version'] != PREFLOP_TABLE_VERSION:
+        raise ValueError('Preflop equity table version {} does not match {}, regenerate it with '
+                         'generate_preflop_equity'.format(table['version'], PREFLOP_TABLE_VERSION))
+    return table['equity']
+
+
+def preflop_equity(hole_cards: list, opponents: int) -> float:
+    """
+    Looks up the equity of two hole cards against a number of opponents holding random cards
+
+    Args:
+        hole_cards: the player's two PokerCards
+        opponents: the number of opponents, from 1 to MAX_OPPONENTS
+
+    Returns:
+        the average share of the pot the hand wins
+    """
+    return load_preflop_table()[hand_class([card_to_int(card) for card in hole_cards])][opponents - 1]
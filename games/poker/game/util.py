@@ -5,10 +5,11 @@ class PokerCard(Card):
     """
     Card class for the poker game
     """
+    __slots__ = ('val',)
 
-    def __init__(self, val, suit):
-        super(PokerCard, self).__init__(val, suit)
-        self.val = self.get_value()
+    def setup(self, suit, rank) -> None:
+        super(PokerCard, self).setup(suit, rank)
+        object.__setattr__(self, 'val', self.get_value())
 
     def get_value(self) -> int:
         """
@@ -31,3 +32,14 @@ class PokerCard(Card):
 
     def __ne__(self, other):
         return self.val != other.val or self.suit != other.suit
+
+    def __hash__(self):
+        return hash(self.string)
+
+
+class ShortDeckPokerCard(PokerCard):
+    """
+    Card class for short deck poker, which removes the 2s through 5s from the deck
+    """
+    __slots__ = ()
+    RANKS = ('A', 6, 7, 8, 9, 10, 'J', 'Q', 'K')
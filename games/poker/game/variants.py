@@ -0,0 +1,128 @@
+from functools import lru_cache
+from itertools import combinations
+from typing import Callable
+
+from games.poker.game.evaluator import CARD_RANK, CARD_SUIT, FLUSH_TABLE, HAND_ORDER, RANK_KEY, RANK_TABLE, STRAIGHTS, \
+    build_flush_table, build_rank_table, card_to_int, evaluate
+from games.poker.game.util import PokerCard, ShortDeckPokerCard
+
+# Short deck plays A-6-7-8-9 as its lowest straight, and a flush beats a full house since it is harder to make
+SHORT_DECK_STRAIGHTS = [(mask, ranks) for mask, ranks in STRAIGHTS if min(ranks) >= 6] + \
+                       [(0b1000011110000, [9, 8, 7, 6, 1])]
+SHORT_DECK_HAND_ORDER = HAND_ORDER | {6: 7, 7: 6}
+
+
+@lru_cache(maxsize=None)
+def short_deck_tables() -> tuple[dict, list]:
+    """
+    Builds the short deck evaluator tables the first time they are needed
+
+    Returns:
+        A tuple of the short deck rank table and flush table
+    """
+    return (build_rank_table(SHORT_DECK_STRAIGHTS, SHORT_DECK_HAND_ORDER, range(4, 13)),
+            build_flush_table(SHORT_DECK_STRAIGHTS, SHORT_DECK_HAND_ORDER))
+
+
+def partial_hand(cards: tuple) -> tuple[int, int, int]:
+    """
+    Precomputes the part of the evaluator's lookup that a group of cards contributes to a five card hand
+
+    Args:
+        cards: integer encoded cards
+
+    Returns:
+        A tuple of the sum of the cards' rank keys, the suit index if all cards share it (else -1) and the rank mask
+    """
+    suit = CARD_SUIT[cards[0]] if len({CARD_SUIT[card] for card in cards}) == 1 else -1
+    return sum(RANK_KEY[CARD_RANK[card]] for card in cards), suit, sum(1 << CARD_RANK[card] for card in cards)
+
+
+def evaluate_holdem(hole: list, board: list) -> tuple[str, int]:
+    """
+    Evaluates the best five cards out of the hole cards and board
+
+    Args:
+        hole: integer encoded hole cards
+        board: integer encoded board cards
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    return evaluate(hole + board)
+
+
+def evaluate_short_deck(hole: list, board: list) -> tuple[str, int]:
+    """
+    Evaluates the best five cards out of the hole cards and board with short deck rankings
+
+    Args:
+        hole: integer encoded hole cards
+        board: integer encoded board cards
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    rank_table, flush_table = short_deck_tables()
+    return evaluate(hole + board, rank_table, flush_table)
+
+
+def evaluate_omaha(hole: list, board: list, rank_table: dict = RANK_TABLE, flush_table: list = FLUSH_TABLE) \
+        -> tuple[str, int]:
+    """
+    Evaluates the best Omaha hand, made of exactly two hole cards and three board cards. The rank keys, suits and rank
+    masks of the 6 hole card pairs and 10 board triples are computed once, so each of the 60 combinations costs a single
+    table lookup. The flush table is only consulted when the pair and the triple are suited in the same suit.
+
+    Args:
+        hole: the four integer encoded hole cards
+        board: integer encoded board cards
+        rank_table: the rank multiset table to use
+        flush_table: the flush table to use
+
+    Returns:
+        A tuple of the hand class and the integer value of the hand
+    """
+    pairs = [partial_hand(cards) for cards in combinations(hole, 2)]
+    triples = [partial_hand(cards) for cards in combinations(board, min(3, len(board)))]
+
+    best = None
+    for pair_key, pair_suit, pair_mask in pairs:
+        for triple_key, triple_suit, triple_mask in triples:
+            hand = flush_table[pair_mask | triple_mask] if pair_suit >= 0 and pair_suit == triple_suit else None
+            if hand is None:
+                hand = rank_table[pair_key + triple_key]
+            if best is None or hand[1] > best[1]:
+                best = hand
+    return best
+
+
+class PokerVariant:
+    """
+    Rules of a poker variant: how many hole cards are dealt, which cards are in the deck and how hands are evaluated
+    """
+
+    def __init__(self, name: str, hole_cards: int, card_class: type, evaluator: Callable):
+        self.name = name
+        self.hole_cards = hole_cards
+        self.card_class = card_class
+        self.evaluator = evaluator
+
+    def evaluate(self, hand: list, board: list) -> tuple[str, int]:
+        """
+        Evaluates a player's hand
+
+        Args:
+            hand: the player's PokerCards
+            board: the PokerCards on the board
+
+        Returns:
+            A tuple of the hand class and the integer value of the hand
+        """
+        return self.evaluator([card_to_int(card) for card in hand], [card_to_int(card) for card in board])
+
+
+HOLDEM = PokerVariant('holdem', 2, PokerCard, evaluate_holdem)
+OMAHA = PokerVariant('omaha', 4, PokerCard, evaluate_omaha)
+SHORT_DECK = PokerVariant('short_deck', 2, ShortDeckPokerCard, evaluate_short_deck)
+VARIANTS = {variant.name: variant for variant in (HOLDEM, OMAHA, SHORT_DECK)}
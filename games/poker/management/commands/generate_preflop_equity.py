@@ -0,0 +1,35 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from games.poker.game.preflop import PREFLOP_TABLE_PATH, generate_preflop_table
+
+
+class Command(BaseCommand):
+    """
+    Regenerates the preflop equity table shipped with the poker game
+    """
+    help = 'Simulates the equity of all 169 starting hand classes against 1-9 random opponents'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--samples', type=int, default=20000,
+                            help='deals simulated per hand class and number of opponents')
+        parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+        parser.add_argument('--seed', type=int, default=435, help='root seed of the simulation')
+        parser.add_argument('--output', default=str(PREFLOP_TABLE_PATH), help='file to write the table to')
+
+    def handle(self, *args, **options) -> None:
+        start = time.monotonic()
+        table = generate_preflop_table(options['samples'], options['workers'], options['seed'])
+
+        # One hand class per line keeps regenerated tables reviewable in diffs
+        header = {key: value for key, value in table.items() if key != 'equity'}
+        with open(options['output'], 'w') as table_file:
+            table_file.write(json.dumps(header)[:-1] + ', "equity": {\n')
+            table_file.write(',\n'.join('  "{}": {}'.format(name, json.dumps(equity))
+                                        for name, equity in table['equity'].items()))
+            table_file.write('\n}}\n')
+
+        self.stdout.write('Wrote {} hand classes to {} in {:.1f}s'.format(len(table['equity']), options['output'],
+                                                                         time.monotonic() - start))
@@ -2,8 +2,10 @@ import json
 from uuid import UUID
 
 from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 
 from games.base import ConsumerUpdater, GameConsumer
+from games.poker.game.equity import EQUITY_SAMPLES, EQUITY_SERVICE, EQUITY_TIME_LIMIT, equity_budget
 from games.poker.web.views import POKER_MANAGER
 
 
@@ -62,8 +64,54 @@ class PokerUpdater(ConsumerUpdater):
 
         return {'group_send': True, 'message_function': 'individual_game_load'}
 
+    @staticmethod
+    def set_variant(request_data: dict) -> dict:
+        """
+        Changes the poker variant played in the session while no round is in progress. Only players seated at the
+        table may change it.
+
+        Args:
+            request_data: the request dictionary
+
+        Returns:
+            the full dictionary representation of the game for each user, or None if the request was rejected
+        """
+        game_instance = POKER_MANAGER.get(UUID(request_data['session_id']))
+        if request_data['user'] not in game_instance.players:
+            return None
+        game_instance.set_variant(request_data['data']['variant'])
+
+        return {'group_send': True, 'message_function': 'individual_game_load'}
+
+    @staticmethod
+    def request_equity(request_data: dict) -> None:
+        """
+        Starts an equity simulation for the current street in the worker pool. Nothing is sent back right away; once the
+        simulation finishes every connection in the session reloads the game, and spectators receive the results
+
+        Args:
+            request_data: the request dictionary, optionally with 'samples' and 'time_limit' budgets under 'data', which
+                          are capped at the server maximums and ignored if they are not positive numbers
+        """
+        session_id = request_data['session_id']
+        game_instance = POKER_MANAGER.get(UUID(session_id))
+        if game_instance.round is None or game_instance.round.current_equity() is not None:
+            return None
+
+        budget = request_data.get('data')
+        budget = budget if isinstance(budget, dict) else {}
+        samples, time_limit = equity_budget(budget.get('samples', EQUITY_SAMPLES),
+                                            budget.get('time_limit', EQUITY_TIME_LIMIT))
+
+        def broadcast(_) -> None:
+            async_to_sync(get_channel_layer().group_send)(session_id, {'type': 'individual_game_load'})
+
+        EQUITY_SERVICE.submit(game_instance.round, samples, time_limit, callback=broadcast)
+        return None
+
     FUNCTION_MAP = {'load_game': load_game.__func__, 'place_action': place_action.__func__,
-                    'ready_up': ready_up.__func__}
+                    'ready_up': ready_up.__func__, 'request_equity': request_equity.__func__,
+                    'set_variant': set_variant.__func__}
 
 
 class PokerConsumer(GameConsumer):
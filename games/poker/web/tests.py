@@ -1,10 +1,27 @@
 from uuid import uuid4
 
+import numpy as np
 from django.test import TestCase
 
 from accounts.models import CustomUser
+from games.poker.game.batch import encode_hands, evaluate_batch, evaluate_run_outs
+from games.poker.game.equity import EQUITY_SAMPLES, EQUITY_TIME_LIMIT, MAX_EQUITY_SAMPLES, MAX_EQUITY_TIME_LIMIT, \
+    EquityService, compute_equity, enumerate_equity, equity_budget, simulate_equity
+from games.poker.game.evaluator import HAND_TYPE_MAPPER, card_to_int, evaluate, evaluate_cards, evaluate_mask, \
+    int_to_str
 from games.poker.game.poker import Poker, PokerHand
-from games.poker.game.util import PokerCard
+from games.poker.game.preflop import MAX_OPPONENTS, all_hand_classes, class_equity, hand_class, load_preflop_table, \
+    preflop_equity
+from games.poker.game.util import PokerCard, ShortDeckPokerCard
+from games.poker.game.variants import OMAHA, SHORT_DECK
+from games.poker.web.consumers import PokerUpdater
+from games.poker.web.views import POKER_MANAGER
+from utils.PlayingCards import bitmask
+from utils.PlayingCards.deck import Deck
+
+
+def encode(cards: list) -> list:
+    return [card_to_int(card) for card in cards]
 
 
 class TestPokerGameDeal(TestCase):
@@ -176,6 +193,309 @@ class PokerGameTestFindBestHand(TestCase):
         self.assertTrue(lower_straight.value()[1] < higher_straight.value()[1])
 
 
+class TestPokerEvaluator(TestCase):
+    def test_card_encoding_round_trips(self):
+        for card in Deck(PokerCard).deck:
+            self.assertEqual(str(card), int_to_str(card_to_int(card)))
+
+    def test_seven_card_straight_flush(self):
+        cards = [PokerCard('H', 9), PokerCard('H', 'K'), PokerCard('H', 10), PokerCard('H', 'J'), PokerCard('H', 'Q'),
+                 PokerCard('S', 'K'), PokerCard('D', 'K')]
+        self.assertEqual(("Straight Flush", 91312111009), evaluate_cards(cards))
+
+    def test_wheel_is_lowest_straight(self):
+        wheel = evaluate_cards([PokerCard('H', 'A'), PokerCard('S', 2), PokerCard('D', 3), PokerCard('C', 4),
+                                PokerCard('H', 5), PokerCard('S', 'K'), PokerCard('D', 9)])
+        six_high = evaluate_cards([PokerCard('H', 6), PokerCard('S', 2), PokerCard('D', 3), PokerCard('C', 4),
+                                   PokerCard('H', 5), PokerCard('S', 'K'), PokerCard('D', 9)])
+        self.assertEqual(("Straight", 50504030201), wheel)
+        self.assertTrue(wheel[1] < six_high[1])
+
+    def test_straight_with_paired_card(self):
+        hand_type, _ = evaluate_cards([PokerCard('H', 6), PokerCard('S', 7), PokerCard('D', 8), PokerCard('C', 9),
+                                       PokerCard('H', 9), PokerCard('S', 10), PokerCard('D', 2)])
+        self.assertEqual("Straight", hand_type)
+
+    def test_full_house_from_two_trips(self):
+        cards = [PokerCard('H', 8), PokerCard('S', 8), PokerCard('D', 8), PokerCard('C', 'Q'), PokerCard('H', 'Q'),
+                 PokerCard('S', 'Q'), PokerCard('D', 2)]
+        self.assertEqual(("Full House", 71212120808), evaluate_cards(cards))
+
+    def test_flush_uses_top_five_suited_cards(self):
+        cards = [PokerCard('C', 2), PokerCard('C', 9), PokerCard('C', 4), PokerCard('C', 'J'), PokerCard('C', 6),
+                 PokerCard('C', 'A'), PokerCard('H', 'A')]
+        self.assertEqual(("Flush", 61411090604), evaluate_cards(cards))
+
+
+class TestPokerBatchEvaluator(TestCase):
+    def test_batch_matches_single_hand_evaluator(self):
+        hands = []
+        for _ in range(200):
+            deck = Deck(PokerCard)
+            hands.append(deck.deal(7))
+        hand_types, values = evaluate_batch(encode_hands(hands))
+        for hand, hand_type, value in zip(hands, hand_types, values):
+            self.assertEqual(evaluate_cards(hand), (HAND_TYPE_MAPPER[int(hand_type)], int(value)))
+
+    def test_batch_scores_flushes_and_five_card_hands(self):
+        hands = [[PokerCard('C', 2), PokerCard('C', 9), PokerCard('C', 4), PokerCard('C', 'J'), PokerCard('C', 6)],
+                 [PokerCard('H', 6), PokerCard('S', 7), PokerCard('D', 8), PokerCard('C', 9), PokerCard('H', 10)]]
+        hand_types, values = evaluate_batch(encode_hands(hands))
+        self.assertEqual([6, 5], list(hand_types))
+        self.assertEqual([61109060402, 51009080706], list(values))
+
+
+class TestPokerHandValueCache(TestCase):
+    def setUp(self) -> None:
+        self.user = CustomUser.objects.create_user(username="andrew")
+        self.board = [PokerCard('S', 'Q'), PokerCard('D', 7), PokerCard('C', 3)]
+        self.hand = PokerHand(self.user, [PokerCard('S', 'K'), PokerCard('H', 'K')], self.board)
+
+    def test_value_is_cached_within_a_street(self):
+        first = self.hand.value()
+        self.assertIs(first, self.hand.value())
+        self.assertEqual(3, self.hand.value_street)
+
+    def test_value_updates_when_board_is_dealt(self):
+        self.assertEqual("One Pair", self.hand.value()[0])
+        self.board.append(PokerCard('D', 'K'))
+        self.assertEqual("Three of a Kind", self.hand.value()[0])
+        self.assertEqual(4, self.hand.value_street)
+
+    def test_update_board_invalidates_value(self):
+        session = Poker(uuid4())
+        session.players = {self.user, CustomUser.objects.create_user(username="andrew2")}
+        session.start_round()
+        hand = session.round.hands[self.user]
+        preflop = hand.value()
+        session.round.update_board()
+        self.assertEqual(evaluate_cards(hand.get_cards()), hand.value())
+        self.assertNotEqual(preflop, hand.value())
+
+
+class TestPokerEquity(TestCase):
+    def setUp(self) -> None:
+        self.session = Poker(uuid4())
+        self.andy = CustomUser.objects.create_user(username="andy", current_balance=100)
+        self.drew = CustomUser.objects.create_user(username="drew", current_balance=100)
+        self.spectator = CustomUser.objects.create_user(username="spectator")
+        self.session.players = {self.andy, self.drew}
+        self.session.add_to_spectating(self.spectator)
+        self.session.start_round()
+        self.round = self.session.round
+
+    def test_simulate_equity_on_river_is_exact(self):
+        board = [PokerCard('S', 2), PokerCard('D', 7), PokerCard('C', 9), PokerCard('H', 'J'), PokerCard('S', 'K')]
+        aces = [PokerCard('H', 'A'), PokerCard('D', 'A')]
+        queens = [PokerCard('H', 'Q'), PokerCard('D', 'Q')]
+        wins, ties, samples = simulate_equity([encode(aces), encode(queens)], encode(board), [], samples=500)
+        self.assertEqual(([1.0, 0.0], [0.0, 0.0], 1), (wins, ties, samples))
+
+    def test_simulate_equity_preflop_favourite(self):
+        deck = Deck(PokerCard)
+        aces = [PokerCard('H', 'A'), PokerCard('D', 'A')]
+        seven_two = [PokerCard('C', 7), PokerCard('S', 2)]
+        remaining = [card for card in deck.deck if card not in aces + seven_two]
+        wins, ties, samples = simulate_equity([encode(aces), encode(seven_two)], [], encode(remaining),
+                                              samples=4000, seed=435)
+        self.assertEqual(4000, samples)
+        self.assertTrue(0.82 < wins[0] < 0.92)
+        self.assertAlmostEqual(1.0, wins[0] + wins[1] + ties[0], places=6)
+
+    def test_enumerate_equity_matches_brute_force_on_turn(self):
+        cards = list(range(52))
+        hole_cards, board, deck = [cards[0:2], cards[20:22], cards[40:42]], cards[10:14], cards[44:52] + cards[30:38]
+        wins, ties, run_outs = enumerate_equity(hole_cards, board, deck)
+
+        expected_wins = [0, 0, 0]
+        for river in deck:
+            values = [evaluate(hole + board + [river])[1] for hole in hole_cards]
+            if values.count(max(values)) == 1:
+                expected_wins[values.index(max(values))] += 1
+        self.assertEqual(len(deck), run_outs)
+        self.assertEqual([win / len(deck) for win in expected_wins], wins)
+
+    def test_compute_equity_enumerates_flop_within_budget(self):
+        cards = list(range(52))
+        _, _, run_outs = compute_equity([cards[0:2], cards[2:4]], cards[4:7], cards[7:], samples=10000)
+        self.assertEqual(990, run_outs)
+        _, _, samples = compute_equity([cards[0:2], cards[2:4]], [], cards[4:], samples=1000, seed=435)
+        self.assertEqual(1000, samples)
+
+    def test_compute_equity_on_river_is_exact(self):
+        board = [PokerCard('S', 2), PokerCard('D', 7), PokerCard('C', 9), PokerCard('H', 'J'), PokerCard('S', 'K')]
+        aces = [PokerCard('H', 'A'), PokerCard('D', 'A')]
+        queens = [PokerCard('H', 'Q'), PokerCard('D', 'Q')]
+        remaining = [card for card in Deck(PokerCard).deck if card not in board + aces + queens]
+        wins, ties, run_outs = compute_equity([encode(aces), encode(queens)], encode(board), encode(remaining))
+        self.assertEqual(([1.0, 0.0], [0.0, 0.0], 1), (wins, ties, run_outs))
+
+    def test_evaluate_run_outs_matches_batch_evaluator(self):
+        cards = list(range(0, 52, 3))
+        run_outs = np.array([cards[i:i + 2] for i in range(5, 15)])
+        fixed = [cards[0:2] + cards[2:5], cards[15:17] + cards[2:5]]
+        for index, hand in enumerate(fixed):
+            _, values = evaluate_batch(np.hstack([np.tile(hand, (len(run_outs), 1)), run_outs]))
+            self.assertEqual(list(values), list(evaluate_run_outs(fixed, run_outs)[index]))
+
+    def test_equity_only_shown_to_spectators(self):
+        self.round.record_equity(0, {'andy': {'win': 0.5, 'tie': 0.0}, 'drew': {'win': 0.5, 'tie': 0.0}}, 10)
+        self.assertNotIn('equity', self.session.dict_representation(self.andy))
+        self.assertEqual(10, self.session.dict_representation(self.spectator)['equity']['samples'])
+
+    def test_equity_expires_when_board_is_dealt(self):
+        self.round.record_equity(0, {'andy': {'win': 0.5, 'tie': 0.0}, 'drew': {'win': 0.5, 'tie': 0.0}}, 10)
+        self.round.update_board()
+        self.assertIsNone(self.session.dict_representation(self.spectator)['equity'])
+
+    def test_equity_budget_is_validated_and_capped(self):
+        self.assertEqual((500, 1.5), equity_budget('500', '1.5'))
+        self.assertEqual((MAX_EQUITY_SAMPLES, MAX_EQUITY_TIME_LIMIT), equity_budget(10 ** 9, 10 ** 9))
+        self.assertEqual((EQUITY_SAMPLES, EQUITY_TIME_LIMIT), equity_budget(0, -1))
+        self.assertEqual((EQUITY_SAMPLES, EQUITY_TIME_LIMIT), equity_budget('many', None))
+        self.assertEqual((EQUITY_SAMPLES, EQUITY_TIME_LIMIT), equity_budget(float('inf'), float('nan')))
+
+    def test_service_records_equity_on_round(self):
+        service = EquityService(max_workers=1)
+        try:
+            service.submit(self.round, samples=200).result(timeout=60)
+        finally:
+            service.shutdown()
+        equity = self.round.current_equity()
+        self.assertEqual({'andy', 'drew'}, set(equity['players']))
+        self.assertEqual(200, equity['samples'])
+
+
+class TestPokerPreflopTable(TestCase):
+    def test_hand_class_names(self):
+        self.assertEqual("AA", hand_class(encode([PokerCard('S', 'A'), PokerCard('D', 'A')])))
+        self.assertEqual("AKs", hand_class(encode([PokerCard('H', 'K'), PokerCard('H', 'A')])))
+        self.assertEqual("T9o", hand_class(encode([PokerCard('H', 9), PokerCard('C', 10)])))
+        self.assertEqual(169, len(set(all_hand_classes())))
+
+    def test_shipped_table_covers_every_class(self):
+        table = load_preflop_table()
+        self.assertEqual(set(all_hand_classes()), set(table))
+        self.assertTrue(all(len(equity) == MAX_OPPONENTS for equity in table.values()))
+
+    def test_preflop_equity_lookup(self):
+        aces = [PokerCard('S', 'A'), PokerCard('D', 'A')]
+        seven_two = [PokerCard('S', 7), PokerCard('D', 2)]
+        self.assertAlmostEqual(0.85, preflop_equity(aces, 1), delta=0.01)
+        self.assertTrue(preflop_equity(aces, 9) < preflop_equity(aces, 1))
+        self.assertTrue(preflop_equity(seven_two, 1) < preflop_equity(aces, 1))
+
+    def test_class_equity_simulation(self):
+        equity = class_equity('AA', 2000, 435)
+        self.assertEqual(MAX_OPPONENTS, len(equity))
+        self.assertAlmostEqual(0.85, equity[0], delta=0.03)
+
+
+class TestPokerBitmaskCards(TestCase):
+    def test_string_round_trip(self):
+        for card in Deck(PokerCard).deck:
+            self.assertEqual(str(card), bitmask.bit_to_str(bitmask.card_to_bit(card)))
+            self.assertEqual(bitmask.card_to_bit(card), bitmask.str_to_bit(str(card)))
+        self.assertEqual(21, bitmask.str_to_bit("10H"))
+
+    def test_deck_mask_subtraction(self):
+        deck = Deck(PokerCard)
+        self.assertEqual(bitmask.FULL_DECK, deck.mask())
+        dealt = deck.deal(5)
+        self.assertEqual(bitmask.FULL_DECK & ~bitmask.to_mask(dealt), deck.mask())
+        self.assertEqual(47, bitmask.count(deck.mask()))
+        self.assertEqual(sorted(map(str, dealt)), sorted(map(str, bitmask.from_mask(bitmask.to_mask(dealt)))))
+
+    def test_decks_share_card_objects(self):
+        first, second = Deck(PokerCard), Deck(PokerCard)
+        self.assertEqual({id(card) for card in first.deck}, {id(card) for card in second.deck})
+        self.assertIsNot(PokerCard('S', 'A'), ShortDeckPokerCard('S', 'A'))
+
+    def test_duplicates_collapse(self):
+        self.assertEqual(1, bitmask.count(bitmask.to_mask(["AS", "AS", PokerCard('S', 'A')])))
+
+    def test_flush_and_straight_detection(self):
+        mask = bitmask.to_mask(["2H", "5H", "9H", "JH", "KH", "3S", "4D"])
+        self.assertEqual('H', bitmask.flush_suit(mask))
+        self.assertEqual(3, bitmask.straight_high(bitmask.rank_mask(mask | bitmask.to_mask(["AC"]))))
+        self.assertIsNone(bitmask.straight_high(bitmask.rank_mask(mask)))
+        self.assertEqual(12, bitmask.straight_high(bitmask.rank_mask(bitmask.to_mask(["10S", "JS", "QD", "KC", "AH"]))))
+
+    def test_evaluate_mask_matches_evaluate_cards(self):
+        for _ in range(200):
+            cards = Deck(PokerCard).deal(7)
+            self.assertEqual(evaluate_cards(cards), evaluate_mask(bitmask.to_mask(cards)))
+
+
+class TestPokerVariants(TestCase):
+    def test_omaha_uses_exactly_two_hole_cards(self):
+        board = [PokerCard('H', 2), PokerCard('H', 7), PokerCard('H', 9), PokerCard('H', 'Q'), PokerCard('S', 3)]
+        one_heart = [PokerCard('H', 'A'), PokerCard('S', 'K'), PokerCard('D', 8), PokerCard('C', 4)]
+        self.assertNotEqual('Flush', OMAHA.evaluate(one_heart, board)[0])
+        two_hearts = [PokerCard('H', 'A'), PokerCard('H', 'K'), PokerCard('D', 8), PokerCard('C', 4)]
+        self.assertEqual('Flush', OMAHA.evaluate(two_hearts, board)[0])
+
+    def test_omaha_cannot_play_four_hole_cards(self):
+        hole = [PokerCard('S', 'A'), PokerCard('H', 'A'), PokerCard('D', 'A'), PokerCard('C', 'A')]
+        board = [PokerCard('S', 2), PokerCard('H', 7), PokerCard('D', 9)]
+        self.assertEqual('One Pair', OMAHA.evaluate(hole, board)[0])
+
+    def test_short_deck_flush_beats_full_house(self):
+        board = [ShortDeckPokerCard('H', 6), ShortDeckPokerCard('H', 9), ShortDeckPokerCard('S', 'K')]
+        flush = SHORT_DECK.evaluate([ShortDeckPokerCard('H', 'J'), ShortDeckPokerCard('H', 'Q')],
+                                    board + [ShortDeckPokerCard('H', 7)])
+        full_house = SHORT_DECK.evaluate([ShortDeckPokerCard('D', 'K'), ShortDeckPokerCard('C', 'K')],
+                                         board + [ShortDeckPokerCard('D', 9)])
+        self.assertEqual('Flush', flush[0])
+        self.assertEqual('Full House', full_house[0])
+        self.assertTrue(flush[1] > full_house[1])
+
+    def test_short_deck_ace_plays_below_six(self):
+        hole = [ShortDeckPokerCard('S', 'A'), ShortDeckPokerCard('H', 6)]
+        board = [ShortDeckPokerCard('D', 7), ShortDeckPokerCard('C', 8), ShortDeckPokerCard('S', 9)]
+        self.assertEqual('Straight', SHORT_DECK.evaluate(hole, board)[0])
+
+    def test_short_deck_session_deals_from_36_cards(self):
+        session = Poker(uuid4())
+        self.assertTrue(session.set_variant('short_deck'))
+        self.assertEqual(36, len(session.deck.deck))
+        self.assertFalse(session.set_variant('razz'))
+
+    def test_omaha_round_deals_four_hole_cards(self):
+        session = Poker(uuid4(), OMAHA)
+        for username in ('andy', 'drew'):
+            session.add_player(CustomUser.objects.create_user(username=username))
+        session.start_round()
+        self.assertTrue(all(len(hand.hand) == 4 for hand in session.round.hands.values()))
+        self.assertFalse(session.set_variant('holdem'))
+
+    def test_variant_changes_after_a_finished_hand(self):
+        session = Poker(uuid4())
+        for username in ('andy', 'drew'):
+            session.add_player(CustomUser.objects.create_user(username=username))
+        session.start_round()
+        session.round.evaluate_winner()
+
+        self.assertTrue(session.set_variant('omaha'))
+        session.reset()
+        self.assertIs(OMAHA, session.round.variant)
+        self.assertTrue(all(len(hand.hand) == 4 for hand in session.round.hands.values()))
+
+    def test_spectators_cannot_change_the_variant(self):
+        session_id = POKER_MANAGER.create()
+        player = CustomUser.objects.create_user(username='andy')
+        spectator = CustomUser.objects.create_user(username='drew')
+        POKER_MANAGER.register_user(session_id, player)
+        POKER_MANAGER.register_user(session_id, spectator, spectating=True)
+        request = {'session_id': str(session_id), 'data': {'variant': 'omaha'}}
+
+        self.assertIsNone(PokerUpdater.set_variant(request | {'user': spectator}))
+        self.assertIsNot(OMAHA, POKER_MANAGER.get(session_id).variant)
+        self.assertIsNotNone(PokerUpdater.set_variant(request | {'user': player}))
+        self.assertIs(OMAHA, POKER_MANAGER.get(session_id).variant)
+        POKER_MANAGER.sessions = {}
+
+
 class PokerGameEvaluateWinner(TestCase):
     def setUp(self) -> None:
         self.session = Poker(uuid4())
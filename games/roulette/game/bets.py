@@ -1,212 +1,191 @@
-class Bets:
-    """
-    Class for roulette bets
+from typing import Optional
+
+# Pockets of the wheel, indexed by their bit in a coverage mask
+POCKETS = [str(i) for i in range(0, 37)] + ['00']
+POCKET_INDEX = {pocket: index for index, pocket in enumerate(POCKETS)}
+
+# Bets made on numbers chosen by the player, bets on one of a few named choices, and fixed bets
+NUMBER_BETS = ('single', 'split', 'trio', 'street', 'corner', 'double')
+CHOICE_BETS = ('dozen', 'column', 'color')
+
+
+def pocket_mask(pockets) -> int:
     """
+    Args:
+        pockets: pocket names or indexes
 
-    color_mapper = {i: 'b' if i % 2 == 0 else 'r' for i in range(1, 11)} | \
-                   {i: 'b' if i % 2 == 0 else 'r' for i in range(19, 29)} | \
-                   {i: 'r' if i % 2 == 0 else 'b' for i in range(11, 19)} | \
-                   {i: 'r' if i % 2 == 0 else 'b' for i in range(29, 37)} | \
-                   {0: 'g', -1: None}
-    row_heads = [str(i) for i in range(1, 37, 3)]
+    Returns:
+        the coverage mask with a bit set for every pocket
+    """
+    mask = 0
+    for pocket in pockets:
+        mask |= 1 << (POCKET_INDEX[pocket] if isinstance(pocket, str) else pocket)
+    return mask
 
-    @staticmethod
-    def is_winner(result: int, bet: dict) -> bool:
-        """
-        Checks if the result is considered a bet outcome of the bet
 
-        Args:
-            bet: a dict of keys type and optionally nums if the bet requires user input
-            result: a string of the wheel result
+class CatalogBet:
+    """
+    A legal roulette bet, with the pockets it covers as a coverage mask and how many times the amount bet it pays
+    """
+    __slots__ = ('type', 'mask', 'payout')
 
-        Returns:
-            A boolean value stating if the bet is consider a winner or not
-        """
-        if bet['type'] == 'basket':
-            target_numbers = ['00', '0', '1', '2', '3']
-        elif bet['type'] == 'snake':
-            target_numbers = ['1', '5', '9', '12', '14', '16', '19', '23', '27', '30', '32', '34']
-        elif bet['type'] == 'column':
-            target_numbers = [str(i + int(bet['nums'][0]) - 1) for i in range(1, 35)]
-        elif bet['type'] == 'dozen':
-            if bet['nums'][0] == '1':
-                target_numbers = [str(i) for i in range(1, 13)]
-            elif bet['nums'][0] == '2':
-                target_numbers = [str(i) for i in range(13, 24)]
-            else:
-                target_numbers = [str(i) for i in range(24, 37)]
-        elif bet['type'] == 'color':
-            target_numbers = []
-            for number, color in Bets.color_mapper.items():
-                if color == bet['nums'][0]:
-                    target_numbers.append(number)
-        elif bet['type'] == 'even':
-            target_numbers = [str(i) for i in range(2, 37, 2)]
-        elif bet['type'] == 'odd':
-            target_numbers = [str(i) for i in range(1, 37, 2)]
-        elif bet['type'] == 'low':
-            target_numbers = [str(i) for i in range(1, 19)]
-        elif bet['type'] == 'high':
-            target_numbers = [str(i) for i in range(19, 37)]
-        else:
-            target_numbers = bet['nums']
-        return result in target_numbers
+    def __init__(self, bet_type: str, mask: int, payout: int):
+        self.type = bet_type
+        self.mask = mask
+        self.payout = payout
 
-    @staticmethod
-    def payout_mult(bet: dict) -> int:
+    def covers(self, pocket: str) -> bool:
         """
-        Given a bet dictionary, determine the payout multiplier of the bet
-
         Args:
-            bet: a dict of keys type and optionally nums if the bet requires user input
+            pocket: the name of a pocket
 
         Returns:
-            integer of the payout multiplier depending on the type of bet
+            True if the bet wins when the ball lands in the pocket
         """
-        if bet['type'] == 'single':
-            return 35
-        elif bet['type'] == 'split':
-            return 17
-        elif bet['type'] == 'trio':
-            return 11
-        elif bet['type'] == 'street':
-            return 11
-        elif bet['type'] == 'corner':
-            return 8
-        elif bet['type'] == 'double':
-            return 5
-        elif bet['type'] == 'snake':
-            return 2
-        elif bet['type'] == 'basket':
-            return 6
-        elif bet['type'] == 'column':
-            return 2
-        elif bet['type'] == 'dozen':
-            return 2
-        elif bet['type'] == 'color':
-            return 1
-        elif bet['type'] == 'even' or bet['type'] == 'odd':
-            return 1
-        elif bet['type'] == 'low' or bet['type'] == 'high':
-            return 1
-        raise Exception
+        return pocket in POCKET_INDEX and bool(self.mask >> POCKET_INDEX[pocket] & 1)
 
-    @staticmethod
-    def is_single(bet: dict) -> bool:
-        """
-        Determines if the bet is a valid single bet
 
-        Args:
-            bet: a dict of keys type and nums a an array of user inputs
+class Bets:
+    """
+    Class for roulette bets. Every legal bet is enumerated once into a catalog, keyed by the normalized bet.
+    """
 
-        Returns:
-            Boolean value of whether bet is of type single
-        """
-        return len(bet['nums']) == 1 and bet['nums'][0] in [str(i) for i in range(0, 37)] + ['00']
+    color_mapper = {i: 'b' if i % 2 == 0 else 'r' for i in range(1, 11)} | \
+                   {i: 'b' if i % 2 == 0 else 'r' for i in range(19, 29)} | \
+                   {i: 'r' if i % 2 == 0 else 'b' for i in range(11, 19)} | \
+                   {i: 'r' if i % 2 == 0 else 'b' for i in range(29, 37)} | \
+                   {0: 'g', -1: None}
 
     @staticmethod
-    def is_split(bet: dict) -> bool:
+    def build_catalog() -> dict:
         """
-        Determines if the bet is a valid split bet
-
-        Args:
-            bet: a dict of keys type and nums a an array of user inputs
+        Enumerates every legal bet on the table
 
         Returns:
-            Boolean value of whether bet is of type split
-        """
-        if len(bet['nums']) != 2:
-            return False
-        if '00' in bet['nums']:
-            return '2' in bet['nums'] or '3' in bet['nums'] or '0' in bet['nums']
-        elif '0' in bet['nums']:
-            return '2' in bet['nums'] or '1' in bet['nums']
-        return abs(int(bet['nums'][0]) - int(bet['nums'][1])) == 1 or \
-               abs(int(bet['nums'][0]) - int(bet['nums'][1])) == 3
+            dict of normalized bet key to its CatalogBet
+        """
+        catalog = dict()
+
+        def add(bet_type: str, choice: tuple, pockets, payout: int) -> None:
+            catalog[(bet_type, choice)] = CatalogBet(bet_type, pocket_mask(pockets), payout)
+
+        def add_numbers(bet_type: str, pockets: list, payout: int) -> None:
+            indexes = tuple(sorted(POCKET_INDEX[pocket] if isinstance(pocket, str) else pocket for pocket in pockets))
+            add(bet_type, indexes, indexes, payout)
+
+        heads = range(1, 37, 3)
+        for pocket in POCKETS:
+            add_numbers('single', [pocket], 35)
+        for number in range(1, 37):
+            if number % 3:
+                add_numbers('split', [number, number + 1], 17)
+            if number <= 33:
+                add_numbers('split', [number, number + 3], 17)
+            if number % 3 and number <= 32:
+                add_numbers('corner', [number, number + 1, number + 3, number + 4], 8)
+        for pockets in (['0', '1'], ['0', '2'], ['00', '2'], ['00', '3'], ['0', '00']):
+            add_numbers('split', pockets, 17)
+        for pockets in (['0', '1', '2'], ['00', '2', '3']):
+            add_numbers('trio', pockets, 11)
+        for head in heads:
+            add_numbers('street', range(head, head + 3), 11)
+            if head <= 31:
+                add_numbers('double', range(head, head + 6), 5)
+
+        for choice in range(1, 4):
+            add('dozen', (choice,), range(12 * choice - 11, 12 * choice + 1), 2)
+            add('column', (choice,), range(choice, 37, 3), 2)
+        red = [number for number, color in Bets.color_mapper.items() if color == 'r']
+        black = [number for number, color in Bets.color_mapper.items() if color == 'b']
+        add('color', ('r',), red, 1)
+        add('color', ('b',), black, 1)
+        add('red', (), red, 1)
+        add('black', (), black, 1)
+        add('even', (), range(2, 37, 2), 1)
+        add('odd', (), range(1, 37, 2), 1)
+        add('low', (), range(1, 19), 1)
+        add('high', (), range(19, 37), 1)
+        add('basket', (), ['00', '0', '1', '2', '3'], 6)
+        add('snake', (), [1, 5, 9, 12, 14, 16, 19, 23, 27, 30, 32, 34], 2)
+        return catalog
 
     @staticmethod
-    def is_trio(bet: dict) -> bool:
+    def normalize(bet: dict) -> Optional[tuple]:
         """
-        Determines if the bet is a valid trio bet
+        Turns a bet into its catalog key. Numbers are parsed into sorted pocket indexes, so the order the player entered
+        them in does not matter.
 
         Args:
-            bet: a dict of keys type and nums a an array of user inputs
+            bet: a dict of keys type and optionally nums if the bet requires user input
 
         Returns:
-            Boolean value of whether bet is of type trio
-        """
-        if len(bet['nums']) != 3:
-            return False
-        if '00' in bet['nums']:
-            return '2' in bet['nums'] and '3' in bet['nums']
-        elif '0' in bet['nums']:
-            return '2' in bet['nums'] and '1' in bet['nums']
-        return False
+            the catalog key of the bet, None if its numbers cannot be parsed
+        """
+        nums = [str(num).strip() for num in bet.get('nums') or []]
+        if bet['type'] in NUMBER_BETS:
+            indexes = [POCKET_INDEX.get(num, POCKET_INDEX.get(num.lstrip('0'))) for num in nums]
+            return None if None in indexes else (bet['type'], tuple(sorted(indexes)))
+        if bet['type'] in CHOICE_BETS:
+            if len(nums) != 1:
+                return None
+            return bet['type'], (int(nums[0]) if nums[0].isdigit() else nums[0],)
+        return bet['type'], ()
 
     @staticmethod
-    def is_street(bet: dict) -> bool:
+    def lookup(bet: dict) -> Optional[CatalogBet]:
         """
-        Determines if the bet is a valid street bet
+        Finds a bet in the catalog
 
         Args:
-            bet: a dict of keys type and nums a an array of user inputs
+            bet: a dict of keys type and optionally nums if the bet requires user input
 
         Returns:
-            Boolean value of whether bet is of type street
+            the CatalogBet, None if the bet is not a legal bet
         """
-        if len(bet['nums']) != 3:
-            return False
-        min_val = min([int(i) for i in bet['nums']])
-        return str(min_val) in Bets.row_heads and str(min_val + 1) in bet['nums'] and str(min_val + 2) in bet['nums']
+        key = Bets.normalize(bet)
+        return None if key is None else BET_CATALOG.get(key)
 
     @staticmethod
-    def is_corner(bet: dict) -> bool:
+    def is_valid(bet: dict) -> bool:
         """
-        Determines if the bet is a valid corner bet
-
         Args:
-            bet: a dict of keys type and nums a an array of user inputs
+            bet: a dict of keys type and optionally nums if the bet requires user input
 
         Returns:
-            Boolean value of whether bet is of type corner
+            Boolean value of whether the bet is a legal bet
         """
-        if len(bet['nums']) != 4:
-            return False
-        min_val = min([int(i) for i in bet['nums']])
-        return str(min_val + 1) in bet['nums'] and str(min_val + 3) in bet['nums'] and str(min_val + 4) in bet['nums']
+        return Bets.lookup(bet) is not None
 
     @staticmethod
-    def is_double(bet: dict) -> bool:
+    def is_winner(result: str, bet: dict) -> bool:
         """
-        Determines if the bet is a valid double street bet
+        Checks if the result is considered a bet outcome of the bet
 
         Args:
-            bet: a dict of keys type and nums a an array of user inputs
+            bet: a dict of keys type and optionally nums if the bet requires user input
+            result: a string of the wheel result
 
         Returns:
-            Boolean value of whether bet is of type double street
+            A boolean value stating if the bet is consider a winner or not
         """
-        if len(bet['nums']) != 6:
-            return False
-        min_val = min([int(i) for i in bet['nums']])
-        return str(min_val) in Bets.row_heads and not any([(min_val + 1) not in bet['nums'] for i in range(1, 6)])
+        entry = Bets.lookup(bet)
+        return entry is not None and entry.covers(str(result))
 
     @staticmethod
-    def is_dozen_or_col(bet: dict) -> bool:
+    def payout_mult(bet: dict) -> int:
         """
-        Determines if the bet is a valid dozen or column bet since they use the same format
+        Given a bet dictionary, determine the payout multiplier of the bet
 
         Args:
-            bet: a dict of keys type and nums a an array of user inputs
+            bet: a dict of keys type and optionally nums if the bet requires user input
 
         Returns:
-            Boolean value of whether bet is of type dozen or column
+            integer of the payout multiplier depending on the type of bet
         """
-        if len(bet['nums']) != 1:
-            return False
-        return bet['nums'][0] in [str(i) for i in range(1, 4)]
-
-    BET_CHECKER = {'single': is_single.__func__, 'split': is_split.__func__,
-                   'trio': is_trio.__func__, 'street': is_street.__func__,
-                   'corner': is_corner.__func__, 'double': is_double.__func__,
-                   'dozen': is_dozen_or_col.__func__, 'column': is_dozen_or_col.__func__}
+        entry = Bets.lookup(bet)
+        if entry is None:
+            raise ValueError('Not a legal bet: {}'.format(bet))
+        return entry.payout
+
+
+BET_CATALOG = Bets.build_catalog()
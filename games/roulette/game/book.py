@@ -0,0 +1,91 @@
+from typing import Hashable
+
+import numpy as np
+
+from games.roulette.game.bets import CatalogBet
+
+
+class BetBook:
+    """
+    Every chip on the roulette table, held as parallel arrays of the player who placed it, the coverage mask and
+    payout of its bet and its stake, so a spin is settled for the whole table at once
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.players = []
+        self.index = dict()
+        self.size = 0
+        self.player = np.zeros(capacity, dtype=np.int64)
+        self.mask = np.zeros(capacity, dtype=np.uint64)
+        self.returns = np.zeros(capacity)
+        self.stake = np.zeros(capacity)
+
+    def add(self, player: Hashable, bet: CatalogBet, stake: float) -> None:
+        """
+        Places a chip on the table
+
+        Args:
+            player: the player placing the chip
+            bet: the catalog entry of the bet
+            stake: the amount bet
+        """
+        if player not in self.index:
+            self.index[player] = len(self.players)
+            self.players.append(player)
+        if self.size == len(self.stake):
+            self.grow()
+
+        self.player[self.size] = self.index[player]
+        self.mask[self.size] = bet.mask
+        self.returns[self.size] = bet.payout + 1
+        self.stake[self.size] = stake
+        self.size += 1
+
+    def grow(self) -> None:
+        """
+        Doubles the room for chips, so placing a chip costs amortized constant time
+        """
+        capacity = 2 * len(self.stake)
+        for name in ('player', 'mask', 'returns', 'stake'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, name, grown)
+
+    def remove_player(self, player: Hashable) -> None:
+        """
+        Takes a player's chips off the table
+
+        Args:
+            player: the player leaving
+        """
+        if player not in self.index:
+            return
+        keep = np.flatnonzero(self.player[:self.size] != self.index[player])
+        for array in (self.player, self.mask, self.returns, self.stake):
+            array[:len(keep)] = array[keep]
+        self.size = len(keep)
+
+    def clear(self) -> None:
+        """
+        Takes every chip off the table
+        """
+        self.players = []
+        self.index = dict()
+        self.size = 0
+
+    def settle(self, pocket: int) -> dict:
+        """
+        Pays out every chip on the table for a spin in one pass over the arrays
+
+        Args:
+            pocket: index of the pocket the ball landed in
+
+        Returns:
+            dict of each player with chips on the table to the total paid back to them, stakes of winning chips included
+        """
+        size = self.size
+        hits = (self.mask[:size] >> np.uint64(pocket)) & np.uint64(1)
+        paid = np.bincount(self.player[:size], weights=self.stake[:size] * self.returns[:size] * hits,
+                           minlength=len(self.players))
+        return dict(zip(self.players, paid.tolist()))
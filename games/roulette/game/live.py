@@ -0,0 +1,158 @@
+from threading import Event, Lock, Thread
+from typing import Callable
+
+from accounts.models import CustomUser
+from games.roulette.game.bets import POCKET_INDEX, CatalogBet
+from games.roulette.game.book import BetBook
+from games.roulette.game.wheel import Wheel
+
+LIVE_SPIN_INTERVAL = 30.0
+
+
+class LiveWheel:
+    """
+    A single server driven roulette wheel shared by every subscribed table. Chips from all of the tables go into one bet
+    book, and the wheel spins on a fixed schedule, settling the book once and writing every balance in one transaction.
+    """
+
+    def __init__(self, interval: float = LIVE_SPIN_INTERVAL):
+        self.interval = interval
+        self.wheel = None
+        self.book = BetBook()
+        self.tables = dict()
+        self.lock = Lock()
+        self.stopped = Event()
+        self.thread = None
+        self.callbacks = dict()
+
+    def subscribe(self, table, callback: Callable = None) -> None:
+        """
+        Seats a roulette table at the wheel, starting the spin schedule if it is not already running
+
+        Args:
+            table: the Roulette session to settle with every spin
+            callback: optional function to call after each spin the table takes part in, with the table and its
+                      dictionary representation once settled
+        """
+        with self.lock:
+            self.tables[table.id] = table
+            if self.wheel is None:
+                self.wheel = Wheel()
+            if callback is not None:
+                self.callbacks[table.id] = callback
+            if self.thread is None:
+                self.stopped = Event()
+                self.thread = Thread(target=self.run, args=(self.stopped,), daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self, table) -> None:
+        """
+        Takes a table and its chips away from the wheel, stopping the spin schedule once no tables are left
+
+        Args:
+            table: the Roulette session leaving
+        """
+        with self.lock:
+            self.callbacks.pop(table.id, None)
+            if self.tables.pop(table.id, None) is None:
+                return
+            for player in list(table.players):
+                self.book.remove_player((table.id, player))
+            if not self.tables:
+                self.stop()
+
+    def place(self, table, player: CustomUser, bet: CatalogBet, amount: float, bet_type: dict) -> bool:
+        """
+        Places a chip from one of the tables in the shared bet book and tallies it at the table, so a spin never settles
+        a chip the table has not recorded. The chip is refused unless the player's balance covers it on top of
+        everything they have bet at every table on the wheel
+
+        Args:
+            table: the Roulette session the player is seated at
+            player: the player placing the chip
+            bet: the catalog entry of the bet
+            amount: the amount bet
+            bet_type: the bet type and corresponding arguments
+
+        Returns:
+            boolean value if the chip was placed
+        """
+        with self.lock:
+            staked = sum(seated.bet_amount.get(player, 0.0) for seated in self.tables.values())
+            if amount <= 0 or staked + amount > player.current_balance:
+                return False
+            self.book.add((table.id, player), bet, amount)
+            table.tally_bet(player, amount, bet_type)
+            return True
+
+    def remove_player(self, table, player: CustomUser) -> None:
+        """
+        Takes a player's chips off the shared bet book
+
+        Args:
+            table: the Roulette session the player is leaving
+            player: the player leaving
+        """
+        with self.lock:
+            self.book.remove_player((table.id, player))
+
+    def run(self, stopped: Event) -> None:
+        """
+        Spins the wheel every interval until stopped
+
+        Args:
+            stopped: the event that ends this schedule
+        """
+        while not stopped.wait(self.interval):
+            self.spin()
+
+    def stop(self) -> None:
+        """
+        Stops the spin schedule
+        """
+        self.stopped.set()
+        self.thread = None
+
+    def spin(self) -> dict:
+        """
+        Spins the wheel once, settles the whole bet book for the result, writes every balance change in one transaction
+        and then starts a fresh round on every table. A player whose balance no longer covers their losses has their bets
+        voided on every table: they are paid back their stake and their balance is left as it is. The callbacks are
+        called with each table's settled state after the lock is released, so broadcasting the results never holds up
+        new bets.
+
+        Returns:
+            dict of each (table id, player) with chips on the wheel to the total paid back to them
+        """
+        with self.lock:
+            self.wheel.stage = 'ready'
+            self.wheel.roll()
+            payouts = self.book.settle(POCKET_INDEX[str(self.wheel.result)])
+            tables = list(self.tables.values())
+            updates = dict()
+            for table in tables:
+                for player in list(table.players):
+                    paid = payouts.get((table.id, player), 0.0)
+                    table.payout[player] = paid
+                    updates[player] = updates.get(player, 0.0) + paid - table.bet_amount.get(player, 0.0)
+                table.wheel.result = self.wheel.result
+                table.wheel.stage = 'ending'
+            voided = [player for player, paid in CustomUser.update_balances(updates).items() if not paid]
+            for table in tables:
+                for player in voided:
+                    if table.bet_amount.get(player):
+                        table.payout[player] = payouts[(table.id, player)] = table.bet_amount[player]
+
+            settled = [(self.callbacks[table.id], table, table.dict_representation()) for table in tables
+                       if table.id in self.callbacks]
+            for table in tables:
+                table.reset_bets()
+            self.book.clear()
+            self.wheel = Wheel(self.wheel.rng)
+
+        for callback, table, representation in settled:
+            callback(table, representation)
+        return payouts
+
+
+LIVE_WHEEL = LiveWheel()
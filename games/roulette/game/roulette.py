@@ -1,9 +1,12 @@
 from json import dumps
+from typing import Callable
 from uuid import UUID
 
 from accounts.models import CustomUser
 from games.base import Game
-from games.roulette.game.bets import Bets
+from games.roulette.game.bets import POCKET_INDEX, Bets
+from games.roulette.game.book import BetBook
+from games.roulette.game.live import LIVE_WHEEL, LiveWheel
 from games.roulette.game.wheel import Wheel
 
 
@@ -17,13 +20,18 @@ class Roulette(Game):
         self.bet_amount = {player: 0.0 for player in self.players}
         self.bet_type = {player: None for player in self.players}
         self.payout = {player: 0.0 for player in self.players}
-        self.wheel = Wheel()
+        self.book = BetBook()
+        self.wheel = Wheel(self.rng)
+        self.live = None
 
     def record_bet(self, player: CustomUser, amount: float, bet_type: dict) -> bool:
         """
-        Takes a player and the amount and the type of bet they're betting and recording it in the respective
-        dictionaries. Will check if it's a valid bet before recording the bet and return if the recording is successful
-        Will set the wheel stage to be ready if all players are ready
+        Takes a player and the amount and the type of bet they're betting and places it in the bet book. Players can
+        place as many bets as they like, bet_amount keeps the total they have bet and bet_type every bet they made.
+        Will check if it's a valid bet the player's balance covers before recording the bet and return if the recording
+        is successful
+        Will set the wheel stage to be ready if all players are ready. At a live table the bet goes into the shared
+        live wheel's bet book instead
 
         Args:
             player: a CustomUser in the session
@@ -33,18 +41,46 @@ class Roulette(Game):
         Returns:
             boolean value if the record is successful
         """
-        if Roulette.check_bet_valid(bet_type):
-            self.bet_amount[player] = amount
-            self.bet_type[player] = bet_type
+        bet = Bets.lookup(bet_type)
+        if bet is not None and self.live is not None:
+            return self.live.place(self, player, bet, amount, bet_type)
+        if bet is not None and self.can_cover(player, amount):
+            self.book.add(player, bet, amount)
+            self.tally_bet(player, amount, bet_type)
             if self.all_ready():
                 self.wheel.stage = 'ready'
             return True
         return False
 
+    def can_cover(self, player: CustomUser, amount: float) -> bool:
+        """
+        Checks if a player's balance covers everything they have bet at the table plus another chip
+
+        Args:
+            player: a CustomUser in the session
+            amount: amount of the new chip
+
+        Returns:
+            boolean value of whether the chip can be placed
+        """
+        return amount > 0 and self.bet_amount[player] + amount <= player.current_balance
+
+    def tally_bet(self, player: CustomUser, amount: float, bet_type: dict):
+        """
+        Adds a placed bet to the player's total bet and list of bets
+
+        Args:
+            player: a CustomUser in the session
+            amount: bet amount
+            bet_type: the bet type and corresponding arguments
+        """
+        self.bet_amount[player] += amount
+        self.bet_type[player] = (self.bet_type[player] or []) + [bet_type]
+
     @staticmethod
     def check_bet_valid(bet_type: dict) -> bool:
         """
-        Checks if bet_type is a valid bet
+        Checks if bet_type is a valid bet by looking it up in the bet catalog
 
         Args:
             bet_type: a dict with key type and optionally nums
@@ -52,17 +88,48 @@ class Roulette(Game):
         Returns:
             boolean value of whether bet is valid
         """
-        return bet_type['type'] in ['snake', 'even', 'odd', 'low', 'high', 'basket', 'red', 'black'] or \
-               (bet_type['type'] in Bets.BET_CHECKER and Bets.BET_CHECKER[bet_type['type']](bet_type))
+        return Bets.is_valid(bet_type)
 
-    def reset(self):
+    def join_live(self, live: LiveWheel = LIVE_WHEEL, callback: Callable = None):
         """
-        Resets the roulette session by wiping all the records clean
+        Moves the table to a shared live wheel, which spins on its own schedule and settles this table along with
+        every other subscribed table. Bets already placed at the table are dropped.
+
+        Args:
+            live: the live wheel to join
+            callback: optional function to call after each live spin, with the table and its settled dictionary
+                      representation
+        """
+        if self.live is None:
+            self.reset()
+            self.live = live
+            live.subscribe(self, callback)
+
+    def leave_live(self):
+        """
+        Moves the table back to its own wheel, taking its chips off the live wheel
+        """
+        if self.live is not None:
+            self.live.unsubscribe(self)
+            self.live = None
+            self.reset()
+
+    def reset_bets(self):
         """
-        self.wheel = Wheel()
+        Clears every player's bets to start a new betting round, keeping the wheel and payouts of the last spin
+        """
+        self.book.clear()
         for player in self.players:
             self.bet_amount[player] = 0
             self.bet_type[player] = None
+
+    def reset(self):
+        """
+        Resets the roulette session by wiping all the records clean
+        """
+        self.wheel = Wheel(self.rng)
+        self.reset_bets()
+        for player in self.players:
             self.payout[player] = 0
 
     def remove_player(self, player: CustomUser):
@@ -74,11 +141,15 @@ class Roulette(Game):
             
         """
         if player in self.players:
+            if self.live is not None:
+                self.live.remove_player(self, player)
             self.bet_amount.pop(player)
             self.bet_type.pop(player)
             self.payout.pop(player)
+            self.book.remove_player(player)
             self.players.remove(player)
             if len(self.players) == 0:
+                self.leave_live()
                 self.reset()
 
     def add_player(self, player: CustomUser):
@@ -105,8 +176,11 @@ class Roulette(Game):
 
     def start_round(self):
         """
-        Checks if everyone is ready and then begin rolling the wheel and record player payouts
+        Checks if everyone is ready and then begin rolling the wheel and record player payouts. Live tables are spun by
+        the live wheel instead
         """
+        if self.live is not None:
+            return
         if self.all_ready():
             self.wheel.stage = 'ready'
         self.wheel.roll()
@@ -115,18 +189,23 @@ class Roulette(Game):
 
     def find_payout(self):
         """
-        If the wheel has been spun, calculate the payout for everyone including winners and losers
+        If the wheel has been spun, settle the bet book to calculate the payout for everyone including winners and
+        losers
         """
         if self.wheel.stage == 'ending':
+            payouts = self.book.settle(POCKET_INDEX[str(self.wheel.result)])
             for player in self.payout:
-                self.payout[player] = self.wheel.payout(self.bet_amount[player], self.bet_type[player])
+                self.payout[player] = payouts.get(player, 0.0)
 
     def player_payout(self):
         """
-        Updates each user's balance according to their payout
+        Updates each user's balance according to their payout, less everything they bet. If a player's balance no
+        longer covers their losses, their bets are void: the payout is set back to their stake and the balance is left
+        as it is
         """
         for player in self.payout:
-            player.update_balance(self.payout[player] - self.bet_amount[player])
+            if not player.update_balance(self.payout[player] - self.bet_amount[player]):
+                self.payout[player] = self.bet_amount[player]
 
     def dict_representation(self) -> dict:
         """
@@ -142,4 +221,5 @@ class Roulette(Game):
                              'payout': str(self.payout[player])
                              } for player in self.players],
                 "spectating": [spectator.username for spectator in self.spectating],
+                "live": self.live is not None,
                 } | wheel_dict
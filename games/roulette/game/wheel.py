@@ -1,24 +1,24 @@
-from numpy.random import randint
-
-from games.roulette.game.bets import Bets
+from games.roulette.game.bets import POCKETS, Bets
+from utils.rng import RNG_SERVICE, RandomStream
 
 
 class Wheel:
     """
     Class for roulette wheel
     """
-    wheel = [str(i) for i in range(0, 37)] + ['00']
+    wheel = POCKETS
 
-    def __init__(self):
+    def __init__(self, rng: RandomStream = None):
         self.result = -1
         self.stage = 'betting'
+        self.rng = RNG_SERVICE.stream() if rng is None else rng
 
     def roll(self):
         """
         Spins the wheel if the wheel is ready and finds a number in the wheel
         """
         if self.stage == 'ready':
-            self.result = Wheel.wheel[randint(0, 37, size=1)[0]]
+            self.result = Wheel.wheel[self.rng.pocket(37)]
             self.stage = 'ending'
 
     def get_stage(self) -> str:
@@ -49,4 +49,5 @@ class Wheel:
         Returns:
             float amount of the payout
         """
-        return (Bets.payout_mult(bet) + 1) * amount if Bets.is_winner(self.result, bet) else 0.0
+        entry = Bets.lookup(bet)
+        return (entry.payout + 1) * amount if entry is not None and entry.covers(str(self.result)) else 0.0
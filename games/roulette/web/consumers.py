@@ -1,5 +1,8 @@
 from uuid import UUID
 
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
 from games.base import ConsumerUpdater, GameConsumer
 from games.roulette.web.views import ROULETTE_MANAGER
 
@@ -48,7 +51,52 @@ class RouletteUpdater(ConsumerUpdater):
                 'data': game_instance.dict_representation()
                 }
 
-    FUNCTION_MAP = {'place_bet': place_bet.__func__, 'play': play.__func__}
+    @staticmethod
+    def join_live(request_data: dict):
+        """
+        Moves the session to the shared live wheel. After every scheduled spin, each connection in the session is sent
+        the settled game
+
+        Args:
+            request_data: the request dictionary
+
+        Returns:
+            the full dictionary representation of the game
+        """
+        game_instance = ROULETTE_MANAGER.get(UUID(request_data['session_id']))
+
+        def broadcast(table, representation: dict) -> None:
+            async_to_sync(get_channel_layer().group_send)(str(table.id), {
+                'type': 'send_message',
+                'data': {'type': 'load_game', 'data': representation}
+            })
+
+        game_instance.join_live(callback=broadcast)
+
+        return {'type': 'load_game',
+                'data': game_instance.dict_representation()
+                }
+
+    @staticmethod
+    def leave_live(request_data: dict):
+        """
+        Moves the session back to its own wheel
+
+        Args:
+            request_data: the request dictionary
+
+        Returns:
+            the full dictionary representation of the game
+        """
+        game_instance = ROULETTE_MANAGER.get(UUID(request_data['session_id']))
+        game_instance.leave_live()
+
+        return {'type': 'load_game',
+                'data': game_instance.dict_representation()
+                }
+
+    FUNCTION_MAP = {'place_bet': place_bet.__func__, 'play': play.__func__, 'join_live': join_live.__func__,
+                    'leave_live': leave_live.__func__}
 
 
 class RouletteConsumer(GameConsumer):
@@ -60,3 +108,15 @@ class RouletteConsumer(GameConsumer):
         super().__init__(*args, **kwargs)
         self.game_manager = ROULETTE_MANAGER
         self.updater = RouletteUpdater
+
+    def disconnect(self, code: int) -> None:
+        """
+        Handles removing a user from the game, taking the session off the live wheel if it was deleted
+
+        Args:
+            code: exit code
+        """
+        game_instance = self.game_manager.get(UUID(self.session_id))
+        super().disconnect(code)
+        if game_instance is not None and not self.game_manager.session_exists(UUID(self.session_id)):
+            game_instance.leave_live()
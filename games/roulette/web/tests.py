@@ -1,9 +1,13 @@
+from collections import Counter
 from uuid import uuid4
 
 from django.contrib import auth
 from django.test import TestCase
 
 from accounts.models import CustomUser
+from games.roulette.game.bets import BET_CATALOG, POCKET_INDEX, POCKETS, Bets
+from games.roulette.game.book import BetBook
+from games.roulette.game.live import LiveWheel
 from games.roulette.web.views import ROULETTE_MANAGER
 
 
@@ -95,6 +99,25 @@ class TestRouletteGame(TestCase):
         self.assertTrue(self.game.bet_amount[self.user] == 100)
         self.assertTrue(self.game.bet_type[self.user])
 
+    def test_recording_bet_over_balance(self):
+        self.assertTrue(self.game.record_bet(self.user, 200, {'type': 'odd'}))
+        self.assertFalse(self.game.record_bet(self.user, 101, {'type': 'even'}))
+        self.assertFalse(self.game.record_bet(self.user, -10, {'type': 'even'}))
+        self.assertEqual(200, self.game.bet_amount[self.user])
+        self.assertEqual(1, self.game.book.size)
+
+    def test_payout_voids_bets_balance_no_longer_covers(self):
+        self.game.record_bet(self.user, 100.0, {'type': 'odd'})
+        self.user.update_balance(-250)
+        self.game.wheel.result = '2'
+        self.game.wheel.stage = 'ending'
+        self.game.find_payout()
+        self.game.player_payout()
+        self.user.refresh_from_db()
+
+        self.assertEqual(100.0, self.game.payout[self.user])
+        self.assertEqual(50, self.user.current_balance)
+
     def test_reset(self):
         self.game.reset()
         self.assertTrue(self.game.bet_amount[self.user] == 0)
@@ -125,14 +148,34 @@ class TestRouletteGame(TestCase):
         self.assertNotEqual(self.game.wheel.result, -1)
 
     def test_find_payout(self):
+        self.game.record_bet(self.user, 10.0, {'type': 'odd'})
         self.game.wheel.result = '1'
         self.game.wheel.stage = 'ending'
-        self.game.bet_amount[self.user] = 10.0
-        self.game.bet_type[self.user] = {'type': 'odd'}
         self.game.find_payout()
 
         self.assertEqual(self.game.payout[self.user], 20.0)
 
+    def test_multiple_bets_settle_together(self):
+        self.game.record_bet(self.user, 10.0, {'type': 'odd'})
+        self.game.record_bet(self.user, 5.0, {'type': 'single', 'nums': ['1']})
+        self.game.record_bet(self.user, 20.0, {'type': 'even'})
+        self.assertEqual(35.0, self.game.bet_amount[self.user])
+        self.assertEqual(3, len(self.game.bet_type[self.user]))
+
+        self.game.wheel.result = '1'
+        self.game.wheel.stage = 'ending'
+        self.game.find_payout()
+        self.game.player_payout()
+        self.user.refresh_from_db()
+
+        self.assertEqual(200.0, self.game.payout[self.user])
+        self.assertEqual(465, self.user.current_balance)
+
+    def test_reset_clears_the_book(self):
+        self.game.record_bet(self.user, 10.0, {'type': 'odd'})
+        self.game.reset()
+        self.assertEqual(0, self.game.book.size)
+
     def test_check_bet_valid(self):
         self.assertTrue(self.game.check_bet_valid({'type': 'odd'}))
         self.assertTrue(self.game.check_bet_valid({'type': 'single', 'nums': ['0']}))
@@ -161,6 +204,175 @@ class TestWheel(TestCase):
         self.assertEqual(self.game.wheel.payout(10, {'type': 'even'}), 0)
         self.assertEqual(self.game.wheel.payout(10, {'type': 'odd'}), 20)
 
+
+class TestRouletteBetCatalog(TestCase):
+    """
+    Test cases for the precompiled roulette bet catalog
+    """
+
+    def test_catalog_counts(self):
+        expected = {'single': 38, 'split': 62, 'trio': 2, 'street': 12, 'corner': 22, 'double': 11, 'dozen': 3,
+                    'column': 3, 'color': 2}
+        counts = Counter(bet_type for bet_type, _ in BET_CATALOG)
+        self.assertEqual(expected, {bet_type: counts[bet_type] for bet_type in expected})
+
+    def test_number_order_does_not_matter(self):
+        self.assertIs(Bets.lookup({'type': 'corner', 'nums': ['5', '1', '4', '2']}),
+                      Bets.lookup({'type': 'corner', 'nums': ['1', '2', '4', '5']}))
+
+    def test_illegal_bets(self):
+        for bet in [{'type': 'split', 'nums': ['3', '4']}, {'type': 'corner', 'nums': ['3', '4', '6', '7']},
+                    {'type': 'single', 'nums': ['37']}, {'type': 'street', 'nums': ['2', '3', '4']},
+                    {'type': 'dozen', 'nums': ['4']}, {'type': 'split', 'nums': ['a', '1']}]:
+            self.assertFalse(Bets.is_valid(bet), bet)
+
+    def test_outside_bets_cover_the_right_pockets(self):
+        self.assertTrue(Bets.is_winner('24', {'type': 'dozen', 'nums': ['2']}))
+        self.assertFalse(Bets.is_winner('24', {'type': 'dozen', 'nums': ['3']}))
+        self.assertTrue(Bets.is_winner('7', {'type': 'column', 'nums': ['1']}))
+        self.assertFalse(Bets.is_winner('8', {'type': 'column', 'nums': ['1']}))
+        self.assertTrue(Bets.is_winner('36', {'type': 'red', 'nums': []}))
+        self.assertTrue(Bets.is_winner('35', {'type': 'color', 'nums': ['b']}))
+        self.assertFalse(Bets.is_winner('0', {'type': 'even'}))
+
+    def test_payouts_pay_for_36_pockets(self):
+        for (bet_type, _), entry in BET_CATALOG.items():
+            if bet_type != 'basket':
+                covered = sum(entry.covers(pocket) for pocket in POCKETS)
+                self.assertEqual(36, (entry.payout + 1) * covered, bet_type)
+
+    def test_payout_mult(self):
+        self.assertEqual(8, Bets.payout_mult({'type': 'corner', 'nums': ['1', '2', '4', '5']}))
+        with self.assertRaises(ValueError):
+            Bets.payout_mult({'type': 'corner', 'nums': ['1']})
+
+    def test_wheel_payout_for_double_zero(self):
+        wheel = ROULETTE_MANAGER.get(ROULETTE_MANAGER.create()).wheel
+        wheel.result = '00'
+        self.assertEqual(36, wheel.payout(1, {'type': 'single', 'nums': ['00']}))
+        self.assertEqual(0, wheel.payout(1, {'type': 'single', 'nums': ['0']}))
+        ROULETTE_MANAGER.sessions = {}
+
+
+class TestRouletteBetBook(TestCase):
+    """
+    Test cases for settling many bets per player with the bet book
+    """
+
+    def test_settles_every_player(self):
+        book = BetBook(capacity=2)
+        for player in range(50):
+            for chip in range(30):
+                book.add(player, Bets.lookup({'type': 'single', 'nums': [str(chip)]}), 1.0)
+        self.assertEqual(1500, book.size)
+
+        paid = book.settle(POCKET_INDEX['7'])
+        self.assertEqual(50, len(paid))
+        self.assertTrue(all(value == 36.0 for value in paid.values()))
+        self.assertEqual({0.0}, set(book.settle(POCKET_INDEX['00']).values()))
+
+    def test_remove_player_takes_their_chips(self):
+        book = BetBook()
+        book.add('a', Bets.lookup({'type': 'red'}), 10.0)
+        book.add('b', Bets.lookup({'type': 'red'}), 20.0)
+        book.add('a', Bets.lookup({'type': 'black'}), 10.0)
+        book.remove_player('a')
+        self.assertEqual(1, book.size)
+        self.assertEqual({'a': 0.0, 'b': 40.0}, book.settle(POCKET_INDEX['1']))
+
+
+class TestLiveWheel(TestCase):
+    """
+    Test cases for settling many tables with one shared live wheel spin
+    """
+
+    def setUp(self) -> None:
+        self.live = LiveWheel(interval=3600)
+        self.users = [CustomUser.objects.create_user(username='user{}'.format(index), password='pass',
+                                                     current_balance=100) for index in range(4)]
+        self.tables = []
+        for users in (self.users[:2], self.users[2:]):
+            table = ROULETTE_MANAGER.get(ROULETTE_MANAGER.create())
+            for user in users:
+                table.add_player(user)
+            table.join_live(self.live)
+            self.tables.append(table)
+
+    def tearDown(self) -> None:
+        self.live.stop()
+        ROULETTE_MANAGER.sessions = {}
+
+    def test_bets_go_into_the_shared_book(self):
+        self.tables[0].record_bet(self.users[0], 10.0, {'type': 'red'})
+        self.tables[1].record_bet(self.users[2], 10.0, {'type': 'black'})
+        self.assertEqual(2, self.live.book.size)
+        self.assertEqual(0, self.tables[0].book.size)
+
+    def test_spin_settles_every_table(self):
+        for table, user in ((self.tables[0], self.users[0]), (self.tables[1], self.users[2])):
+            for pocket in POCKETS:
+                table.record_bet(user, 1.0, {'type': 'single', 'nums': [pocket]})
+        self.live.spin()
+
+        self.assertEqual(['ending', 'ending'], [table.wheel.stage for table in self.tables])
+        self.assertEqual(self.tables[0].wheel.result, self.tables[1].wheel.result)
+        for user in (self.users[0], self.users[2]):
+            user.refresh_from_db()
+            self.assertEqual(98, user.current_balance)
+        self.users[1].refresh_from_db()
+        self.assertEqual(100, self.users[1].current_balance)
+        self.assertEqual(0, self.live.book.size)
+        self.assertEqual(0, self.tables[0].bet_amount[self.users[0]])
+
+    def test_callbacks_run_per_table_after_the_lock_is_released(self):
+        calls = []
+
+        def callback(table, representation: dict) -> None:
+            self.assertTrue(self.live.lock.acquire(blocking=False))
+            self.live.lock.release()
+            calls.append((table, representation))
+
+        self.tables[0].leave_live()
+        self.tables[0].join_live(self.live, callback)
+        self.tables[0].record_bet(self.users[0], 10.0, {'type': 'red'})
+        self.live.spin()
+
+        self.assertEqual([self.tables[0]], [table for table, _ in calls])
+        players = {player['player']: player for player in calls[0][1]['players']}
+        self.assertEqual('10.0', players['user0']['amount'])
+        self.assertEqual(0, self.tables[0].bet_amount[self.users[0]])
+
+    def test_live_bets_must_be_covered_across_tables(self):
+        self.tables[0].add_player(self.users[2])
+        self.assertTrue(self.tables[0].record_bet(self.users[2], 60.0, {'type': 'red'}))
+        self.assertFalse(self.tables[1].record_bet(self.users[2], 50.0, {'type': 'black'}))
+        self.assertTrue(self.tables[1].record_bet(self.users[2], 40.0, {'type': 'black'}))
+        self.assertEqual(2, self.live.book.size)
+
+    def test_spin_voids_bets_balance_no_longer_covers(self):
+        for pocket in POCKETS:
+            self.tables[0].record_bet(self.users[0], 1.0, {'type': 'single', 'nums': [pocket]})
+        CustomUser.objects.filter(pk=self.users[0].pk).update(current_balance=1)
+        payouts = self.live.spin()
+
+        self.users[0].refresh_from_db()
+        self.assertEqual(1, self.users[0].current_balance)
+        self.assertEqual(len(POCKETS), payouts[(self.tables[0].id, self.users[0])])
+
+    def test_play_does_not_spin_a_live_table(self):
+        self.tables[0].record_bet(self.users[0], 10.0, {'type': 'red'})
+        self.tables[0].record_bet(self.users[1], 10.0, {'type': 'red'})
+        self.tables[0].start_round()
+        self.assertEqual(-1, self.tables[0].wheel.result)
+
+    def test_leave_live_takes_chips_off_the_wheel(self):
+        self.tables[0].record_bet(self.users[0], 10.0, {'type': 'red'})
+        self.tables[1].record_bet(self.users[2], 10.0, {'type': 'red'})
+        self.tables[0].leave_live()
+        self.assertEqual(1, self.live.book.size)
+        self.assertIsNone(self.tables[0].live)
+
+
 # class TestRouletteWebSocket(TestCase):
 #     def setUp(self) -> None:
 #         self.user = CustomUser.objects.create_user(username='user', password='pass', current_balance=1000)
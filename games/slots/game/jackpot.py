@@ -0,0 +1,165 @@
+import time
+from itertools import count
+from threading import Lock, local
+
+from django.db import transaction
+from django.db.models import F
+
+from accounts.models import CustomUser
+from games.slots.models import JackpotPool
+
+# Share of every bet paid into the jackpot, chance of a spin winning it and the amount it restarts from once won
+JACKPOT_RATE = .01
+JACKPOT_CHANCE = .00001
+JACKPOT_SEED = 1000.0
+
+# Seconds between writes of the pending contributions, and the most a displayed amount can lag the database
+JACKPOT_FLUSH_INTERVAL = 5.0
+JACKPOT_STALENESS = 2.0
+
+COUNTER_SHARDS = 16
+
+
+class ShardedCounter:
+    """
+    A running total split across shards, each with its own lock. Every thread is given its own shard, in turn, the
+    first time it adds, so concurrent spinners rarely wait on each other, and draining the counter sums and zeroes
+    every shard.
+    """
+
+    def __init__(self, shards: int = COUNTER_SHARDS):
+        self.locks = [Lock() for _ in range(shards)]
+        self.values = [0.0] * shards
+        self.next_shard = count()
+        self.thread_shard = local()
+
+    def add(self, amount: float) -> None:
+        """
+        Args:
+            amount: the amount to add
+        """
+        shard = getattr(self.thread_shard, 'index', None)
+        if shard is None:
+            shard = self.thread_shard.index = next(self.next_shard) % len(self.values)
+        with self.locks[shard]:
+            self.values[shard] += amount
+
+    def total(self) -> float:
+        """
+        Returns:
+            the current total, read without taking the locks
+        """
+        return sum(self.values)
+
+    def drain(self) -> float:
+        """
+        Returns:
+            the total, resetting every shard to zero
+        """
+        drained = 0.0
+        for shard, lock in enumerate(self.locks):
+            with lock:
+                drained += self.values[shard]
+                self.values[shard] = 0.0
+        return drained
+
+
+class ProgressiveJackpot:
+    """
+    A jackpot pool shared by every slots session. Contributions collect in a sharded in-process counter and are added
+    to the pool's database row in one write every flush interval. Every process keeps its own counter, so the
+    database row is the sum of all flushed contributions.
+    """
+
+    def __init__(self, name: str = 'slots', rate: float = JACKPOT_RATE, chance: float = JACKPOT_CHANCE,
+                 seed: float = JACKPOT_SEED, flush_interval: float = JACKPOT_FLUSH_INTERVAL,
+                 staleness: float = JACKPOT_STALENESS):
+        self.name = name
+        self.rate = rate
+        self.chance = chance
+        self.seed = seed
+        self.flush_interval = flush_interval
+        self.staleness = staleness
+        self.pending = ShardedCounter()
+        self.flush_lock = Lock()
+        self.last_flush = time.monotonic()
+        self.snapshot = None
+        self.snapshot_time = 0.0
+
+    def pool(self):
+        """
+        Returns:
+            a queryset of the pool's database row, created with the seed amount if it does not exist yet
+        """
+        JackpotPool.objects.get_or_create(name=self.name, defaults={'amount': self.seed, 'seed': self.seed})
+        return JackpotPool.objects.filter(name=self.name)
+
+    def contribute(self, bet: float) -> None:
+        """
+        Pays a share of a bet into the jackpot, flushing the pending contributions if the flush interval has passed
+
+        Args:
+            bet: the amount bet
+        """
+        self.pending.add(bet * self.rate)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Adds the pending contributions to the pool in one write. Only one thread flushes at a time; others carry on.
+        """
+        if not self.flush_lock.acquire(blocking=False):
+            return
+        try:
+            self.last_flush = time.monotonic()
+            pending = self.pending.drain()
+            if pending:
+                self.pool().update(amount=F('amount') + pending)
+        finally:
+            self.flush_lock.release()
+
+    def amount(self) -> float:
+        """
+        Returns:
+            the amount in the pool for display, at most staleness seconds behind the database, plus this process's
+            pending contributions
+        """
+        if self.snapshot is None or time.monotonic() - self.snapshot_time >= self.staleness:
+            self.snapshot = self.pool().values_list('amount', flat=True).get()
+            self.snapshot_time = time.monotonic()
+        return round(self.snapshot + self.pending.total(), 2)
+
+    def is_hit(self, draw: float) -> bool:
+        """
+        Args:
+            draw: a uniformly random float in [0, 1)
+
+        Returns:
+            whether the draw wins the jackpot
+        """
+        return draw < self.chance
+
+    def award(self, player: CustomUser) -> float:
+        """
+        Pays the whole pool to a player and restarts it from the seed amount. Pending contributions are flushed, the
+        row is locked, emptied and credited to the player in one transaction, so two winners can never both be paid
+        the same pool.
+
+        Args:
+            player: the winning player
+
+        Returns:
+            the amount won
+        """
+        with transaction.atomic():
+            pool = self.pool().select_for_update().get()
+            won = round(pool.amount + self.pending.drain(), 2)
+            pool.amount = pool.seed
+            pool.save()
+            player.update_balance(won)
+        self.snapshot = None
+        return won
+
+
+SLOTS_JACKPOT = ProgressiveJackpot()
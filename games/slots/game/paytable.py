@@ -0,0 +1,163 @@
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate, product
+
+import numpy as np
+
+from games.slots.game.reels import AliasTable
+
+# Symbols on the reels, and the weight of each symbol on a reel. X is three times as likely as any other symbol.
+SYMBOLS = ("1", "2", "3", "4", "5", "6", "7", "8", "9", "$", "*", "X")
+REEL = dict.fromkeys(SYMBOLS, 1) | {"X": 3}
+
+# Any of these symbols on the board pays nothing
+BLOCKERS = ("X",)
+
+# How many times the bet is multiplied for the number of copies of a digit, and of each special symbol, on the board
+DIGIT_PAYS = {2: 5, 3: 20}
+SYMBOL_PAYS = {"$": {1: 2, 2: 10, 3: 100},
+               "*": {2: 20, 3: 50}}
+
+# Multipliers applied to the payout and their probabilities
+MULTIPLIERS = {1: .75, 2: .15, 3: .07, 4: .02, 5: .01}
+
+REELS = 3
+
+
+class Paytable:
+    """
+    A slot machine: its reels, with an integer weight for each symbol on each reel, and its paytable compiled into the
+    payout factor of every possible board. The board of reel stops (a, b, c) is found at index (a * n + b) * n + c of
+    the table, where n is the number of distinct symbols on the machine, so scoring a spin is one list read. Each reel
+    stop is drawn from an alias table of the reel's weights, and the multiplier from a cumulative table of its
+    probabilities.
+    """
+
+    def __init__(self, reels: list = None, blockers: tuple = BLOCKERS, digit_pays: dict = None,
+                 symbol_pays: dict = None, multipliers: dict = None):
+        reels = [REEL] * REELS if reels is None else reels
+        self.symbols = tuple(dict.fromkeys(symbol for reel in reels for symbol in reel))
+        self.reels = [AliasTable([reel.get(symbol, 0) for symbol in self.symbols]) for reel in reels]
+        self.blockers = blockers
+        self.digit_pays = DIGIT_PAYS if digit_pays is None else digit_pays
+        self.symbol_pays = SYMBOL_PAYS if symbol_pays is None else symbol_pays
+
+        self.table = np.array([self.factor([self.symbols[stop] for stop in stops])
+                               for stops in product(range(len(self.symbols)), repeat=len(reels))], dtype=np.int64)
+        self.factors = self.table.tolist()
+
+        multipliers = MULTIPLIERS if multipliers is None else multipliers
+        self.multipliers = list(multipliers)
+        self.cumulative = list(accumulate(multipliers.values()))
+
+    def factor(self, displayed_slots: list) -> int:
+        """
+        Applies the paytable rules to a board. Combos multiply together, so "7 7 $" pays 5 * 2 times the bet.
+
+        Args:
+            displayed_slots: the symbols on the board
+
+        Returns:
+            how many times the bet the board pays, before the multiplier
+        """
+        if any(symbol in self.blockers for symbol in displayed_slots):
+            return 0
+
+        factor = 1
+        for symbol, count in Counter(displayed_slots).items():
+            pays = self.digit_pays if symbol.isdigit() else self.symbol_pays.get(symbol, {})
+            factor *= pays.get(count, 1)
+        return factor
+
+    def stops(self, draws: list) -> list:
+        """
+        Args:
+            draws: a uniformly random float in [0, 1) for each reel
+
+        Returns:
+            the index of the symbol each reel stopped on
+        """
+        return [reel.draw(draw) for reel, draw in zip(self.reels, draws)]
+
+    def stop_arrays(self, draws: np.ndarray) -> np.ndarray:
+        """
+        Stops the reels of many spins at once, in the same way as stops
+
+        Args:
+            draws: (number of spins, number of reels) array of uniformly random floats in [0, 1)
+
+        Returns:
+            (number of spins, number of reels) array of the index of the symbol each reel stopped on
+        """
+        return np.stack([reel.draws(draws[:, index]) for index, reel in enumerate(self.reels)], axis=1)
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Returns:
+            the chance of every board, in the order of the table
+        """
+        chances = np.ones(1)
+        for reel in self.reels:
+            chances = np.outer(chances, reel.probabilities()).ravel()
+        return chances
+
+    def index(self, stops) -> int:
+        """
+        Args:
+            stops: the index of the symbol each reel stopped on
+
+        Returns:
+            the index of the board in the table
+        """
+        index = 0
+        for stop in stops:
+            index = index * len(self.symbols) + stop
+        return index
+
+    def multiplier(self, draw: float) -> int:
+        """
+        Args:
+            draw: a uniformly random float in [0, 1)
+
+        Returns:
+            the multiplier the draw falls on
+        """
+        return self.multipliers[min(bisect_right(self.cumulative, draw), len(self.multipliers) - 1)]
+
+    def returns(self, stops: np.ndarray, draws: np.ndarray) -> np.ndarray:
+        """
+        Scores many spins at once with the same table and multiplier distribution as a live spin
+
+        Args:
+            stops: (number of spins, number of reels) array of the index of the symbol each reel stopped on
+            draws: uniformly random floats in [0, 1) drawing the multiplier of each spin
+
+        Returns:
+            how many times the bet each spin pays back, multiplier included
+        """
+        index = np.zeros(len(stops), dtype=np.int64)
+        for reel in range(stops.shape[1]):
+            index = index * len(self.symbols) + stops[:, reel]
+        multipliers = np.array(self.multipliers)[np.minimum(np.searchsorted(self.cumulative, draws, side='right'),
+                                                            len(self.multipliers) - 1)]
+        return self.table[index] * multipliers
+
+
+PAYTABLE = Paytable()
+
+# Machines a session can switch to, defined by the arguments of their Paytable
+MACHINES = {'classic': {}}
+MACHINE_PAYTABLES = {'classic': PAYTABLE}
+
+
+def machine_paytable(name: str) -> Paytable:
+    """
+    Args:
+        name: name of a machine in MACHINES
+
+    Returns:
+        the compiled paytable of the machine, compiled the first time it is asked for
+    """
+    if name not in MACHINE_PAYTABLES:
+        MACHINE_PAYTABLES[name] = Paytable(**MACHINES[name])
+    return MACHINE_PAYTABLES[name]
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class AliasTable:
+    """
+    Walker's alias table for drawing an index with probability proportional to its weight in constant time, however
+    many weights there are. The unit interval is cut into one column per index; each column keeps its own index with
+    probability prob and otherwise gives its alias. A single uniform float picks both the column and the side of the
+    cut, so a weighted draw costs the same as a uniform one.
+    """
+
+    def __init__(self, weights: list):
+        if not weights or min(weights) < 0 or sum(weights) <= 0:
+            raise ValueError('weights must be non negative with a positive total: {}'.format(weights))
+
+        size = len(weights)
+        total = sum(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.prob = [1.0] * size
+        self.alias = list(range(size))
+
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+
+        self.prob_array = np.array(self.prob)
+        self.alias_array = np.array(self.alias, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, uniform: float) -> int:
+        """
+        Args:
+            uniform: a uniformly random float in [0, 1)
+
+        Returns:
+            the index drawn
+        """
+        position = uniform * len(self.prob)
+        column = min(int(position), len(self.prob) - 1)
+        return column if position - column < self.prob[column] else self.alias[column]
+
+    def draws(self, uniforms: np.ndarray) -> np.ndarray:
+        """
+        Draws many indexes at once, in the same way as draw
+
+        Args:
+            uniforms: uniformly random floats in [0, 1)
+
+        Returns:
+            the indexes drawn
+        """
+        position = uniforms * len(self.prob)
+        column = np.minimum(position.astype(np.int64), len(self.prob) - 1)
+        return np.where(position - column < self.prob_array[column], column, self.alias_array[column])
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Returns:
+            the chance of drawing each index, recovered from the table
+        """
+        chances = self.prob_array / len(self.prob)
+        np.add.at(chances, self.alias_array, (1 - self.prob_array) / len(self.prob))
+        return chances
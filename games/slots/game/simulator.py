@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import sqrt
+from typing import Iterator
+
+import numpy as np
+
+from games.slots.game.paytable import PAYTABLE, Paytable
+
+CHUNK_SIZE = 1000000
+TASK_SPINS = 10000000
+
+
+def exact_rtp(paytable: Paytable = PAYTABLE) -> dict:
+    """
+    Computes the exact return to player of a paytable from its compiled table and the chance of every board
+
+    Args:
+        paytable: the paytable to certify
+
+    Returns:
+        dict of the return to player per unit bet, the standard deviation of a spin and the hit frequency, the chance a
+        spin pays back more than the bet
+    """
+    chances = np.diff(paytable.cumulative, prepend=0)
+    multipliers = np.array(paytable.multipliers)
+    returns = np.outer(paytable.table, multipliers)
+    weights = np.outer(paytable.probabilities(), chances)
+
+    rtp = float((returns * weights).sum())
+    std = sqrt(max(float((returns * returns * weights).sum()) - rtp * rtp, 0.0))
+    return {'rtp': rtp, 'std': std, 'hit_frequency': float(weights[returns > 1].sum())}
+
+
+def simulate_shard(spins: int, paytable: Paytable, seed: np.random.SeedSequence,
+                   chunk_size: int = CHUNK_SIZE) -> tuple[int, float, float, int]:
+    """
+    Spins the reels in chunks through the machine's alias tables and scores every chunk with Paytable.returns, the
+    same tables a live spin reads
+
+    Args:
+        spins: number of spins to simulate
+        paytable: the paytable to certify
+        seed: seed sequence of this shard's random stream
+        chunk_size: number of spins drawn at a time
+
+    Returns:
+        A tuple of the spins simulated, the sum and sum of squares of what they paid back per unit bet and how many of
+        them paid back more than the bet
+    """
+    rng = np.random.default_rng(seed)
+    total, squares, hits = 0.0, 0.0, 0
+    for start in range(0, spins, chunk_size):
+        chunk = min(chunk_size, spins - start)
+        stops = paytable.stop_arrays(rng.random((chunk, len(paytable.reels))))
+        returns = paytable.returns(stops, rng.random(chunk))
+        total += float(returns.sum())
+        squares += float((returns * returns).sum())
+        hits += int((returns > 1).sum())
+    return spins, total, squares, hits
+
+
+def estimate(spins: int, total: float, squares: float, hits: int) -> dict:
+    """
+    Args:
+        spins: the spins simulated
+        total: the sum of what they paid back per unit bet
+        squares: the sum of squares of what they paid back per unit bet
+        hits: how many of them paid back more than the bet
+
+    Returns:
+        dict of the spins simulated, the estimated return to player, the standard deviation of a spin, the half width of
+        the 95% confidence interval of the return to player and the hit frequency
+    """
+    rtp = total / spins
+    std = sqrt(max(squares / spins - rtp * rtp, 0.0))
+    return {'spins': spins, 'rtp': rtp, 'std': std, 'ci': 1.96 * std / sqrt(spins), 'hit_frequency': hits / spins}
+
+
+def stream_rtp(spins: int, paytable: Paytable = PAYTABLE, workers: int = None, task_spins: int = TASK_SPINS,
+               seed: int = None) -> Iterator[dict]:
+    """
+    Simulates spins in tasks of task_spins spread across a pool of worker processes, yielding the running estimate
+    every time a task finishes
+
+    Args:
+        spins: number of spins to simulate
+        paytable: the paytable to certify
+        workers: number of worker processes, defaults to the number of CPUs
+        task_spins: number of spins simulated by each task
+        seed: root seed, spawned into an independent stream for every task
+
+    Returns:
+        an iterator over the running estimates, as returned by estimate
+    """
+    tasks = [task_spins] * (spins // task_spins) + ([spins % task_spins] if spins % task_spins else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    running = [0, 0.0, 0.0, 0]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = [executor.submit(simulate_shard, task, paytable, task_seed) for task, task_seed in zip(tasks, seeds)]
+        for future in as_completed(futures):
+            running = [value + result for value, result in zip(running, future.result())]
+            yield estimate(*running)
+
+
+def simulate_rtp(spins: int, paytable: Paytable = PAYTABLE, workers: int = None, task_spins: int = TASK_SPINS,
+                 seed: int = None) -> dict:
+    """
+    Simulates spins across a pool of worker processes
+
+    Args:
+        spins: number of spins to simulate
+        paytable: the paytable to certify
+        workers: number of worker processes, defaults to the number of CPUs
+        task_spins: number of spins simulated by each task
+        seed: root seed of the simulation
+
+    Returns:
+        the final estimate, as returned by estimate
+    """
+    result = None
+    for result in stream_rtp(spins, paytable, workers, task_spins, seed):
+        pass
+    return result
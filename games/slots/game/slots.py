@@ -1,8 +1,9 @@
-import random
-from collections import Counter
-
 from accounts.models import CustomUser
 from games.base import Game
+from games.slots.game.jackpot import SLOTS_JACKPOT
+from games.slots.game.paytable import PAYTABLE, Paytable
+
+MAX_AUTO_SPINS = 1000
 
 
 class Slots(Game):
@@ -11,6 +12,18 @@ class Slots(Game):
 
         self.bet = 0
         self.multiplier = 1
+        self.paytable = PAYTABLE
+        self.jackpot = SLOTS_JACKPOT
+
+    def set_machine(self, machine):
+        """
+        Switches the session to another slot machine
+
+        Args:
+            machine: a compiled Paytable, or the dict of Paytable arguments defining the machine, such as
+                     {'reels': [{'1': 2, '$': 1, 'X': 1}] * 3}
+        """
+        self.paytable = machine if isinstance(machine, Paytable) else Paytable(**machine)
 
     def record_bet(self, user: CustomUser) -> None:
         """
@@ -27,19 +40,7 @@ class Slots(Game):
         Sets the multiplier by following a highly skewed distribution
         The multipliers have the following probabilities of being chosen: 1 = .75%, 2 = .15%, 3 = .07%, 4 = .02%, 5 = .01%
         """
-
-        rand_gen_num = random.random()
-
-        if 0 <= rand_gen_num < .75:
-            self.multiplier = 1
-        if .75 <= rand_gen_num < .9:
-            self.multiplier = 2
-        if .9 <= rand_gen_num < .97:
-            self.multiplier = 3
-        if .97 <= rand_gen_num < .99:
-            self.multiplier = 4
-        if .99 <= rand_gen_num <= 1:
-            self.multiplier = 5
+        self.multiplier = self.paytable.multiplier(self.rng.random())
 
     def play_slots(self) -> dict:
         """
@@ -49,27 +50,13 @@ class Slots(Game):
             A dictionary containing the displayed slots and payout of the player
         """
         # Steps:
-        #     2) Multiplier is randomly selected
-        #     3) Symbols are randomly chosen
-        #     4) Payout is calculated and sent to player
+        #     1) Multiplier is randomly selected
+        #     2) Each reel stops on a random symbol, drawn by the weight of the symbols on the reel
+        #     3) The payout factor of the board is read from the compiled paytable and sent to player
         #
         # Payout:
-        #     The current symbols include 0-9, $, *, X, and
-        #
-        #     If a player gets no matching numbers, they win nothing.
-        #     If a player gets two matching numbers, they win 5x
-        #     If a player gets three matching numbers, they win 20x
-        #
-        #     If a player gets 1 $ on the board, they win 2x
-        #     If a player gets 2 $ on the board, they win 10x,
-        #     If a player gets 3 $ on the board, they win 100x
-        #
-        #     If a player gets 2 * on the board, they win 20x
-        #     If a player gets 3 * on the board, they win 50x
-        #
-        #     If a player gets at least one X, they win nothing
-        #
-        #     Combos can be made on the board.
+        #     The rules are declared in games.slots.game.paytable. Digit pairs and triples, $ and * combos multiply
+        #     together, and any X on the board pays nothing.
         #     Examples:
         #             "1 2 1" = a pre-payout of bet amount * 5
         #             "3 5 $" = a pre-payout of bet amount *2
@@ -78,44 +65,86 @@ class Slots(Game):
         #
         #     The multiplier is calculated after the payout.
         #     total payout = pre-payout * multiplier
+        #
+        #     Every spin with a bet also pays into the progressive jackpot and has a small chance of winning all of it.
 
+        player = next(iter(self.players))
+        displayed_slots, payout, hit = self.spin()
+        player.update_balance(payout)
+        jackpot = self.jackpot.award(player) if hit else 0
+
+        return {"type": "spin", "displayed_slots": displayed_slots, "payout": payout, "jackpot": jackpot,
+                "jackpot_pool": self.jackpot.amount(),
+                "spectating": [spectator.username for spectator in self.spectating], }
+
+    def spin(self) -> tuple[list, float, bool]:
+        """
+        Spins the reels once without touching the player's balance. A spin with a bet pays its share into the
+        progressive jackpot and draws for it.
+
+        Returns:
+            A tuple of the displayed slots, the payout of the spin less the bet and whether it won the jackpot
+        """
         self.set_multiplier()
 
-        symbols = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "$", "*", "X", "X", "X"]
-        displayed_slots = [random.choice(symbols) for _ in range(3)]
-
-        pre_payout = self.bet
-
-        if "X" in displayed_slots:
-            next(iter(self.players)).update_balance(0 - self.bet)
-            return {"type": "spin", "displayed_slots": displayed_slots, "payout": 0 - self.bet,
-                    "spectating": [spectator.username for spectator in self.spectating], }
-
-        slots_dict = dict(Counter(displayed_slots))
-
-        for symbol in slots_dict:
-            if symbol.isdigit():
-                if slots_dict[symbol] == 2:
-                    pre_payout *= 5
-                if slots_dict[symbol] == 3:
-                    pre_payout *= 20
-            if symbol == "$":
-                if slots_dict[symbol] == 1:
-                    pre_payout *= 2
-                if slots_dict[symbol] == 2:
-                    pre_payout *= 10
-                if slots_dict[symbol] == 3:
-                    pre_payout *= 100
-            if symbol == "*":
-                if slots_dict[symbol] == 2:
-                    pre_payout *= 20
-                if slots_dict[symbol] == 3:
-                    pre_payout *= 50
-
-        payout = pre_payout * self.multiplier
-        next(iter(self.players)).update_balance(payout - self.bet)
-
-        return {"type": "spin", "displayed_slots": displayed_slots, "payout": payout - self.bet,
+        stops = self.paytable.stops([self.rng.random() for _ in self.paytable.reels])
+        displayed_slots = [self.paytable.symbols[stop] for stop in stops]
+
+        payout = self.bet * self.paytable.factors[self.paytable.index(stops)] * self.multiplier
+        hit = False
+        if self.bet > 0:
+            self.jackpot.contribute(self.bet)
+            hit = self.jackpot.is_hit(self.rng.random())
+        return displayed_slots, payout - self.bet, hit
+
+    def auto_spin(self, spins: int, loss_limit: float = None, win_limit: float = None,
+                  balance_floor: float = 0.0) -> dict:
+        """
+        Plays up to spins rounds of slots in one go and applies their net result to the player's balance in a single
+        update. Spinning stops early once the player has lost loss_limit or more, after a spin wins more than
+        win_limit, after a spin wins the jackpot, or when the next spin could take their balance below balance_floor.
+
+        Args:
+            spins: the number of spins to play, at most MAX_AUTO_SPINS
+            loss_limit: optional net loss at which to stop
+            win_limit: optional single spin payout above which to stop
+            balance_floor: the balance the player's balance must stay at or above, never below zero
+
+        Returns:
+            A dictionary containing the displayed slots and payout of every spin played, the net payout, the jackpot won
+            and the reason spinning stopped, None if every spin was played
+        """
+        player = next(iter(self.players))
+        boards, payouts = [], []
+        net = 0
+        jackpot = 0
+        stopped = None
+
+        for _ in range(min(spins, MAX_AUTO_SPINS)):
+            if player.current_balance + net - self.bet < max(balance_floor, 0.0):
+                stopped = 'balance_floor'
+                break
+
+            displayed_slots, payout, hit = self.spin()
+            boards.append(''.join(displayed_slots))
+            payouts.append(payout)
+            net += payout
+
+            if hit:
+                jackpot = self.jackpot.award(player)
+                stopped = 'jackpot'
+                break
+            if win_limit is not None and payout > win_limit:
+                stopped = 'win_limit'
+                break
+            if loss_limit is not None and -net >= loss_limit:
+                stopped = 'loss_limit'
+                break
+
+        player.update_balance(net)
+
+        return {"type": "auto_spin", "displayed_slots": boards, "payouts": payouts, "payout": net, "jackpot": jackpot,
+                "jackpot_pool": self.jackpot.amount(), "stopped": stopped,
                 "spectating": [spectator.username for spectator in self.spectating], }
 
     def dict_representation(self) -> dict:
@@ -128,5 +157,6 @@ class Slots(Game):
         return {'player': next(iter(self.players)).username,
                 'bet': self.bet,
                 'multiplier': self.multiplier,
+                'jackpot': self.jackpot.amount(),
                 "spectating": [spectator.username for spectator in self.spectating],
                 }
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from games.slots.game.paytable import MACHINES, machine_paytable
+from games.slots.game.simulator import TASK_SPINS, exact_rtp, stream_rtp
+
+
+class Command(BaseCommand):
+    """
+    Certifies the return to player of a slot machine
+    """
+    help = 'Prints the exact return to player of a slot machine, then simulates spins and streams the estimate'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--machine', default='classic', choices=sorted(MACHINES), help='slot machine to certify')
+        parser.add_argument('--spins', type=int, default=1000000000, help='spins simulated, 0 to skip the simulation')
+        parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+        parser.add_argument('--task-spins', type=int, default=TASK_SPINS, help='spins simulated by each task')
+        parser.add_argument('--seed', type=int, default=None, help='root seed of the simulation')
+
+    def handle(self, *args, **options) -> None:
+        paytable = machine_paytable(options['machine'])
+        exact = exact_rtp(paytable)
+        self.stdout.write('exact: rtp {:.4%}, standard deviation {:.4f}, hit frequency {:.4%}'.format(
+            exact['rtp'], exact['std'], exact['hit_frequency']))
+
+        if not options['spins']:
+            return
+
+        start = time.monotonic()
+        self.stdout.write('{:>13} {:>10} {:>9} {:>9} {:>9}'.format('spins', 'rtp', '95% CI', 'std', 'hit freq'))
+        for result in stream_rtp(options['spins'], paytable, options['workers'], options['task_spins'],
+                                 options['seed']):
+            self.stdout.write('{:>13} {:>9.4%} {:>8.4%} {:>9.4f} {:>8.4%}  ({:.1f}s)'.format(
+                result['spins'], result['rtp'], result['ci'], result['std'], result['hit_frequency'],
+                time.monotonic() - start))
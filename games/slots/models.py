@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class JackpotPool(models.Model):
+    """
+    Class representing the model for a progressive jackpot pool. Associated with each pool is its name, the amount
+    currently in the pool and the amount the pool is reset to after it is won
+    """
+
+    name = models.CharField(max_length=30, unique=True)
+    amount = models.FloatField(default=0.0)
+    seed = models.FloatField(default=0.0)
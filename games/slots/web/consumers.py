@@ -3,6 +3,7 @@ from uuid import UUID
 from asgiref.sync import async_to_sync
 
 from games.base import ConsumerUpdater, GameConsumer
+from games.slots.game.paytable import MACHINES, machine_paytable
 from games.slots.web.views import SLOTS_MANAGER
 
 
@@ -46,6 +47,26 @@ class SlotsUpdater(ConsumerUpdater):
                 'data': game_instance.dict_representation() | {'to_update': 'ready'}
                 }
 
+    @staticmethod
+    def set_machine(request_data: dict) -> dict:
+        """
+        Switches the session to one of the slot machines in MACHINES
+
+        Args:
+            request_data: the request dictionary, with the name of the 'machine' under 'data'
+
+        Returns:
+            the full dictionary representation of the game
+        """
+        game_instance = SLOTS_MANAGER.get(UUID(request_data['session_id']))
+        machine = request_data['data']['machine']
+
+        if machine in MACHINES:
+            game_instance.set_machine(machine_paytable(machine))
+        return {'type': 'update',
+                'data': game_instance.dict_representation() | {'valid_machine': machine in MACHINES}
+                }
+
     @staticmethod
     def play_slots(request_data: dict) -> dict:
         """
@@ -60,6 +81,24 @@ class SlotsUpdater(ConsumerUpdater):
         game_instance = SLOTS_MANAGER.get(UUID(request_data['session_id']))
         return game_instance.play_slots()
 
+    @staticmethod
+    def auto_spin(request_data: dict) -> dict:
+        """
+        Plays a run of spins of the slot machine in one request
+
+        Args:
+            request_data: the request dictionary, with the number of 'spins' and optionally a 'loss_limit', 'win_limit'
+                          and 'balance_floor' under 'data'
+
+        Returns:
+            dictionary representation of the results: every displayed board and payout, and the net payout
+        """
+        game_instance = SLOTS_MANAGER.get(UUID(request_data['session_id']))
+        data = request_data['data']
+        limits = {key: float(data[key]) for key in ('loss_limit', 'win_limit', 'balance_floor')
+                  if data.get(key) is not None}
+        return game_instance.auto_spin(int(data['spins']), **limits)
+
     @staticmethod
     def request_user_balance(request_data: dict) -> dict:
         """
@@ -80,6 +119,7 @@ class SlotsUpdater(ConsumerUpdater):
                 }
 
     FUNCTION_MAP = {'load_game': load_game.__func__, 'place_bet': place_bet.__func__, 'play_slots': play_slots.__func__,
+                    'auto_spin': auto_spin.__func__, 'set_machine': set_machine.__func__,
                     'request_user_balance': request_user_balance.__func__}
 
 
@@ -1,7 +1,15 @@
+from threading import Thread
+from unittest import mock
+
+import numpy as np
 from django.contrib import auth
 from django.test import TestCase
 
 from accounts.models import CustomUser
+from games.slots.game.jackpot import JACKPOT_SEED, ProgressiveJackpot, ShardedCounter
+from games.slots.game.paytable import PAYTABLE, SYMBOLS, Paytable
+from games.slots.game.reels import AliasTable
+from games.slots.game.simulator import exact_rtp, simulate_shard
 from games.slots.web.views import SLOTS_MANAGER
 
 
@@ -17,6 +25,7 @@ class TestSlotsGame(TestCase):
         self.session_id = SLOTS_MANAGER.create()
         SLOTS_MANAGER.register_user(self.session_id, self.user)
         self.game = SLOTS_MANAGER.get(self.session_id)
+        self.game.jackpot = ProgressiveJackpot(name='test')
 
     def tearDown(self) -> None:
         SLOTS_MANAGER.sessions = {}
@@ -44,9 +53,174 @@ class TestSlotsGame(TestCase):
         self.assertTrue(outcome['payout'] >= 0)
 
     def test_dict_representation(self):
-        self.assertEqual({'player': 'user', 'bet': 0, 'multiplier': 1, 'spectating': []},
+        self.assertEqual({'player': 'user', 'bet': 0, 'multiplier': 1, 'jackpot': JACKPOT_SEED, 'spectating': []},
                          self.game.dict_representation())
 
+    def test_auto_spin_applies_net_result_once(self):
+        self.game.bet = 1
+        outcome = self.game.auto_spin(50)
+        self.assertEqual(50, len(outcome['displayed_slots']))
+        self.assertIsNone(outcome['stopped'])
+        self.assertEqual(sum(outcome['payouts']), outcome['payout'])
+        self.user.refresh_from_db()
+        self.assertEqual(round(300 + outcome['payout'], 2), self.user.current_balance)
+
+    def test_auto_spin_stops_at_balance_floor(self):
+        self.game.bet = 100
+        outcome = self.game.auto_spin(10, balance_floor=250)
+        self.assertEqual('balance_floor', outcome['stopped'])
+        self.assertEqual([], outcome['displayed_slots'])
+
+    def test_auto_spin_stops_at_loss_limit(self):
+        self.game.set_machine({'reels': [{'X': 1}] * 3})
+        self.game.jackpot = ProgressiveJackpot(name='test', chance=0)
+        self.game.bet = 1
+        with mock.patch.object(CustomUser, 'update_balance', autospec=True,
+                               side_effect=CustomUser.update_balance) as update_balance:
+            outcome = self.game.auto_spin(1000, loss_limit=3)
+
+        self.assertEqual('loss_limit', outcome['stopped'])
+        self.assertEqual(['XXX'] * 3, outcome['displayed_slots'])
+        self.assertEqual(-3, outcome['payout'])
+        update_balance.assert_called_once_with(self.user, -3)
+        self.user.refresh_from_db()
+        self.assertEqual(297, self.user.current_balance)
+
+
+class TestSlotsPaytable(TestCase):
+    """
+    Testing the compiled slots paytable
+    """
+
+    def factor(self, board: str) -> int:
+        return PAYTABLE.factors[PAYTABLE.index([SYMBOLS.index(symbol) for symbol in board.split()])]
+
+    def test_table_covers_every_board(self):
+        self.assertEqual(len(SYMBOLS) ** 3, len(PAYTABLE.factors))
+
+    def test_combos(self):
+        self.assertEqual(1, self.factor('1 2 3'))
+        self.assertEqual(5, self.factor('1 2 1'))
+        self.assertEqual(20, self.factor('4 4 4'))
+        self.assertEqual(2, self.factor('3 5 $'))
+        self.assertEqual(10, self.factor('7 7 $'))
+        self.assertEqual(100, self.factor('$ $ $'))
+        self.assertEqual(20, self.factor('* 2 *'))
+        self.assertEqual(50, self.factor('* * *'))
+        self.assertEqual(0, self.factor('$ * X'))
+        self.assertEqual(0, self.factor('$ $ X'))
+
+    def test_multiplier_distribution(self):
+        self.assertEqual(1, PAYTABLE.multiplier(0))
+        self.assertEqual(2, PAYTABLE.multiplier(.8))
+        self.assertEqual(3, PAYTABLE.multiplier(.95))
+        self.assertEqual(4, PAYTABLE.multiplier(.98))
+        self.assertEqual(5, PAYTABLE.multiplier(.999999))
+
+    def test_x_is_three_times_as_likely(self):
+        chances = PAYTABLE.reels[0].probabilities()
+        self.assertAlmostEqual(3 * chances[SYMBOLS.index('1')], chances[SYMBOLS.index('X')])
+        self.assertAlmostEqual(1, chances.sum())
+
+    def test_alias_table_draws_by_weight(self):
+        table = AliasTable([5, 0, 1, 2])
+        draws = table.draws(np.random.default_rng(435).random(800000))
+        np.testing.assert_allclose([5 / 8, 0, 1 / 8, 2 / 8], np.bincount(draws, minlength=4) / len(draws), atol=.003)
+        self.assertEqual([table.draw(uniform) for uniform in np.linspace(0, .999, 50).tolist()],
+                         table.draws(np.linspace(0, .999, 50)).tolist())
+
+    def test_alias_table_rejects_bad_weights(self):
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+        with self.assertRaises(ValueError):
+            AliasTable([1, -1])
+
+    def test_machine_defined_as_data(self):
+        game = SLOTS_MANAGER.get(SLOTS_MANAGER.create())
+        game.add_player(CustomUser.objects.create_user(username='user', password='pass', current_balance=300))
+        game.set_machine({'reels': [{'$': 1}] * 3})
+        game.bet = 1
+        outcome = game.play_slots()
+        self.assertEqual(['$', '$', '$'], outcome['displayed_slots'])
+        self.assertEqual(100 * game.multiplier - 1, outcome['payout'])
+        SLOTS_MANAGER.sessions = {}
+
+
+class TestProgressiveJackpot(TestCase):
+    """
+    Testing the progressive jackpot shared by every slots session
+    """
+
+    def setUp(self) -> None:
+        self.user = CustomUser.objects.create_user(username='user', password='pass', current_balance=300)
+        self.jackpot = ProgressiveJackpot(name='test', flush_interval=3600, staleness=0)
+
+    def test_contributions_are_held_until_flushed(self):
+        for _ in range(100):
+            self.jackpot.contribute(10)
+        self.assertEqual(JACKPOT_SEED, self.jackpot.pool().get().amount)
+        self.assertEqual(JACKPOT_SEED + 10, self.jackpot.amount())
+
+        self.jackpot.flush()
+        self.assertEqual(JACKPOT_SEED + 10, self.jackpot.pool().get().amount)
+        self.assertEqual(0, self.jackpot.pending.total())
+
+    def test_award_pays_the_pool_and_reseeds_it(self):
+        self.jackpot.contribute(100)
+        self.jackpot.flush()
+        self.jackpot.contribute(100)
+        self.assertEqual(JACKPOT_SEED + 2, self.jackpot.award(self.user))
+
+        self.user.refresh_from_db()
+        self.assertEqual(300 + JACKPOT_SEED + 2, self.user.current_balance)
+        self.assertEqual(JACKPOT_SEED, self.jackpot.pool().get().amount)
+        self.assertEqual(JACKPOT_SEED, self.jackpot.amount())
+
+    def test_sharded_counter_drains_every_shard(self):
+        counter = ShardedCounter(shards=4)
+        counter.values = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(10, counter.drain())
+        self.assertEqual([0.0] * 4, counter.values)
+
+    def test_sharded_counter_spreads_threads_across_shards(self):
+        counter = ShardedCounter(shards=4)
+        threads = [Thread(target=lambda: [counter.add(1.0) for _ in range(100)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([100.0] * 4, counter.values)
+        self.assertEqual(400, counter.drain())
+
+    def test_spin_wins_jackpot(self):
+        game = SLOTS_MANAGER.get(SLOTS_MANAGER.create())
+        game.add_player(self.user)
+        game.jackpot = ProgressiveJackpot(name='test', chance=1)
+        game.bet = 1
+        outcome = game.play_slots()
+        self.assertEqual(round(JACKPOT_SEED + .01, 2), outcome['jackpot'])
+        self.assertEqual(JACKPOT_SEED, outcome['jackpot_pool'])
+        SLOTS_MANAGER.sessions = {}
+
+
+class TestSlotsSimulator(TestCase):
+    """
+    Testing the slots return to player simulator
+    """
+
+    def test_vectorized_returns_match_live_spin(self):
+        stops = np.array([[0, 1, 0], [9, 9, 9], [10, 2, 11], [6, 6, 9]])
+        draws = np.array([.5, .8, .98, .995])
+        expected = [PAYTABLE.factors[PAYTABLE.index(row)] * PAYTABLE.multiplier(draw)
+                    for row, draw in zip(stops.tolist(), draws.tolist())]
+        self.assertEqual(expected, PAYTABLE.returns(stops, draws).tolist())
+
+    def test_simulation_agrees_with_exact_rtp(self):
+        exact = exact_rtp()
+        spins, total, _, hits = simulate_shard(2000000, PAYTABLE, np.random.SeedSequence(435), chunk_size=500000)
+        self.assertAlmostEqual(exact['rtp'], total / spins, delta=4 * exact['std'] / spins ** .5)
+        self.assertAlmostEqual(exact['hit_frequency'], hits / spins, delta=.002)
+
 # class TestSlotsWebSocket(TestCase):
 #     def setUp(self) -> None:
 #         self.user = CustomUser.objects.create_user(username='user', password='pass', current_balance=1000)
@@ -0,0 +1,192 @@
+from typing import Optional
+
+from utils.PlayingCards.card import Card
+
+# Cards are encoded as integers 0-51: suit index * 13 + rank index (0 = 2, ..., 12 = Ace), so that a set of cards is a
+# 52 bit mask holding one 13 bit rank field per suit. These bit indexes are not the rank * 4 + suit card integers of
+# games.poker.game.evaluator
+SUITS = Card.SUITS
+RANKS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K', 'A')
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)} | {str(rank): index for index, rank in enumerate(RANKS)}
+
+RANK_BITS = 13
+RANK_FIELD = (1 << RANK_BITS) - 1
+FULL_DECK = (1 << RANK_BITS * len(SUITS)) - 1
+
+# Each straight as the rank field of its cards, best first. The wheel plays the Ace low.
+STRAIGHT_MASKS = [0b11111 << low for low in range(8, -1, -1)] + [0b1000000001111]
+
+
+def card_index(suit: str, rank) -> int:
+    """
+    Encodes a suit and rank as the bit index of the card
+
+    Args:
+        suit: the card suit, e.g. "H"
+        rank: the card rank, e.g. 10 or "J"
+
+    Returns:
+        the integer encoding of the card
+    """
+    return SUIT_INDEX[suit] * RANK_BITS + RANK_INDEX[rank]
+
+
+def card_to_bit(card: Card) -> int:
+    """
+    Encodes a card object as its bit index
+
+    Args:
+        card: a Card or any subclass of it
+
+    Returns:
+        the integer encoding of the card
+    """
+    return card_index(card.suit.suit, card.rank.rank)
+
+
+def bit_to_card(index: int, card_class=Card) -> Card:
+    """
+    Decodes a bit index into a card object
+
+    Args:
+        index: the integer encoding of the card
+        card_class: the card class to build
+
+    Returns:
+        a new card_class instance
+    """
+    return card_class(SUITS[index // RANK_BITS], RANKS[index % RANK_BITS])
+
+
+def str_to_bit(card_str: str) -> int:
+    """
+    Encodes the string form of a card as its bit index, e.g. "10H" -> 21
+
+    Args:
+        card_str: the card as produced by str(card)
+
+    Returns:
+        the integer encoding of the card
+    """
+    return card_index(card_str[-1], card_str[:-1])
+
+
+def bit_to_str(index: int) -> str:
+    """
+    Decodes a bit index to the string form of a card, e.g. 21 -> "10H"
+
+    Args:
+        index: the integer encoding of the card
+
+    Returns:
+        the card as str(card) would show it
+    """
+    return '{}{}'.format(RANKS[index % RANK_BITS], SUITS[index // RANK_BITS])
+
+
+def to_mask(cards: list) -> int:
+    """
+    Builds the bitmask of a collection of cards. Duplicate cards collapse into a single bit.
+
+    Args:
+        cards: Card objects, or their str forms
+
+    Returns:
+        the 52 bit mask of the cards
+    """
+    mask = 0
+    for card in cards:
+        mask |= 1 << (str_to_bit(card) if isinstance(card, str) else card_to_bit(card))
+    return mask
+
+
+def mask_indexes(mask: int) -> list:
+    """
+    Args:
+        mask: a 52 bit card mask
+
+    Returns:
+        the integer cards in the mask, lowest first
+    """
+    indexes = []
+    while mask:
+        low_bit = mask & -mask
+        indexes.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return indexes
+
+
+def from_mask(mask: int, card_class=Card) -> list:
+    """
+    Args:
+        mask: a 52 bit card mask
+        card_class: the card class to build
+
+    Returns:
+        new card_class instances for the cards in the mask
+    """
+    return [bit_to_card(index, card_class) for index in mask_indexes(mask)]
+
+
+def count(mask: int) -> int:
+    """
+    Args:
+        mask: a 52 bit card mask
+
+    Returns:
+        the number of cards in the mask
+    """
+    return bin(mask).count('1')
+
+
+def suit_ranks(mask: int, suit: str) -> int:
+    """
+    Args:
+        mask: a 52 bit card mask
+        suit: the suit to select
+
+    Returns:
+        the 13 bit rank field of the cards of the suit
+    """
+    return (mask >> SUIT_INDEX[suit] * RANK_BITS) & RANK_FIELD
+
+
+def rank_mask(mask: int) -> int:
+    """
+    Args:
+        mask: a 52 bit card mask
+
+    Returns:
+        the 13 bit field of every rank held in any suit
+    """
+    return (mask | mask >> RANK_BITS | mask >> 2 * RANK_BITS | mask >> 3 * RANK_BITS) & RANK_FIELD
+
+
+def flush_suit(mask: int, length: int = 5) -> Optional[str]:
+    """
+    Args:
+        mask: a 52 bit card mask
+        length: number of suited cards that make a flush
+
+    Returns:
+        the suit holding at least length cards, or None if there is no flush
+    """
+    for suit in SUITS:
+        if count(suit_ranks(mask, suit)) >= length:
+            return suit
+    return None
+
+
+def straight_high(ranks: int) -> Optional[int]:
+    """
+    Args:
+        ranks: a 13 bit rank field, e.g. from rank_mask or suit_ranks
+
+    Returns:
+        the rank index of the high card of the best straight (3 for the wheel), or None if there is no straight
+    """
+    for straight in STRAIGHT_MASKS:
+        if ranks & straight == straight:
+            return 3 if straight == STRAIGHT_MASKS[-1] else straight.bit_length() - 1
+    return None
@@ -4,14 +4,51 @@ from .suit import Suit
 
 class Card:
     """
-    Class for a playing card
+    Class for an immutable playing card. Each card of a card class is created once and shared, so Card('S', 10) always
+    returns the same object and decks only hold references.
     """
+    __slots__ = ('suit', 'rank', 'string')
     SUITS = ('S', 'H', 'D', 'C')
     RANKS = ('A', 2, 3, 4, 5, 6, 7, 8, 9, 10, 'J', 'Q', 'K')
 
-    def __init__(self, suit, rank):
-        self.suit = Suit(suit)
-        self.rank = Rank(rank)
+    _interned = {}
+
+    def __new__(cls, suit, rank):
+        card = Card._interned.get((cls, suit, rank))
+        if card is None:
+            card = super().__new__(cls)
+            card.setup(suit, rank)
+            Card._interned[(cls, suit, rank)] = card
+        return card
+
+    def setup(self, suit, rank) -> None:
+        """
+        Sets the attributes of a new card. Subclasses extend this to precompute their own attributes.
+
+        Args:
+            suit: the card suit
+            rank: the card rank
+        """
+        object.__setattr__(self, 'suit', Suit(suit))
+        object.__setattr__(self, 'rank', Rank(rank))
+        object.__setattr__(self, 'string', '{}{}'.format(rank, suit))
+
+    @classmethod
+    def full_deck(cls) -> tuple:
+        """
+        Returns:
+            every card of the card class, in build order
+        """
+        return tuple(cls(suit, rank) for suit in cls.SUITS for rank in cls.RANKS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __reduce__(self):
+        return type(self), (self.suit.suit, self.rank.rank)
+
+    def __hash__(self):
+        return hash(self.string)
 
     def __lt__(self, other):
         return self.suit < other.suit if self.rank == other.rank else self.rank < other.rank
@@ -32,7 +69,7 @@ class Card:
         return self.suit >= other.suit if self.rank == other.rank else self.rank >= other.rank
 
     def __repr__(self):
-        return '{}{}'.format(self.rank, self.suit)
+        return self.string
 
     def __str__(self):
-        return '{}{}'.format(self.rank, self.suit)
+        return self.string
@@ -1,6 +1,6 @@
-from random import shuffle
-
+from utils.PlayingCards.bitmask import to_mask
 from utils.PlayingCards.card import Card
+from utils.rng import RNG_SERVICE, RandomStream
 
 
 class Deck:
@@ -8,8 +8,9 @@ class Deck:
     Class for a deck of a card class
     """
 
-    def __init__(self, card_class=Card):
+    def __init__(self, card_class=Card, rng: RandomStream = None):
         self.card_class = card_class
+        self.rng = RNG_SERVICE.stream() if rng is None else rng
         self.deck = []
         self.build()
         self.shuffle()
@@ -19,13 +20,17 @@ class Deck:
             return [self.deck.pop() for _ in range(num_cards)]
 
     def shuffle(self):
-        shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
     def build(self):
-        self.deck = []
-        for suit in self.card_class.SUITS:
-            for rank in self.card_class.RANKS:
-                self.deck.append(self.card_class(suit, rank))
+        self.deck = list(self.card_class.full_deck())
+
+    def mask(self) -> int:
+        """
+        Returns:
+            the 52 bit mask of the cards left in the deck, see utils.PlayingCards.bitmask
+        """
+        return to_mask(self.deck)
 
     def __len__(self):
         return len(self.deck)
@@ -5,6 +5,7 @@ class Rank:
     """
     Class for a card rank
     """
+    __slots__ = ('rank',)
 
     def __init__(self, rank):
         self.rank = rank
@@ -5,6 +5,7 @@ class Suit:
     """
     Class for a card suit
     """
+    __slots__ = ('suit',)
 
     def __init__(self, suit):
         self.suit = suit
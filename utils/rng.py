@@ -0,0 +1,127 @@
+from typing import Sequence
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+BUFFER_SIZE = 256
+
+
+class RandomStream:
+    """
+    Independent random number generator for a single game session. Draws are generated by a NumPy PCG64 generator in
+    buffered batches, so each dice roll, wheel pocket or reel stop costs a list pop rather than a NumPy call.
+    """
+
+    def __init__(self, seed_sequence: np.random.SeedSequence, buffer_size: int = BUFFER_SIZE):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.buffer_size = buffer_size
+        self.buffers = dict()
+
+    def integer(self, low: int, high: int) -> int:
+        """
+        Draws a uniformly random integer
+
+        Args:
+            low: lowest possible value
+            high: one above the highest possible value
+
+        Returns:
+            an integer in [low, high)
+        """
+        buffer = self.buffers.get((low, high))
+        if not buffer:
+            buffer = self.buffers[(low, high)] = self.generator.integers(low, high, size=self.buffer_size).tolist()
+        return buffer.pop()
+
+    def random(self) -> float:
+        """
+        Returns:
+            a uniformly random float in [0, 1)
+        """
+        buffer = self.buffers.get(float)
+        if not buffer:
+            buffer = self.buffers[float] = self.generator.random(self.buffer_size).tolist()
+        return buffer.pop()
+
+    def die(self, sides: int = 6) -> int:
+        """
+        Args:
+            sides: number of sides of the die
+
+        Returns:
+            the roll of the die, from 1 to sides
+        """
+        return self.integer(1, sides + 1)
+
+    def pocket(self, pockets: int) -> int:
+        """
+        Args:
+            pockets: number of pockets on the wheel
+
+        Returns:
+            the index of the pocket the ball lands in
+        """
+        return self.integer(0, pockets)
+
+    def choice(self, sequence: Sequence):
+        """
+        Args:
+            sequence: a non empty sequence
+
+        Returns:
+            a uniformly random element of the sequence
+        """
+        return sequence[self.integer(0, len(sequence))]
+
+    def shuffle(self, items: list) -> None:
+        """
+        Shuffles a list in place with a random permutation
+
+        Args:
+            items: the list to shuffle
+        """
+        items[:] = [items[index] for index in self.generator.permutation(len(items)).tolist()]
+
+
+class RNGService:
+    """
+    Casino wide source of randomness. Every game session gets its own RandomStream spawned from one root seed, so the
+    streams are statistically independent and a seeded service replays the same sessions.
+    """
+
+    def __init__(self, seed: int = None):
+        self.root = np.random.SeedSequence(seed)
+
+    def seed(self, seed: int = None) -> None:
+        """
+        Restarts the service from a new root seed
+
+        Args:
+            seed: the root seed, None for fresh entropy
+        """
+        self.root = np.random.SeedSequence(seed)
+
+    def stream(self, buffer_size: int = BUFFER_SIZE) -> RandomStream:
+        """
+        Args:
+            buffer_size: number of draws generated at a time
+
+        Returns:
+            a new independent RandomStream
+        """
+        return RandomStream(self.root.spawn(1)[0], buffer_size)
+
+
+def configured_seed() -> int:
+    """
+    Returns:
+        the RNG_SEED Django setting, or None if it is not set or Django is not configured
+    """
+    try:
+        return getattr(settings, 'RNG_SEED', None)
+    except ImproperlyConfigured:
+        return None
+
+
+RNG_SERVICE = RNGService(configured_seed())